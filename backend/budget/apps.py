@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class BudgetConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "budget"
+
+    def ready(self) -> None:
+        from core.backup import register_backup_provider
+
+        from .views import _backup_budget_domain, _restore_budget_domain
+
+        # Registered before wealth (INSTALLED_APPS order) so restored users
+        # exist by the time later domains resolve them.
+        register_backup_provider(
+            "budget", _backup_budget_domain, _restore_budget_domain
+        )
@@ -0,0 +1,137 @@
+"""
+Budget rollover and pacing engine.
+
+Spend for every category and month in the requested range is fetched with one
+grouped query; carry-over, pacing and month-end projections are then derived
+in a single in-memory pass over those monthly rollups, so an annual view costs
+one query instead of one per month.
+"""
+
+import calendar
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from .models import Category, Transaction
+from .periods import DateRange, iter_months
+
+ZERO = Decimal("0.00")
+
+
+def monthly_category_spending(
+    user: Any, date_range: DateRange
+) -> dict[tuple[int, date], Decimal]:
+    """Return ``{(category_id, month_start): spent}`` for spend categories.
+
+    Spending is normalised to a positive amount, matching
+    ``_get_spending_by_category``.
+    """
+    rows = (
+        Transaction.objects.filter(
+            user=user,
+            category__classification=Category.SPEND,
+            **date_range.as_filter(),
+        )
+        .annotate(month=TruncMonth("date"))
+        .values("category_id", "month")
+        .annotate(total=Sum("amount"))
+        .order_by()
+    )
+    return {
+        (row["category_id"], _as_date(row["month"])): abs(row["total"]) for row in rows
+    }
+
+
+def _as_date(value: Any) -> date:
+    # TruncMonth yields a date for DateField sources, but be tolerant of
+    # backends that hand back a datetime.
+    return value.date() if isinstance(value, datetime) else value
+
+
+def _elapsed_fraction(month_start: date, today: date) -> Decimal:
+    """Share of ``month_start``'s month that has elapsed as of ``today``."""
+    days_in_month = calendar.monthrange(month_start.year, month_start.month)[1]
+    if today < month_start:
+        return Decimal("0")
+    if (today.year, today.month) != (month_start.year, month_start.month):
+        return Decimal("1")
+    return Decimal(today.day) / Decimal(days_in_month)
+
+
+def _ratio(numerator: Decimal, denominator: Decimal) -> Decimal | None:
+    if denominator <= 0:
+        return None
+    return numerator / denominator * 100
+
+
+def compute_budget_rollover(
+    user: Any, date_range: DateRange, today: date | None = None
+) -> list[dict[str, Any]]:
+    """Compute carry-over, pacing and projections per spend category.
+
+    For each month the category's ``monthly_budget`` plus the previous
+    month's surplus (or minus its deficit) is available to spend. Pacing
+    compares actual spend with the pro-rata budget for the elapsed share of
+    the month, and the projection extrapolates the current run rate to
+    month end. Completed months are fully elapsed; future months are not.
+    Amounts are returned as Decimals and encoded by the API renderer.
+    """
+    today = today or timezone.localdate()
+    months = list(iter_months(date_range))
+    spending = monthly_category_spending(user, date_range)
+    fractions = {month: _elapsed_fraction(month, today) for month in months}
+
+    categories = Category.objects.filter(
+        user=user, classification=Category.SPEND
+    ).order_by("name")
+
+    result = []
+    for category in categories:
+        budget = category.monthly_budget
+        carried_in = ZERO
+        total_spent = ZERO
+        month_entries = []
+
+        for month in months:
+            spent = spending.get((category.id, month), ZERO)
+            available = budget + carried_in
+            remaining = available - spent
+            fraction = fractions[month]
+            expected_spent = budget * fraction
+            projected_spent = spent / fraction if fraction > 0 else spent
+
+            month_entries.append(
+                {
+                    "month": month.strftime("%Y-%m"),
+                    "budget": budget,
+                    "carried_in": carried_in,
+                    "available": available,
+                    "spent": spent,
+                    "remaining": remaining,
+                    "elapsed_percentage": fraction * 100,
+                    "expected_spent": expected_spent,
+                    "pace_percentage": _ratio(spent, expected_spent),
+                    "projected_spent": projected_spent,
+                    "projected_remaining": available - projected_spent,
+                }
+            )
+            total_spent += spent
+            carried_in = remaining
+
+        result.append(
+            {
+                "id": category.id,
+                "name": category.name,
+                "monthly_budget": budget,
+                "total_budget": budget * len(months),
+                "total_spent": total_spent,
+                "carryover": carried_in,
+                "months": month_entries,
+            }
+        )
+
+    return result
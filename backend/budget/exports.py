@@ -0,0 +1,76 @@
+"""
+Streaming transaction export.
+
+Rows are read with ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL) and rendered chunk by chunk, so memory stays flat regardless of
+the export size and the first bytes go out as soon as the first chunk is
+fetched. Rendering reuses ``TransactionListSerializer`` so exported rows match
+the list endpoint.
+
+Text cells that a spreadsheet would read as a formula (leading ``=``, ``+``,
+``-`` or ``@``) are prefixed with ``'`` in CSV output; numeric cells such as
+negative amounts are left as they are.
+"""
+
+import csv
+from collections.abc import Iterable, Iterator
+from decimal import Decimal, InvalidOperation
+
+from core.renderers import json_dumps
+from core.streaming import iter_chunks
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv; charset=utf-8", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+}
+EXPORT_CHUNK_SIZE = 2000
+# Leading characters that make spreadsheet applications evaluate a cell
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, for ``csv.writer``."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_cell(value):
+    """Neutralise a text ``value`` that would be evaluated as a formula."""
+    if not isinstance(value, str) or not value.startswith(CSV_FORMULA_PREFIXES):
+        return value
+    try:
+        Decimal(value)
+    except InvalidOperation:
+        return "'" + value
+    return value
+
+
+def _render_csv(fields: list[str], chunks: Iterable[list[dict]]) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(fields)
+    for rows in chunks:
+        yield "".join(
+            writer.writerow([_csv_cell(row[name]) for name in fields]) for row in rows
+        )
+
+
+def _render_ndjson(chunks: Iterable[list[dict]]) -> Iterator[bytes]:
+    for rows in chunks:
+        yield b"".join(json_dumps(row) + b"\n" for row in rows)
+
+
+def stream_transactions(
+    queryset, list_serializer, export_format: str
+) -> Iterator[str | bytes]:
+    """Stream ``queryset`` rendered by ``list_serializer`` as CSV or NDJSON."""
+    values = list_serializer.get_values_queryset(queryset).iterator(
+        chunk_size=EXPORT_CHUNK_SIZE
+    )
+    chunks = (
+        list_serializer.to_representation(rows)
+        for rows in iter_chunks(values, EXPORT_CHUNK_SIZE)
+    )
+    if export_format == "csv":
+        return _render_csv(list_serializer.fields, chunks)
+    return _render_ndjson(chunks)
@@ -0,0 +1,180 @@
+import logging
+from functools import partial
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from budget.views import (
+    BACKUP_COMPRESSIONS,
+    BACKUP_ENTITIES,
+    BACKUP_FORMATS,
+    BACKUP_VERSION,
+    backup_sections,
+    encode_backup,
+)
+from core.archive import (
+    get_backup_storage,
+    list_snapshots,
+    prune_snapshots,
+    snapshot_name,
+    snapshot_time,
+    verify_snapshot,
+    write_snapshot,
+)
+from core.backup import prune_backup_history
+from core.scheduling import run_every
+from core.streaming import ZSTD_AVAILABLE
+
+logger = logging.getLogger(__name__)
+
+SYSTEM_SCOPE = "system"
+USERS_SCOPE = "users"
+
+
+class Command(BaseCommand):
+    help = (
+        "Write backup snapshots to the 'backups' storage (BACKUP_DIR by "
+        "default) and prune old ones: the newest snapshot of each of the last "
+        "BACKUP_RETENTION_DAILY days and BACKUP_RETENTION_WEEKLY weeks is "
+        "kept. By default one full-system snapshot is written (all regular "
+        "users and their data); --per-user writes one per user. Backup "
+        "manifests and deletion tombstones older than every retained full "
+        "backup are pruned too. Run it from cron, or keep it running with "
+        "--every."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--per-user",
+            action="store_true",
+            help="Write one snapshot per active regular user",
+        )
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            metavar="USERNAME",
+            help="Write a snapshot of this user only (repeatable)",
+        )
+        parser.add_argument(
+            "--backup-format", choices=list(BACKUP_FORMATS), default="columnar"
+        )
+        parser.add_argument(
+            "--compress", choices=list(BACKUP_COMPRESSIONS), default="gzip"
+        )
+        parser.add_argument(
+            "--daily", type=int, default=settings.BACKUP_RETENTION_DAILY
+        )
+        parser.add_argument(
+            "--weekly", type=int, default=settings.BACKUP_RETENTION_WEEKLY
+        )
+        parser.add_argument(
+            "--keep-full",
+            type=int,
+            default=settings.BACKUP_RETENTION_FULL,
+            help="Downloaded full backups per user whose history is kept",
+        )
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Check stored snapshots against their checksums and exit",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            metavar="HOURS",
+            help="Keep running and take snapshots every HOURS hours",
+        )
+
+    def handle(self, *args, **options):
+        if options["compress"] == "zstd" and not ZSTD_AVAILABLE:
+            raise CommandError("zstd compression requires the zstandard package")
+        if options["keep_full"] < 1:
+            raise CommandError("--keep-full must be at least 1")
+        if options["verify"]:
+            self._verify()
+            return
+        if not options["every"]:
+            self._run(options)
+            return
+        run_every(options["every"], partial(self._run, options), logger)
+
+    def _targets(self, options):
+        """Yield ``(scope, user, include)`` for each snapshot to write."""
+        user_model = get_user_model()
+        if not options["usernames"] and not options["per_user"]:
+            yield SYSTEM_SCOPE, None, set(BACKUP_ENTITIES)
+            return
+
+        users = user_model.objects.filter(is_staff=False, is_superuser=False)
+        if options["usernames"]:
+            users = user_model.objects.filter(username__in=options["usernames"])
+            missing = set(options["usernames"]) - set(
+                users.values_list("username", flat=True)
+            )
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+        else:
+            users = users.filter(is_active=True)
+        for user in users.order_by("pk").iterator():
+            yield f"{USERS_SCOPE}/{user.pk}", user, set(BACKUP_ENTITIES) - {"users"}
+
+    def _run(self, options):
+        backup_format = options["backup_format"]
+        compress = options["compress"]
+        extension = f".{backup_format}{BACKUP_COMPRESSIONS[compress][2]}"
+
+        for scope, user, include in self._targets(options):
+            taken_at = timezone.now()
+            header = {
+                "version": BACKUP_VERSION,
+                "exported_at": taken_at.isoformat(),
+                "username": user.username if user else SYSTEM_SCOPE,
+                "multi_user": user is None,
+                "since": None,
+            }
+            stream = encode_backup(
+                header, backup_sections(user, include), backup_format, compress
+            )
+            name, checksum = write_snapshot(
+                snapshot_name(scope, taken_at, extension), stream
+            )
+            deleted = prune_snapshots(scope, options["daily"], options["weekly"])
+            self.stdout.write(
+                f"{name} sha256={checksum[:12]} ({len(deleted)} old snapshot(s) pruned)"
+            )
+
+        # The oldest stored snapshot is a full backup every user may restore
+        oldest = min(
+            (
+                snapshot_time(name)
+                for scope in self._scopes()
+                for name in list_snapshots(scope)[:1]
+            ),
+            default=timezone.now(),
+        )
+        manifests, tombstones = prune_backup_history(options["keep_full"], oldest)
+        self.stdout.write(
+            f"{manifests} backup manifest(s) and {tombstones} tombstone(s) pruned"
+        )
+
+    def _scopes(self):
+        storage = get_backup_storage()
+        try:
+            user_dirs, _ = storage.listdir(USERS_SCOPE)
+        except FileNotFoundError:
+            user_dirs = []
+        return [SYSTEM_SCOPE, *(f"{USERS_SCOPE}/{pk}" for pk in sorted(user_dirs))]
+
+    def _verify(self):
+        failed = []
+        for scope in self._scopes():
+            for name in list_snapshots(scope):
+                ok = verify_snapshot(name)
+                self.stdout.write(f"{'OK  ' if ok else 'FAIL'} {name}")
+                if not ok:
+                    failed.append(name)
+        if failed:
+            raise CommandError(f"{len(failed)} snapshot(s) failed verification")
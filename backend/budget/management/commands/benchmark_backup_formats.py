@@ -0,0 +1,116 @@
+import io
+import time
+from datetime import date, timedelta
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from budget.models import BankAccount, Category, Transaction
+from budget.views import BACKUP_ENTITIES, BACKUP_FORMATS, get_backup_compressor
+from core.backup import NDJSONBackupReader, backup_all
+from core.renderers import json_loads
+from core.streaming import ZSTD_AVAILABLE, open_decompressed
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare backup size, encode time and decode time across backup "
+        "formats and compressions. Sample rows are created inside a "
+        "transaction that is rolled back; rows are fetched once up front so "
+        "only encoding and decoding are timed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=50000)
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        with transaction.atomic():
+            user = self._create_sample_data(rows)
+            self._report(user, rows, repeat)
+            transaction.set_rollback(True)
+
+    def _create_sample_data(self, rows):
+        user = get_user_model().objects.create_user(
+            username="benchmark-backup", password=None
+        )
+        categories = [
+            Category.objects.create(user=user, name=f"Category {i}") for i in range(10)
+        ]
+        accounts = [
+            BankAccount.objects.create(user=user, name=f"Account {i}") for i in range(3)
+        ]
+        Transaction.objects.bulk_create(
+            (
+                Transaction(
+                    user=user,
+                    account=accounts[i % len(accounts)],
+                    category=categories[i % len(categories)],
+                    date=date(2020, 1, 1) + timedelta(days=i % 2000),
+                    amount=-(i % 500) - 0.99,
+                    description=f"Sample merchant {i}",
+                    reference_id=f"benchmark-{i}",
+                )
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        return user
+
+    def _time(self, fn, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            result = fn()
+            best = min(best, time.perf_counter() - started)
+        return best, result
+
+    def _variants(self):
+        yield "json", "", "json"
+        yield "json", "gzip", "json + gzip"
+        yield "ndjson", "gzip", "ndjson + gzip"
+        yield "columnar", "gzip", "columnar + gzip"
+        if ZSTD_AVAILABLE:
+            yield "json", "zstd", "json + zstd"
+            yield "columnar", "zstd", "columnar + zstd"
+
+    def _report(self, user, rows, repeat):
+        data = backup_all(user, include=set(BACKUP_ENTITIES) - {"users"})
+        header = {"version": "1.0", "username": user.username}
+
+        def decode(content, backup_format):
+            fileobj = open_decompressed(io.BytesIO(content))
+            if backup_format == "json":
+                return json_loads(fileobj.read())
+            reader = NDJSONBackupReader(fileobj)
+            return {key: [*reader[key]] for key in data}
+
+        baseline = None
+        self.stdout.write(f"{rows} transactions, best of {repeat} runs")
+        self.stdout.write(
+            f"  {'format':<18} {'size MB':>9} {'x json':>7} "
+            f"{'encode ms':>10} {'decode ms':>10}"
+        )
+        for backup_format, compress, label in self._variants():
+            writer, _ = BACKUP_FORMATS[backup_format]
+
+            def encode(writer=writer, backup_format=backup_format, compress=compress):
+                stream = writer(header, data.items())
+                if compress:
+                    stream = get_backup_compressor(backup_format, compress)(stream)
+                return b"".join(stream)
+
+            encode_seconds, content = self._time(encode, repeat)
+            decode_seconds, _ = self._time(
+                partial(decode, content, backup_format), repeat
+            )
+            baseline = baseline or len(content)
+            self.stdout.write(
+                f"  {label:<18} {len(content) / 1e6:9.2f} "
+                f"{baseline / len(content):7.1f} "
+                f"{encode_seconds * 1000:10.1f} {decode_seconds * 1000:10.1f}"
+            )
@@ -0,0 +1,111 @@
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from budget.models import BankAccount, Category, Transaction
+from budget.serializers import TransactionListSerializer, TransactionSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare transaction list serialization time per 1,000 rows between "
+        "TransactionSerializer on model instances and the values() fast path. "
+        "Sample rows are created inside a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=5000)
+        parser.add_argument("--repeat", type=int, default=5)
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        repeat = options["repeat"]
+        with transaction.atomic():
+            user = self._create_sample_data(rows)
+            self._report(user, rows, repeat)
+            transaction.set_rollback(True)
+
+    def _create_sample_data(self, rows):
+        user = get_user_model().objects.create_user(
+            username="benchmark-serialization", password=None
+        )
+        categories = [
+            Category.objects.create(user=user, name=f"Category {i}") for i in range(10)
+        ]
+        accounts = [
+            BankAccount.objects.create(user=user, name=f"Account {i}") for i in range(3)
+        ]
+        Transaction.objects.bulk_create(
+            (
+                Transaction(
+                    user=user,
+                    account=accounts[i % len(accounts)],
+                    category=categories[i % len(categories)],
+                    date=date(2020, 1, 1) + timedelta(days=i % 2000),
+                    amount=-(i % 500) - 0.99,
+                    description=f"Sample merchant {i}",
+                    reference_id=f"benchmark-{i}",
+                )
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        return user
+
+    def _time(self, fn, repeat):
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        return best
+
+    def _report(self, user, rows, repeat):
+        def base_queryset():
+            return (
+                Transaction.objects.filter(user=user)
+                .select_related("category", "account")
+                .order_by("-date")
+            )
+
+        list_serializer = TransactionListSerializer()
+        instances = list(base_queryset())
+        values_rows = list(list_serializer.get_values_queryset(base_queryset()))
+
+        results = [
+            (
+                "serialize only: TransactionSerializer",
+                self._time(
+                    lambda: TransactionSerializer(instances, many=True).data, repeat
+                ),
+            ),
+            (
+                "serialize only: TransactionListSerializer",
+                self._time(
+                    lambda: list_serializer.to_representation(values_rows), repeat
+                ),
+            ),
+            (
+                "query + serialize: model instances",
+                self._time(
+                    lambda: TransactionSerializer(base_queryset(), many=True).data,
+                    repeat,
+                ),
+            ),
+            (
+                "query + serialize: values() fast path",
+                self._time(
+                    lambda: list_serializer.to_representation(
+                        list_serializer.get_values_queryset(base_queryset())
+                    ),
+                    repeat,
+                ),
+            ),
+        ]
+
+        self.stdout.write(f"{rows} rows, best of {repeat} runs (ms per 1,000 rows)")
+        for label, seconds in results:
+            self.stdout.write(f"  {label:<45} {seconds * 1000 * 1000 / rows:8.2f}")
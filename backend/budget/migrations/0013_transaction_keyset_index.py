@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-19 08:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budget", "0012_state_only_remove_wealth_models"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="transaction",
+            index=models.Index(
+                fields=["user", "-date", "-id"], name="budget_tran_user_id_2c5327_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Full-text index on Transaction.description, created per database vendor.
+# The index is not part of the model state: PostgreSQL gets a GIN index on the
+# same to_tsvector() expression budget.search queries with, MySQL a FULLTEXT
+# index. Other backends are left untouched and use the ILIKE fallback.
+# Keep SEARCH_INDEX_NAME and the text search config in sync with budget.search.
+from django.db import migrations
+
+SEARCH_INDEX_NAME = "budget_tran_desc_search_idx"
+
+
+def create_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        from django.contrib.postgres.indexes import GinIndex
+        from django.contrib.postgres.search import SearchVector
+
+        transaction_model = apps.get_model("budget", "Transaction")
+        schema_editor.add_index(
+            transaction_model,
+            GinIndex(
+                SearchVector("description", config="simple"),
+                name=SEARCH_INDEX_NAME,
+            ),
+        )
+    elif vendor == "mysql":
+        schema_editor.execute(
+            f"CREATE FULLTEXT INDEX {SEARCH_INDEX_NAME} "
+            "ON budget_transaction (description)"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(f"DROP INDEX IF EXISTS {SEARCH_INDEX_NAME}")
+    elif vendor == "mysql":
+        schema_editor.execute(f"DROP INDEX {SEARCH_INDEX_NAME} ON budget_transaction")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("budget", "0013_transaction_keyset_index"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
 
+from core.models import TombstoneModel
+
+
+class Category(TombstoneModel):
+    backup_entity = "categories"
 
-class Category(models.Model):
     SPEND = "spend"
     INCOME = "income"
     CLASSIFICATION_CHOICES = [
@@ -40,7 +44,9 @@ class Category(models.Model):
         return self.name
 
 
-class BankAccount(models.Model):
+class BankAccount(TombstoneModel):
+    backup_entity = "bank_accounts"
+
     CHECKING = "checking"
     SAVINGS = "savings"
     CREDIT_CARD = "credit_card"
@@ -96,7 +102,9 @@ class BankAccount(models.Model):
         return f"{self.name} ({self.get_account_type_display()})"
 
 
-class Transaction(models.Model):
+class Transaction(TombstoneModel):
+    backup_entity = "transactions"
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="transactions"
     )
@@ -128,6 +136,7 @@ class Transaction(models.Model):
             models.Index(fields=["user", "date"]),
             models.Index(fields=["user", "category"]),
             models.Index(fields=["user", "-date"]),  # For recent transactions
+            models.Index(fields=["user", "-date", "-id"]),  # Keyset pagination
             models.Index(
                 fields=["user", "date", "category"]
             ),  # Composite for filtering
@@ -145,7 +154,7 @@ class Transaction(models.Model):
         return f"{self.description} - {self.amount:.2f} ({self.date})"
 
 
-class ReclassificationRule(models.Model):
+class ReclassificationRule(TombstoneModel):
     """Store persistent reclassification rules for Clean and Reclassify feature
 
     Supports advanced conditions:
@@ -160,6 +169,8 @@ class ReclassificationRule(models.Model):
     }
     """
 
+    backup_entity = "reclassification_rules"
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -279,9 +290,11 @@ class ReclassificationRule(models.Model):
         return True
 
 
-class CategoryDeletionRule(models.Model):
+class CategoryDeletionRule(TombstoneModel):
     """Store persistent category deletion rules for Clean and Reclassify feature"""
 
+    backup_entity = "category_deletion_rules"
+
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
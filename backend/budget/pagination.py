@@ -1,7 +1,179 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import date
+
+from django.db.models import Q
+
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class StandardResultsPagination(PageNumberPagination):
     page_size = 100
     page_size_query_param = "page_size"
     max_page_size = 5000
+
+
+class TransactionCursorPagination(BasePagination):
+    """
+    Keyset pagination for transactions ordered by (-date, -id).
+
+    Each page is fetched with a ``(date, id) < (cursor_date, cursor_id)``
+    predicate instead of an OFFSET, and no COUNT(*) is issued, so page 500
+    costs the same as page 1. Cursors are opaque and work in both directions.
+
+    That order replaces any other: ``?ordering=`` is rejected with a 400, and
+    ``?search=`` results come newest first rather than by relevance. Every
+    link carries ``pagination=cursor`` so following it stays in cursor mode.
+    """
+
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 5000
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    mode_query_param = "pagination"
+    mode = "cursor"
+    ordering_query_param = "ordering"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        if self.ordering_query_param in request.query_params:
+            raise ValidationError(
+                {
+                    self.ordering_query_param: [
+                        "Not supported with cursor pagination, which is "
+                        "ordered by date and id, newest first."
+                    ]
+                }
+            )
+        self.base_url = replace_query_param(
+            request.build_absolute_uri(), self.mode_query_param, self.mode
+        )
+        self.page_size = self.get_page_size(request)
+
+        cursor = self.decode_cursor(request)
+        self.reverse = bool(cursor and cursor[0])
+
+        if cursor is None:
+            queryset = queryset.order_by("-date", "-id")
+        else:
+            _, cursor_date, cursor_id = cursor
+            if self.reverse:
+                queryset = queryset.filter(
+                    Q(date__gt=cursor_date) | Q(date=cursor_date, id__gt=cursor_id),
+                    date__gte=cursor_date,
+                ).order_by("date", "id")
+            else:
+                queryset = queryset.filter(
+                    Q(date__lt=cursor_date) | Q(date=cursor_date, id__lt=cursor_id),
+                    date__lte=cursor_date,
+                ).order_by("-date", "-id")
+
+        # Fetch one extra row to learn whether another page exists
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if self.reverse:
+            rows.reverse()
+
+        if self.reverse:
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    @staticmethod
+    def _position(row):
+        if isinstance(row, dict):
+            return row["date"], row["id"]
+        return row.date, row.id
+
+    def decode_cursor(self, request):
+        """Return ``(reverse, date, id)`` or None when no cursor is given."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            decoded = base64.urlsafe_b64decode(encoded.encode("ascii")).decode("ascii")
+            direction, cursor_date, cursor_id = decoded.split(":")
+            if direction not in ("n", "p"):
+                raise ValueError(direction)
+            return direction == "p", date.fromisoformat(cursor_date), int(cursor_id)
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise NotFound(self.invalid_cursor_message) from exc
+
+    def encode_cursor(self, reverse, row):
+        row_date, row_id = self._position(row)
+        value = f"{'p' if reverse else 'n'}:{row_date.isoformat()}:{row_id}"
+        encoded = base64.urlsafe_b64encode(value.encode("ascii")).decode("ascii")
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # An empty reverse page means we stepped before the first row
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(False, self.page[-1])
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(True, self.page[0])
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque keyset cursor taken from next/previous",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
@@ -0,0 +1,172 @@
+"""
+Calendar-correct period resolution for reporting queries.
+
+Every resolver returns a half-open ``DateRange`` (``start <= date < end``).
+Filtering with ``date__gte`` / ``date__lt`` compiles to plain range predicates
+that can use the ``(user, date)`` composite index on ``Transaction``, unlike
+``date__year`` / ``date__month`` lookups which some backends turn into
+non-sargable ``EXTRACT`` expressions.
+"""
+
+import re
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+# Rolling keywords resolve to the period containing "today".
+CURRENT_PERIODS = ("week", "month", "quarter", "year")
+
+_YEAR_MONTH_RE = re.compile(r"^(\d{4})-(\d{2})$")
+_YEAR_QUARTER_RE = re.compile(r"^(\d{4})-[Qq]([1-4])$")
+_ISO_WEEK_RE = re.compile(r"^(\d{4})-[Ww](\d{2})$")
+_YEAR_RE = re.compile(r"^(\d{4})$")
+
+
+@dataclass(frozen=True)
+class DateRange:
+    """Half-open date interval: ``start`` is inclusive, ``end`` is exclusive."""
+
+    start: date
+    end: date
+
+    @property
+    def last_day(self) -> date:
+        """Inclusive last day of the range, for display purposes."""
+        return self.end - timedelta(days=1)
+
+    def as_filter(self, field: str = "date") -> dict[str, date]:
+        """Return ORM lookup kwargs selecting ``field`` within this range."""
+        return {f"{field}__gte": self.start, f"{field}__lt": self.end}
+
+    def __contains__(self, value: date) -> bool:
+        return self.start <= value < self.end
+
+
+def get_fiscal_year_start_month() -> int:
+    """Configured first month of the fiscal year (1 = calendar year)."""
+    return getattr(settings, "FISCAL_YEAR_START_MONTH", 1)
+
+
+def _add_months(year: int, month: int, months: int) -> date:
+    """Return the first day of the month ``months`` after ``year``-``month``."""
+    index = year * 12 + (month - 1) + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(year: int, month: int) -> DateRange:
+    """Calendar month containing ``year``-``month``."""
+    start = date(year, month, 1)
+    return DateRange(start, _add_months(year, month, 1))
+
+
+def fiscal_year_range(fiscal_year: int, start_month: int | None = None) -> DateRange:
+    """Fiscal year labelled by the calendar year in which it begins.
+
+    With ``start_month=10``, fiscal year 2025 covers 2025-10-01 to 2026-09-30.
+    """
+    start_month = start_month or get_fiscal_year_start_month()
+    start = date(fiscal_year, start_month, 1)
+    return DateRange(start, _add_months(fiscal_year, start_month, 12))
+
+
+def quarter_range(
+    fiscal_year: int, quarter: int, start_month: int | None = None
+) -> DateRange:
+    """Quarter ``quarter`` (1-4) of the given fiscal year."""
+    if quarter not in (1, 2, 3, 4):
+        raise ValueError("Quarter must be between 1 and 4")
+    start_month = start_month or get_fiscal_year_start_month()
+    start = _add_months(fiscal_year, start_month, (quarter - 1) * 3)
+    return DateRange(start, _add_months(start.year, start.month, 3))
+
+
+def iso_week_range(iso_year: int, week: int) -> DateRange:
+    """ISO-8601 week (Monday to Sunday) of the given ISO year."""
+    start = date.fromisocalendar(iso_year, week, 1)
+    return DateRange(start, start + timedelta(days=7))
+
+
+def fiscal_position(day: date, start_month: int | None = None) -> tuple[int, int]:
+    """Return ``(fiscal_year, quarter)`` for ``day``."""
+    start_month = start_month or get_fiscal_year_start_month()
+    offset = (day.month - start_month) % 12
+    fiscal_year = day.year if day.month >= start_month else day.year - 1
+    return fiscal_year, offset // 3 + 1
+
+
+def current_period_range(
+    period: str, today: date | None = None, start_month: int | None = None
+) -> DateRange:
+    """Calendar period (week/month/quarter/year) that contains ``today``."""
+    today = today or timezone.localdate()
+    if period == "week":
+        iso_year, iso_week, _ = today.isocalendar()
+        return iso_week_range(iso_year, iso_week)
+    if period == "month":
+        return month_range(today.year, today.month)
+    if period == "quarter":
+        return quarter_range(*fiscal_position(today, start_month), start_month)
+    if period == "year":
+        return fiscal_year_range(fiscal_position(today, start_month)[0], start_month)
+    raise ValueError(f"Unknown period: {period}")
+
+
+def resolve_period(
+    period: str, today: date | None = None, start_month: int | None = None
+) -> DateRange:
+    """Resolve a period specifier to a half-open ``DateRange``.
+
+    Accepted forms:
+      - ``week``, ``month``, ``quarter``, ``year``: the period containing today
+      - ``YYYY-MM``: calendar month
+      - ``YYYY-Qn``: quarter n of fiscal year YYYY
+      - ``YYYY-Www``: ISO week
+      - ``YYYY``: fiscal year
+
+    Raises ValueError for anything else, including out-of-range components.
+    """
+    if period in CURRENT_PERIODS:
+        return current_period_range(period, today, start_month)
+
+    if match := _YEAR_MONTH_RE.match(period):
+        return month_range(int(match[1]), int(match[2]))
+    if match := _YEAR_QUARTER_RE.match(period):
+        return quarter_range(int(match[1]), int(match[2]), start_month)
+    if match := _ISO_WEEK_RE.match(period):
+        return iso_week_range(int(match[1]), int(match[2]))
+    if match := _YEAR_RE.match(period):
+        return fiscal_year_range(int(match[1]), start_month)
+
+    raise ValueError(f"Unrecognised period: {period}")
+
+
+def parse_month(value: str) -> DateRange:
+    """Parse a strict ``YYYY-MM`` value into its month range.
+
+    Raises ValueError for any other format or an invalid month.
+    """
+    match = _YEAR_MONTH_RE.match(value or "")
+    if not match:
+        raise ValueError(f"Expected YYYY-MM, got: {value}")
+    return month_range(int(match[1]), int(match[2]))
+
+
+def month_range_from_param(value: str, today: date | None = None) -> DateRange:
+    """Parse a ``YYYY-MM`` query parameter, falling back to the current month."""
+    try:
+        return parse_month(value)
+    except ValueError:
+        return current_period_range("month", today)
+
+
+def iter_months(date_range: DateRange) -> Iterator[date]:
+    """Yield the first day of every month that starts within ``date_range``."""
+    current = date(date_range.start.year, date_range.start.month, 1)
+    if current < date_range.start:
+        current = _add_months(current.year, current.month, 1)
+    while current < date_range.end:
+        yield current
+        current = _add_months(current.year, current.month, 1)
@@ -0,0 +1,107 @@
+"""
+Indexed full-text search for transaction descriptions.
+
+DRF's ``SearchFilter`` compiles to ``ILIKE '%term%'``, which cannot use an
+index. ``TransactionSearchFilter`` instead matches against the full-text index
+created by migration ``0014_transaction_description_search_index``:
+
+- PostgreSQL: ``to_tsvector`` GIN index, ranked with ``ts_rank``
+- MySQL: ``FULLTEXT`` index, ranked with ``MATCH ... AGAINST``
+
+Every term is prefix-matched and all terms must match. Other backends (and
+MySQL terms shorter than its minimum token size) fall back to the stock
+``SearchFilter`` behaviour. Search runs as a regular queryset filter, so it
+composes with the date, category and account filters of ``TransactionFilter``.
+"""
+
+import re
+
+from django.db import connections
+from django.db.models import F, FloatField, Func, Value
+
+from rest_framework.filters import SearchFilter
+
+# Text search configuration baked into the PostgreSQL index expression. Bank
+# descriptions are merchant names, so no stemming or stop words.
+SEARCH_CONFIG = "simple"
+SEARCH_INDEX_NAME = "budget_tran_desc_search_idx"
+# InnoDB ignores tokens shorter than innodb_ft_min_token_size (default 3).
+MYSQL_MIN_TOKEN_SIZE = 3
+
+_TERM_RE = re.compile(r"\w+")
+
+
+def search_terms(value: str) -> list[str]:
+    """Split user input into word tokens safe to embed in a search query."""
+    return _TERM_RE.findall(value.lower())
+
+
+def description_search_vector():
+    """Expression indexed by the PostgreSQL GIN index (must match queries)."""
+    from django.contrib.postgres.search import SearchVector
+
+    return SearchVector("description", config=SEARCH_CONFIG)
+
+
+class MatchAgainst(Func):
+    """MySQL ``MATCH (column) AGAINST (query IN BOOLEAN MODE)`` relevance score."""
+
+    output_field = FloatField()
+
+    def __init__(self, field: str, query: str) -> None:
+        super().__init__(F(field), Value(query))
+
+    def as_sql(self, compiler, connection, **extra_context):
+        field_sql, field_params = compiler.compile(self.source_expressions[0])
+        query_sql, query_params = compiler.compile(self.source_expressions[1])
+        return (
+            f"MATCH ({field_sql}) AGAINST ({query_sql} IN BOOLEAN MODE)",
+            [*field_params, *query_params],
+        )
+
+
+class TransactionSearchFilter(SearchFilter):
+    """``?search=`` backed by the description full-text index, ranked by relevance.
+
+    Results are ordered by relevance, then newest first; an explicit
+    ``?ordering=`` parameter (applied later by ``OrderingFilter``) overrides it.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = search_terms(" ".join(self.get_search_terms(request)))
+        if not terms:
+            return super().filter_queryset(request, queryset, view)
+
+        vendor = connections[queryset.db].vendor
+
+        if vendor == "postgresql":
+            return self._filter_postgresql(queryset, terms)
+        if vendor == "mysql" and all(len(t) >= MYSQL_MIN_TOKEN_SIZE for t in terms):
+            return self._filter_mysql(queryset, terms)
+        return super().filter_queryset(request, queryset, view)
+
+    @staticmethod
+    def _filter_postgresql(queryset, terms):
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query = SearchQuery(
+            " & ".join(f"{term}:*" for term in terms),
+            config=SEARCH_CONFIG,
+            search_type="raw",
+        )
+        vector = description_search_vector()
+        return (
+            queryset.annotate(search_vector=vector)
+            .filter(search_vector=query)
+            .annotate(search_rank=SearchRank(vector, query))
+            .order_by("-search_rank", "-date", "-id")
+        )
+
+    @staticmethod
+    def _filter_mysql(queryset, terms):
+        rank = MatchAgainst("description", " ".join(f"+{term}*" for term in terms))
+        return (
+            queryset.annotate(search_rank=rank)
+            .filter(search_rank__gt=0)
+            .order_by("-search_rank", "-date", "-id")
+        )
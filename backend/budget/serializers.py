@@ -11,6 +11,7 @@ from .models import (
     ReclassificationRule,
     Transaction,
 )
+from .periods import current_period_range
 
 
 class UserDetailsSerializer(serializers.ModelSerializer):
@@ -60,19 +61,17 @@ class BankAccountSerializer(serializers.ModelSerializer):
     def get_current_month_count(self, instance: BankAccount) -> int:
         if hasattr(instance, "current_month_count"):
             return instance.current_month_count  # type: ignore[return-value]
-        now = timezone.now()
-        return instance.transactions.filter(
-            date__year=now.year, date__month=now.month
-        ).count()
+        month = current_period_range("month")
+        return instance.transactions.filter(**month.as_filter()).count()
 
     def get_current_month_balance(self, instance: BankAccount) -> float:
         if hasattr(instance, "current_month_balance"):
             val = instance.current_month_balance  # type: ignore[attr-defined]
             return float(val) if val is not None else 0.0
-        now = timezone.now()
-        total = instance.transactions.filter(
-            date__year=now.year, date__month=now.month
-        ).aggregate(total=Sum("amount"))["total"]
+        month = current_period_range("month")
+        total = instance.transactions.filter(**month.as_filter()).aggregate(
+            total=Sum("amount")
+        )["total"]
         return float(total) if total is not None else 0.0
 
     class Meta:
@@ -133,6 +132,86 @@ class TransactionSerializer(serializers.ModelSerializer):
         ]
 
 
+def _format_date(value, tzinfo):
+    return value.isoformat() if value is not None else None
+
+
+def _format_datetime(value, tzinfo):
+    # Mirrors serializers.DateTimeField: current timezone, "Z" for UTC
+    if not value:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(tzinfo)
+    text = value.isoformat()
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+def _format_decimal(value, tzinfo):
+    return f"{value:f}" if value is not None else None
+
+
+class TransactionListSerializer:
+    """
+    Hand-written serializer for the transaction list fast path.
+
+    Works on ``.values()`` rows with the related names joined in SQL and
+    produces the same representation as ``TransactionSerializer``, without
+    instantiating DRF fields or model instances per row. Supports a sparse
+    fieldset via ``fields``.
+    """
+
+    # output field -> (values() lookup, formatter)
+    field_sources = {
+        "id": ("id", None),
+        "date": ("date", _format_date),
+        "amount": ("amount", _format_decimal),
+        "description": ("description", None),
+        "category": ("category_id", None),
+        "category_name": ("category__name", None),
+        "account": ("account_id", None),
+        "import_source": ("import_source", None),
+        "import_date": ("import_date", _format_datetime),
+        "reference_id": ("reference_id", None),
+        "created_at": ("created_at", _format_datetime),
+        "updated_at": ("updated_at", _format_datetime),
+        "account_name": ("account__name", None),
+        "account_type": ("account__account_type", None),
+    }
+    # Always selected: keyset pagination reads them from each row
+    required_lookups = ("id", "date")
+
+    def __init__(self, fields=None):
+        self.fields = (
+            list(fields) if fields else list(TransactionSerializer.Meta.fields)
+        )
+        unknown = [name for name in self.fields if name not in self.field_sources]
+        if unknown:
+            raise serializers.ValidationError(
+                {"fields": [f"Unknown field: {name}" for name in unknown]}
+            )
+
+    def get_values_queryset(self, queryset):
+        """Project ``queryset`` onto the columns needed for ``self.fields``."""
+        lookups = list(self.required_lookups)
+        for name in self.fields:
+            lookup = self.field_sources[name][0]
+            if lookup not in lookups:
+                lookups.append(lookup)
+        return queryset.values(*lookups)
+
+    def to_representation(self, rows):
+        # Resolved once: looking up the current timezone per value is costly
+        tzinfo = timezone.get_current_timezone()
+        plan = [(name, *self.field_sources[name]) for name in self.fields]
+        return [
+            {
+                name: formatter(row[lookup], tzinfo) if formatter else row[lookup]
+                for name, lookup, formatter in plan
+            }
+            for row in rows
+        ]
+
+
 class ReclassificationRuleSerializer(serializers.ModelSerializer):
     from_category_name = serializers.CharField(
         source="from_category.name", read_only=True, allow_null=True
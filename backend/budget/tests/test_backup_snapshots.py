@@ -0,0 +1,295 @@
+import io
+import tempfile
+from datetime import UTC, date, datetime, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from budget.models import BankAccount, Category, Transaction
+from core.archive import (
+    get_backup_storage,
+    list_snapshots,
+    prune_snapshots,
+    retained_snapshots,
+    snapshot_name,
+    snapshot_time,
+    verify_snapshot,
+    write_snapshot,
+)
+from core.backup import prune_backup_history
+from core.models import BackupManifest, DeletedRecord
+
+
+def _names(*taken_at):
+    return [snapshot_name("system", when, ".json") for when in taken_at]
+
+
+class SnapshotRetentionTest(SimpleTestCase):
+    def test_snapshot_name_round_trip(self):
+        """Test the snapshot timestamp is parsed back from its name"""
+        taken_at = datetime(2026, 1, 2, 3, 4, 5, tzinfo=UTC)
+        name = snapshot_name("users/7", taken_at, ".columnar.gz")
+        self.assertEqual(name, "users/7/snapshot-20260102T030405Z.columnar.gz")
+        self.assertEqual(snapshot_time(name), taken_at)
+        self.assertIsNone(snapshot_time(name + ".sha256"))
+        self.assertIsNone(snapshot_time("system/notes.txt"))
+
+    def test_keeps_newest_per_day_and_week(self):
+        """Test retention keeps the newest snapshot of each day and week"""
+        start = datetime(2026, 3, 2, 2, 0, tzinfo=UTC)  # a Monday
+        # Two snapshots a day for four weeks
+        names = _names(
+            *(
+                start + timedelta(days=day, hours=hour)
+                for day in range(28)
+                for hour in (0, 12)
+            )
+        )
+        keep = retained_snapshots(names, daily=3, weekly=2)
+
+        latest_days = {start + timedelta(days=day, hours=12) for day in (25, 26, 27)}
+        # Sundays at 12:00 close their ISO week; the current week's is day 27
+        latest_weeks = {start + timedelta(days=20, hours=12)}
+        self.assertEqual(
+            {snapshot_time(name) for name in keep}, latest_days | latest_weeks
+        )
+
+    def test_always_keeps_newest(self):
+        """Test the newest snapshot survives a zero retention policy"""
+        names = _names(
+            datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 2, tzinfo=UTC)
+        )
+        self.assertEqual(retained_snapshots(names, daily=0, weekly=0), {names[1]})
+
+
+class WriteSnapshotTest(SimpleTestCase):
+    def setUp(self):
+        """Set up a temporary snapshot storage"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.storage = FileSystemStorage(location=tmp.name)
+
+    def test_write_and_verify(self):
+        """Test a written snapshot is stored with a matching checksum"""
+        name = snapshot_name("system", datetime(2026, 1, 1, tzinfo=UTC), ".json")
+        stored, checksum = write_snapshot(name, [b'{"a":', b"1}"], self.storage)
+
+        self.assertEqual(stored, name)
+        with self.storage.open(name + ".sha256") as sidecar:
+            self.assertEqual(
+                sidecar.read().decode(),
+                f"{checksum}  snapshot-20260101T000000Z.json\n",
+            )
+        self.assertTrue(verify_snapshot(name, self.storage))
+
+    def test_verify_detects_corruption(self):
+        """Test verification fails for a modified or unchecked snapshot"""
+        name = snapshot_name("system", datetime(2026, 1, 1, tzinfo=UTC), ".json")
+        write_snapshot(name, [b"original"], self.storage)
+        self.storage.delete(name)
+        self.storage.save(name, ContentFile(b"tampered"))
+        self.assertFalse(verify_snapshot(name, self.storage))
+
+        self.storage.save("system/snapshot-20260102T000000Z.json", ContentFile(b"x"))
+        self.assertFalse(
+            verify_snapshot("system/snapshot-20260102T000000Z.json", self.storage)
+        )
+
+    def test_prune_deletes_snapshot_and_checksum(self):
+        """Test pruning removes old snapshots together with their checksums"""
+        names = _names(
+            datetime(2026, 1, 1, tzinfo=UTC), datetime(2026, 1, 1, 12, tzinfo=UTC)
+        )
+        for name in names:
+            write_snapshot(name, [b"data"], self.storage)
+
+        deleted = prune_snapshots("system", 1, 0, self.storage)
+
+        self.assertEqual(deleted, names[:1])
+        self.assertEqual(list_snapshots("system", self.storage), names[1:])
+        self.assertFalse(self.storage.exists(names[0] + ".sha256"))
+
+
+class BackupHistoryPruneTest(APITestCase):
+    def setUp(self):
+        """Set up users and the current time"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.other = User.objects.create_user(username="other", password="testpass")
+        self.now = timezone.now()
+
+    def _manifest(self, days_ago, incremental=False):
+        taken_at = self.now - timedelta(days=days_ago)
+        return BackupManifest.objects.create(
+            user=self.user,
+            taken_at=taken_at,
+            since=taken_at - timedelta(days=1) if incremental else None,
+        )
+
+    def _tombstone(self, user, age):
+        tombstone = DeletedRecord.objects.create(
+            user=user, entity="transactions", object_id=1
+        )
+        DeletedRecord.objects.filter(pk=tombstone.pk).update(deleted_at=self.now - age)
+        return tombstone.pk
+
+    def test_prunes_history_before_oldest_retained_full_backup(self):
+        """Test history older than the retained full backups is deleted"""
+        for days_ago in (30, 20, 10):
+            self._manifest(days_ago)
+        self._manifest(25, incremental=True)
+        kept_manifests = {self._manifest(5, incremental=True).pk}
+        kept_manifests |= {
+            manifest.pk
+            for manifest in BackupManifest.objects.filter(
+                taken_at__gte=self.now - timedelta(days=20)
+            )
+        }
+        self._tombstone(self.user, timedelta(days=21))
+        kept_tombstones = {
+            # Within the incremental overlap of the oldest retained backup
+            self._tombstone(self.user, timedelta(days=20, minutes=2)),
+            self._tombstone(self.user, timedelta(days=1)),
+            # Users without a full backup keep what the snapshots may need
+            self._tombstone(self.other, timedelta(days=1)),
+        }
+        self._tombstone(self.other, timedelta(days=3))
+
+        counts = prune_backup_history(2, self.now - timedelta(days=2))
+
+        self.assertEqual(counts, (2, 2))
+        self.assertEqual(
+            set(BackupManifest.objects.values_list("pk", flat=True)), kept_manifests
+        )
+        self.assertEqual(
+            set(DeletedRecord.objects.values_list("pk", flat=True)), kept_tombstones
+        )
+
+    def test_oldest_snapshot_bounds_pruning(self):
+        """Test history newer than the oldest stored snapshot is kept"""
+        self._manifest(10)
+        self._manifest(5)
+        kept = self._tombstone(self.user, timedelta(days=8))
+        self._tombstone(self.user, timedelta(days=12))
+
+        counts = prune_backup_history(1, self.now - timedelta(days=9))
+
+        self.assertEqual(counts, (1, 1))
+        self.assertEqual(BackupManifest.objects.count(), 1)
+        self.assertEqual(
+            list(DeletedRecord.objects.values_list("pk", flat=True)), [kept]
+        )
+
+    def test_keep_full_must_be_positive(self):
+        """Test pruning refuses to keep no full backups"""
+        self._manifest(5)
+
+        with self.assertRaises(ValueError):
+            prune_backup_history(0, self.now)
+
+        self.assertEqual(BackupManifest.objects.count(), 1)
+
+
+class BackupSnapshotsCommandTest(APITestCase):
+    def setUp(self):
+        """Set up test data and a temporary snapshot storage"""
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        storages = override_settings(
+            STORAGES={
+                "backups": {
+                    "BACKEND": "django.core.files.storage.FileSystemStorage",
+                    "OPTIONS": {"location": tmp.name},
+                },
+            }
+        )
+        storages.enable()
+        self.addCleanup(storages.disable)
+
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        for i in range(3):
+            Transaction.objects.create(
+                amount=Decimal("-10.00"),
+                description=f"Row {i}",
+                date=date(2025, 1, 1),
+                category=category,
+                account=account,
+                user=self.user,
+            )
+
+    def _call(self, *args):
+        out = io.StringIO()
+        call_command("backup_snapshots", *args, stdout=out)
+        return out.getvalue()
+
+    def test_snapshot_restores(self):
+        """Test a per-user snapshot is stored, verified and restorable"""
+        self._call("--user", "testuser")
+
+        scope = f"users/{self.user.pk}"
+        (name,) = list_snapshots(scope)
+        self.assertTrue(name.endswith(".columnar.gz"))
+        self.assertIn("OK", self._call("--verify"))
+
+        Transaction.objects.filter(user=self.user).delete()
+        with get_backup_storage().open(name) as snapshot:
+            upload = SimpleUploadedFile(name.rsplit("/", 1)[-1], snapshot.read())
+        response = self.client.post(
+            reverse("restore_database"),
+            {"file": upload},
+            format="multipart",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_system_snapshot_and_verify_failure(self):
+        """Test a system snapshot is written and tampering fails verification"""
+        self._call("--backup-format", "json")
+
+        (name,) = list_snapshots("system")
+        storage = get_backup_storage()
+        storage.delete(name)
+        storage.save(name, ContentFile(b"tampered"))
+
+        with self.assertRaises(CommandError):
+            self._call("--verify")
+
+    def test_snapshot_prunes_backup_history(self):
+        """Test taking snapshots prunes history older than all of them"""
+        DeletedRecord.objects.create(user=self.user, entity="transactions", object_id=1)
+        DeletedRecord.objects.update(deleted_at=timezone.now() - timedelta(days=1))
+
+        output = self._call()
+
+        self.assertIn("0 backup manifest(s) and 1 tombstone(s) pruned", output)
+        self.assertFalse(DeletedRecord.objects.exists())
+
+    def test_keep_full_must_be_positive(self):
+        """Test --keep-full below 1 fails before any snapshot is written"""
+        with self.assertRaises(CommandError):
+            self._call("--keep-full", "0")
+
+        self.assertEqual(list_snapshots("system"), [])
+
+    def test_unknown_user(self):
+        """Test snapshotting an unknown user fails"""
+        with self.assertRaises(CommandError):
+            self._call("--user", "nobody")
@@ -0,0 +1,220 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from budget.models import BankAccount, Category, Transaction
+from core.models import DeletedRecord
+
+
+class BulkEndpointTest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        # Bulk requests are throttled through the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Food", user=self.user)
+        self.account = BankAccount.objects.create(name="Checking", user=self.user)
+        self.url = reverse("transaction-bulk")
+
+    def _transactions(self, count):
+        return Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                category=self.category,
+                account=self.account,
+                amount=Decimal("-10.00"),
+                description=f"Row {index}",
+                date=date(2026, 1, 1),
+            )
+            for index in range(count)
+        )
+
+    def test_bulk_create(self):
+        """Test POST creates every transaction in a constant number of queries"""
+        items = [
+            {
+                "date": "2026-01-02",
+                "amount": f"-{index}.50",
+                "description": f"Lunch {index}",
+                "category": self.category.id,
+                "account": self.account.id,
+            }
+            for index in range(50)
+        ]
+
+        # Savepoint, one lookup per related model, INSERT, re-read, release
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(len(response.data), 50)
+        self.assertEqual(response.data[3]["description"], "Lunch 3")
+        self.assertEqual(response.data[3]["category_name"], "Food")
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 50)
+
+    def test_bulk_create_without_returned_rows(self):
+        """Test created objects get their ids where inserts return no rows"""
+        items = [
+            {
+                "date": "2026-01-02",
+                "amount": "-1.00",
+                "description": f"Lunch {index}",
+                "category": self.category.id,
+                "account": self.account.id,
+            }
+            for index in range(3)
+        ]
+
+        # A property on some backends, so it is patched on the class
+        with mock.patch.object(
+            type(connection.features), "can_return_rows_from_bulk_insert", False
+        ):
+            response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [(row["id"], row["description"]) for row in response.data],
+            list(Transaction.objects.order_by("pk").values_list("pk", "description")),
+        )
+        self.assertEqual(response.data[0]["category_name"], "Food")
+
+    def test_bulk_create_reports_errors_by_index(self):
+        """Test one invalid item rejects the whole batch"""
+        items = [
+            {
+                "date": "2026-01-02",
+                "amount": "1.00",
+                "description": "Ok",
+                "category": self.category.id,
+                "account": self.account.id,
+            },
+            {
+                "date": "someday",
+                "amount": "1.00",
+                "description": "Bad",
+                "category": self.category.id,
+                "account": self.account.id,
+            },
+        ]
+
+        response = self.client.post(self.url, items, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("date", response.data["errors"][1])
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_bulk_update(self):
+        """Test PATCH updates each transaction by id in one statement"""
+        first, second = self._transactions(2)
+        before = second.updated_at
+
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": first.id, "description": "Groceries"},
+                {"id": second.id, "amount": "-99.00"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row["id"] for row in response.data], [first.id, second.id])
+        first.refresh_from_db()
+        second.refresh_from_db()
+        self.assertEqual(first.description, "Groceries")
+        self.assertEqual(first.amount, Decimal("-10.00"))
+        self.assertEqual(second.amount, Decimal("-99.00"))
+        self.assertGreater(second.updated_at, before)
+
+    def test_bulk_update_other_users_object(self):
+        """Test ids outside the user's queryset are reported as not found"""
+        (mine,) = self._transactions(1)
+        other = User.objects.create_user(username="other", password="testpass123")
+        theirs = Transaction.objects.create(
+            user=other,
+            category=Category.objects.create(name="Food", user=other),
+            account=BankAccount.objects.create(name="Checking", user=other),
+            amount=Decimal("5.00"),
+            description="Theirs",
+            date=date(2026, 1, 1),
+        )
+
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": mine.id, "description": "Changed"},
+                {"id": theirs.id, "description": "Changed"},
+                {"description": "No id"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertEqual(response.data["errors"][1], {"id": ["Not found."]})
+        self.assertEqual(response.data["errors"][2], {"id": ["Not found."]})
+        mine.refresh_from_db()
+        self.assertEqual(mine.description, "Row 0")
+
+        response = self.client.patch(
+            self.url, [{"id": mine.id}, {"id": mine.id}], format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_delete(self):
+        """Test DELETE removes the ids and leaves tombstones"""
+        rows = self._transactions(3)
+
+        response = self.client.delete(
+            self.url, {"ids": [rows[0].id, rows[2].id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"deleted": 2})
+        self.assertEqual(
+            list(Transaction.objects.values_list("id", flat=True)), [rows[1].id]
+        )
+        self.assertEqual(DeletedRecord.objects.filter(user=self.user).count(), 2)
+
+        response = self.client.delete(
+            self.url, {"ids": [rows[1].id, rows[0].id, "x"]}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("id", response.data["errors"][2])
+        self.assertTrue(Transaction.objects.filter(id=rows[1].id).exists())
+
+    def test_bulk_conflict(self):
+        """Test unique conflicts are reported without writing anything"""
+        response = self.client.post(
+            reverse("category-bulk"),
+            [{"name": "Travel"}, {"name": "Food"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("error", response.data)
+        self.assertFalse(Category.objects.filter(name="Travel").exists())
+
+    def test_bulk_rejects_non_lists_and_large_batches(self):
+        """Test the request shape and size are checked"""
+        for data in ({"date": "2026-01-02"}, []):
+            response = self.client.post(self.url, data, format="json")
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        response = self.client.post(self.url, [{}] * 1001, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("1000", response.data["error"])
@@ -0,0 +1,133 @@
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+
+from budget.models import BankAccount, Category, Transaction
+from budget.periods import (
+    DateRange,
+    current_period_range,
+    fiscal_year_range,
+    iso_week_range,
+    month_range,
+    month_range_from_param,
+    quarter_range,
+    resolve_period,
+)
+
+
+class PeriodResolutionTest(SimpleTestCase):
+    def test_month_range_is_half_open(self):
+        """Calendar months end on the first day of the next month"""
+        self.assertEqual(
+            month_range(2024, 2), DateRange(date(2024, 2, 1), date(2024, 3, 1))
+        )
+        self.assertEqual(
+            month_range(2024, 12), DateRange(date(2024, 12, 1), date(2025, 1, 1))
+        )
+        self.assertEqual(month_range(2024, 2).last_day, date(2024, 2, 29))
+
+    def test_calendar_quarter(self):
+        self.assertEqual(
+            quarter_range(2025, 4, start_month=1),
+            DateRange(date(2025, 10, 1), date(2026, 1, 1)),
+        )
+
+    def test_fiscal_year_offset(self):
+        """A fiscal year starting in October spans two calendar years"""
+        self.assertEqual(
+            fiscal_year_range(2025, start_month=10),
+            DateRange(date(2025, 10, 1), date(2026, 10, 1)),
+        )
+        self.assertEqual(
+            quarter_range(2025, 2, start_month=10),
+            DateRange(date(2026, 1, 1), date(2026, 4, 1)),
+        )
+
+    def test_current_quarter_with_fiscal_offset(self):
+        """February belongs to Q2 of the fiscal year that began the previous April"""
+        self.assertEqual(
+            current_period_range("quarter", date(2026, 2, 14), start_month=4),
+            DateRange(date(2026, 1, 1), date(2026, 4, 1)),
+        )
+        self.assertEqual(
+            current_period_range("year", date(2026, 2, 14), start_month=4),
+            DateRange(date(2025, 4, 1), date(2026, 4, 1)),
+        )
+
+    def test_iso_week_crossing_year_boundary(self):
+        """ISO week 1 of 2026 starts on Monday 2025-12-29"""
+        self.assertEqual(
+            iso_week_range(2026, 1), DateRange(date(2025, 12, 29), date(2026, 1, 5))
+        )
+        week = current_period_range("week", date(2026, 1, 1))
+        self.assertEqual(week, iso_week_range(2026, 1))
+
+    def test_resolve_explicit_formats(self):
+        self.assertEqual(resolve_period("2026-03"), month_range(2026, 3))
+        self.assertEqual(
+            resolve_period("2026-Q3", start_month=1), quarter_range(2026, 3, 1)
+        )
+        self.assertEqual(resolve_period("2026-W10"), iso_week_range(2026, 10))
+        self.assertEqual(
+            resolve_period("2026", start_month=1), fiscal_year_range(2026, 1)
+        )
+
+    def test_resolve_invalid_raises(self):
+        for period in ("invalid", "2026-13", "2026-Q5", "2026-W60", ""):
+            with self.subTest(period=period):
+                with self.assertRaises(ValueError):
+                    resolve_period(period)
+
+    def test_month_param_falls_back_to_current_month(self):
+        today = date(2026, 5, 20)
+        self.assertEqual(month_range_from_param("", today), month_range(2026, 5))
+        self.assertEqual(month_range_from_param("2026-99", today), month_range(2026, 5))
+        self.assertEqual(
+            month_range_from_param("2025-11", today), month_range(2025, 11)
+        )
+
+
+class PeriodIndexUsageTest(TestCase):
+    """EXPLAIN-based check that half-open ranges hit the (user, date) index."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        category = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        start = date(2024, 1, 1)
+        Transaction.objects.bulk_create(
+            Transaction(
+                user=self.user,
+                account=account,
+                category=category,
+                date=start + timedelta(days=i % 730),
+                amount=-1,
+                description=f"Row {i}",
+            )
+            for i in range(500)
+        )
+
+    def _user_date_index_names(self):
+        return {
+            index.name
+            for index in Transaction._meta.indexes
+            if [f.lstrip("-") for f in index.fields[:2]] == ["user", "date"]
+        }
+
+    def test_month_range_uses_composite_index(self):
+        queryset = Transaction.objects.filter(
+            user=self.user, **month_range(2024, 6).as_filter()
+        ).values("id")
+        if connection.vendor == "postgresql":
+            # Small test tables would otherwise be sequentially scanned.
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+        plan = queryset.explain()
+        self.assertTrue(
+            any(name in plan for name in self._user_date_index_names()),
+            f"Expected a (user, date) index in plan:\n{plan}",
+        )
@@ -0,0 +1,111 @@
+import json
+from datetime import UTC, date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.test import SimpleTestCase
+from django.urls import reverse
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from budget.models import BankAccount, Category, Transaction
+from core import renderers
+from core.renderers import FastJSONRenderer, json_dumps
+
+
+class JSONDumpsTest(SimpleTestCase):
+    payload = {
+        "amount": Decimal("12.50"),
+        "day": date(2026, 3, 1),
+        "at": datetime(2026, 3, 1, 8, 30, tzinfo=UTC),
+        "name": "Café",
+    }
+
+    def _check(self):
+        self.assertEqual(
+            json.loads(json_dumps(self.payload)),
+            {
+                "amount": 12.5,
+                "day": "2026-03-01",
+                "at": "2026-03-01T08:30:00Z",
+                "name": "Café",
+            },
+        )
+        decoded = json.loads(json_dumps(self.payload, decimals_as_strings=True))
+        self.assertEqual(decoded["amount"], "12.50")
+        self.assertIn(b'\n  "amount"', json_dumps(self.payload, indent=True))
+
+    def test_encodes_native_types(self):
+        """Test Decimal, date and datetime encoding with the active backend"""
+        self._check()
+
+    def test_stdlib_fallback_matches(self):
+        """Test the stdlib fallback produces the same values without orjson"""
+        with mock.patch.object(renderers, "orjson", None):
+            self._check()
+
+    def test_backends_agree_on_precision(self):
+        """Test microseconds and other DRF encodings are the same either way"""
+        payload = {
+            "utc": datetime(2026, 3, 1, 8, 30, 0, 123456, tzinfo=UTC),
+            "local": datetime(
+                2026, 3, 1, 8, 30, 0, 500, tzinfo=timezone(timedelta(hours=2))
+            ),
+            "time": time(8, 30, 0, 123456),
+            "duration": timedelta(minutes=1, microseconds=5),
+            "raw": b"abc",
+        }
+        expected = (
+            b'{"utc":"2026-03-01T08:30:00.123456Z",'
+            b'"local":"2026-03-01T08:30:00.000500+02:00",'
+            b'"time":"08:30:00.123456","duration":"60.000005","raw":"abc"}'
+        )
+
+        self.assertEqual(json_dumps(payload), expected)
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(json_dumps(payload), expected)
+
+    def test_renderer_escapes_line_separators(self):
+        """Test U+2028/U+2029 are escaped like DRF's JSONRenderer"""
+        rendered = FastJSONRenderer().render({"text": "a b c"})
+        self.assertEqual(rendered, b'{"text":"a\\u2028b\\u2029c"}')
+
+
+class ReportRenderingTest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(
+            name="Food", user=self.user, monthly_budget=Decimal("200.00")
+        )
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        Transaction.objects.create(
+            user=self.user,
+            account=account,
+            category=category,
+            date=date(2026, 3, 10),
+            amount=Decimal("-50.25"),
+            description="Groceries",
+        )
+
+    def test_spending_summary_renders_decimals_as_numbers(self):
+        """Test report Decimals are encoded as JSON numbers by the renderer"""
+        url = reverse("spending_summary")
+        response = self.client.get(url, {"month": "2026-03"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        food = response.json()["categories"][0]
+        self.assertEqual(food["total_spent"], 50.25)
+        self.assertEqual(food["budget_limit"], 200.0)
+        self.assertAlmostEqual(food["percentage_used"], 25.125)
+
+    def test_balance_stays_a_string(self):
+        """Test balance_by_period keeps its two-decimal string contract"""
+        url = reverse("balance_by_period", kwargs={"period": "2026-03"})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {"balance_2026-03": "-50.25"})
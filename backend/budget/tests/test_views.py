@@ -1,12 +1,42 @@
+import base64
+import gzip
+import io
+import json
+import threading
 from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+from urllib.parse import parse_qs, urlsplit
 
 from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, connections
+from django.test import SimpleTestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 
 from rest_framework import status
 from rest_framework.test import APITestCase
 
-from budget.models import BankAccount, Category, Transaction
+from budget.models import (
+    BankAccount,
+    Category,
+    ReclassificationRule,
+    Transaction,
+)
+from budget.views import MAX_INCOME_EXPENSE_YEARS
+from core import snapshot
+from core.backup import (
+    NDJSONBackupReader,
+    iter_backup_sections,
+    merge_backup_chain,
+    restore_all,
+    stream_backup_columnar,
+)
+from core.models import DeletedRecord
+from core.snapshot import consistent_sections, parallel_sections
+from core.streaming import ZSTD_AVAILABLE
+from wealth.models import Investment
 
 
 class CategoryAPITest(APITestCase):
@@ -621,3 +651,1081 @@ class CategorySpendingByPeriodAPITest(APITestCase):
         food = next(c for c in response.json()["categories"] if c["name"] == "Food")
         self.assertGreater(food["spending"], 0, "spending must be positive")
         self.assertAlmostEqual(food["spending"], 100.0)
+
+
+class MonthlyIncomeExpensesAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(name="Food", user=self.user)
+        self.salary = Category.objects.create(
+            name="Salary", user=self.user, classification=Category.INCOME
+        )
+        self.checking = BankAccount.objects.create(
+            user=self.user, name="Checking", account_type="checking"
+        )
+        self.card = BankAccount.objects.create(
+            user=self.user, name="Card", account_type="credit_card"
+        )
+        for amount, tx_date, category, account in [
+            (1000, date(2024, 1, 10), self.salary, self.checking),
+            (-200, date(2024, 1, 15), self.food, self.card),
+            (1200, date(2025, 1, 10), self.salary, self.checking),
+            (-300, date(2025, 1, 20), self.food, self.card),
+            (-50, date(2025, 1, 21), self.food, self.checking),
+        ]:
+            Transaction.objects.create(
+                amount=amount,
+                description="Entry",
+                date=tx_date,
+                category=category,
+                account=account,
+                user=self.user,
+            )
+        self.url = reverse("monthly_income_expenses")
+
+    def test_single_year_returns_twelve_months(self):
+        """Test that ?year= keeps returning a zero-filled 12-month array"""
+        response = self.client.get(self.url, {"year": 2025})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data), 12)
+        january = data[0]
+        self.assertEqual(january["month"], "2025-01")
+        self.assertAlmostEqual(january["income"], 1200.0)
+        self.assertAlmostEqual(january["expenses"], 350.0)
+        self.assertAlmostEqual(january["net"], 850.0)
+        self.assertAlmostEqual(data[1]["income"], 0.0)
+
+    def test_multi_year_range_with_cumulative_net(self):
+        """Test that a year range spans every month and accumulates net"""
+        response = self.client.get(self.url, {"start_year": 2024, "end_year": 2025})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data), 24)
+        self.assertEqual(data[0]["month"], "2024-01")
+        self.assertEqual(data[-1]["month"], "2025-12")
+        self.assertAlmostEqual(data[0]["cumulative_net"], 800.0)
+        self.assertAlmostEqual(data[-1]["cumulative_net"], 1650.0)
+
+    def test_start_year_alone_is_capped_to_the_span(self):
+        """Test an old start_year without end_year returns the longest span"""
+        response = self.client.get(self.url, {"start_year": 2000})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(len(data), 12 * MAX_INCOME_EXPENSE_YEARS)
+        self.assertEqual(data[-1]["month"], "2009-12")
+
+    def test_year_over_year_comparison(self):
+        """Test that compare=yoy adds previous-year columns for each month"""
+        response = self.client.get(self.url, {"year": 2025, "compare": "yoy"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        january = response.json()[0]
+        self.assertAlmostEqual(january["previous_year"]["net"], 800.0)
+        self.assertAlmostEqual(january["net_change"], 50.0)
+        # The comparison year must not leak into the cumulative total
+        self.assertAlmostEqual(january["cumulative_net"], 850.0)
+
+    def test_account_and_category_breakdowns(self):
+        """Test that breakdowns split each month's totals by account and category"""
+        response = self.client.get(
+            self.url, {"year": 2025, "breakdown": "account,category"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        january = response.json()[0]
+        accounts = {a["name"]: a for a in january["accounts"]}
+        self.assertAlmostEqual(accounts["Checking"]["net"], 1150.0)
+        self.assertAlmostEqual(accounts["Card"]["expenses"], 300.0)
+        categories = {c["name"]: c for c in january["categories"]}
+        self.assertAlmostEqual(categories["Food"]["expenses"], 350.0)
+        self.assertAlmostEqual(categories["Salary"]["income"], 1200.0)
+        self.assertEqual(response.json()[1]["accounts"], [])
+
+    def test_invalid_parameters_return_400(self):
+        for params in (
+            {"year": "abc"},
+            {"year": 1800},
+            {"start_year": 2025, "end_year": 2024},
+            {"start_year": 2000, "end_year": 2020},
+            {"breakdown": "merchant"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BudgetRolloverAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(
+            name="Food",
+            user=self.user,
+            classification=Category.SPEND,
+            monthly_budget=300.00,
+        )
+        Category.objects.create(
+            name="Salary", user=self.user, classification=Category.INCOME
+        )
+        self.account = BankAccount.objects.create(
+            user=self.user, name="Checking", account_type="checking"
+        )
+        for amount, tx_date in [
+            (-200, date(2025, 1, 5)),
+            (-450, date(2025, 2, 10)),
+            (-100, date(2025, 3, 3)),
+        ]:
+            Transaction.objects.create(
+                amount=amount,
+                description="Groceries",
+                date=tx_date,
+                category=self.food,
+                account=self.account,
+                user=self.user,
+            )
+        self.url = reverse("budget_rollover")
+
+    def test_surplus_and_deficit_carry_forward(self):
+        """Test that each month's remaining budget rolls into the next month"""
+        response = self.client.get(self.url, {"start": "2025-01", "end": "2025-03"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data["start_month"], "2025-01")
+        self.assertEqual(data["end_month"], "2025-03")
+        self.assertEqual([c["name"] for c in data["categories"]], ["Food"])
+        food = data["categories"][0]
+        january, february, march = food["months"]
+        self.assertAlmostEqual(january["remaining"], 100.0)
+        self.assertAlmostEqual(february["carried_in"], 100.0)
+        self.assertAlmostEqual(february["available"], 400.0)
+        self.assertAlmostEqual(february["remaining"], -50.0)
+        self.assertAlmostEqual(march["available"], 250.0)
+        self.assertAlmostEqual(food["carryover"], 150.0)
+        self.assertAlmostEqual(food["total_spent"], 750.0)
+        self.assertAlmostEqual(food["total_budget"], 900.0)
+
+    def test_pacing_and_projection_mid_month(self):
+        """Test pace and month-end projection against the elapsed share of a month"""
+        from budget.budgeting import compute_budget_rollover
+        from budget.periods import month_range
+
+        result = compute_budget_rollover(
+            self.user, month_range(2025, 2), today=date(2025, 2, 14)
+        )
+        february = result[0]["months"][0]
+        self.assertAlmostEqual(february["elapsed_percentage"], 50.0)
+        self.assertAlmostEqual(february["expected_spent"], 150.0)
+        self.assertAlmostEqual(february["pace_percentage"], 300.0)
+        self.assertAlmostEqual(february["projected_spent"], 900.0)
+        self.assertAlmostEqual(february["projected_remaining"], -600.0)
+
+    def test_defaults_to_current_year(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        year = date.today().year
+        self.assertEqual(data["start_month"], f"{year}-01")
+        self.assertEqual(len(data["categories"][0]["months"]), 12)
+
+    def test_invalid_range_returns_400(self):
+        for params in (
+            {"start": "2025-13"},
+            {"start": "2025-03", "end": "2025-01"},
+            {"start": "2015-01", "end": "2025-12"},
+        ):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class TransactionCursorPaginationAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(
+            user=self.user, name="Checking", account_type="checking"
+        )
+        # Several rows share a date so the id tie-breaker is exercised
+        for i in range(7):
+            Transaction.objects.create(
+                amount=-1,
+                description=f"Row {i}",
+                date=date(2025, 1, 1) + timedelta(days=i // 3),
+                category=category,
+                account=account,
+                user=self.user,
+            )
+        self.expected_ids = list(
+            Transaction.objects.filter(user=self.user)
+            .order_by("-date", "-id")
+            .values_list("id", flat=True)
+        )
+        self.url = reverse("transaction-list")
+
+    def test_forward_pages_cover_all_rows_without_count(self):
+        """Test that following next links walks every row once in (-date, -id) order"""
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn("count", response.data)
+        self.assertIsNone(response.data["previous"])
+
+        seen = []
+        while True:
+            seen += [row["id"] for row in response.data["results"]]
+            if not response.data["next"]:
+                break
+            response = self.client.get(response.data["next"])
+        self.assertEqual(seen, self.expected_ids)
+
+    def test_previous_link_returns_prior_page(self):
+        """Test that the previous link of page two yields page one again"""
+        first = self.client.get(self.url, {"pagination": "cursor", "page_size": 3})
+        second = self.client.get(first.data["next"])
+        back = self.client.get(second.data["previous"])
+        self.assertEqual(
+            [row["id"] for row in back.data["results"]],
+            [row["id"] for row in first.data["results"]],
+        )
+        self.assertIsNone(back.data["previous"])
+
+    def test_links_stay_in_cursor_mode(self):
+        """Test the link out of an empty reverse page keeps cursor mode"""
+        newest = Transaction.objects.get(pk=self.expected_ids[0])
+        cursor = base64.urlsafe_b64encode(
+            f"p:{newest.date.isoformat()}:{newest.id}".encode()
+        ).decode()
+
+        response = self.client.get(self.url, {"cursor": cursor, "page_size": 3})
+
+        self.assertEqual(response.data["results"], [])
+        query = parse_qs(urlsplit(response.data["next"]).query)
+        self.assertEqual(query, {"page_size": ["3"], "pagination": ["cursor"]})
+        response = self.client.get(response.data["next"])
+        self.assertNotIn("count", response.data)
+        self.assertEqual(
+            [row["id"] for row in response.data["results"]], self.expected_ids[:3]
+        )
+
+    def test_ordering_rejected_in_cursor_mode(self):
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "ordering": "amount"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("ordering", response.data)
+
+    def test_invalid_cursor_returns_404(self):
+        response = self.client.get(self.url, {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_page_number_pagination_remains_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 7)
+
+
+class TransactionSearchAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name="Food", user=self.user)
+        self.checking = BankAccount.objects.create(
+            user=self.user, name="Checking", account_type="checking"
+        )
+        self.card = BankAccount.objects.create(
+            user=self.user, name="Card", account_type="credit_card"
+        )
+        for description, account in [
+            ("Starbucks Coffee Seattle", self.checking),
+            ("Coffee Bean coffee refill", self.card),
+            ("Home Depot", self.checking),
+        ]:
+            Transaction.objects.create(
+                amount=-5,
+                description=description,
+                date=date(2025, 1, 1),
+                category=category,
+                account=account,
+                user=self.user,
+            )
+        self.url = reverse("transaction-list")
+
+    def _descriptions(self, response):
+        return [row["description"] for row in response.data["results"]]
+
+    def test_search_matches_description_terms(self):
+        response = self.client.get(self.url, {"search": "coffee"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertCountEqual(
+            self._descriptions(response),
+            ["Starbucks Coffee Seattle", "Coffee Bean coffee refill"],
+        )
+
+    def test_search_combines_with_account_filter(self):
+        response = self.client.get(
+            self.url, {"search": "coffee", "account": self.card.id}
+        )
+        self.assertEqual(self._descriptions(response), ["Coffee Bean coffee refill"])
+
+    def test_search_requires_every_term(self):
+        response = self.client.get(self.url, {"search": "coffee seattle"})
+        self.assertEqual(self._descriptions(response), ["Starbucks Coffee Seattle"])
+
+    @skipUnless(connection.vendor == "postgresql", "PostgreSQL full-text search")
+    def test_results_ranked_and_use_gin_index(self):
+        """Test that relevance ordering applies and the GIN index backs the match"""
+        from budget.search import SEARCH_INDEX_NAME, TransactionSearchFilter
+
+        response = self.client.get(self.url, {"search": "coffee"})
+        self.assertEqual(self._descriptions(response)[0], "Coffee Bean coffee refill")
+
+        queryset = TransactionSearchFilter._filter_postgresql(
+            Transaction.objects.filter(user=self.user), ["coffee"]
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+        self.assertIn(SEARCH_INDEX_NAME, queryset.explain())
+
+
+class TransactionListFastPathAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(
+            user=self.user, name="Checking", account_type="checking"
+        )
+        for i in range(3):
+            Transaction.objects.create(
+                amount=-10.5 * (i + 1),
+                description=f"Row {i}",
+                date=date(2025, 1, 1) + timedelta(days=i),
+                category=category,
+                account=account,
+                user=self.user,
+                reference_id=f"ref-{i}",
+            )
+        self.url = reverse("transaction-list")
+
+    def test_matches_model_serializer_output(self):
+        """Test that the values() fast path renders exactly like TransactionSerializer"""
+        from budget.serializers import TransactionSerializer
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        expected = TransactionSerializer(
+            Transaction.objects.filter(user=self.user)
+            .select_related("category", "account")
+            .order_by("-date"),
+            many=True,
+        ).data
+        self.assertEqual(response.json()["results"], [dict(row) for row in expected])
+
+    def test_sparse_fieldset(self):
+        response = self.client.get(self.url, {"fields": "id,amount,category_name"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        row = response.json()["results"][0]
+        self.assertEqual(set(row), {"id", "amount", "category_name"})
+        self.assertEqual(row["amount"], "-31.50")
+        self.assertEqual(row["category_name"], "Food")
+
+    def test_unknown_field_returns_400(self):
+        response = self.client.get(self.url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.json())
+
+
+class TransactionExportAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.food = Category.objects.create(name="Food", user=self.user)
+        rent = Category.objects.create(name="Rent", user=self.user)
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        for i in range(5):
+            Transaction.objects.create(
+                amount=-10 * (i + 1),
+                description=f"Row, {i}",
+                date=date(2025, 1, 1) + timedelta(days=i),
+                category=self.food if i % 2 == 0 else rent,
+                account=account,
+                user=self.user,
+            )
+        self.url = reverse("transaction-export")
+
+    def _content(self, response):
+        self.assertTrue(response.streaming)
+        return b"".join(response.streaming_content).decode()
+
+    def test_csv_export(self):
+        """Test CSV export streams a header and every row"""
+        response = self.client.get(self.url, {"fields": "date,amount,description"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "text/csv; charset=utf-8")
+        self.assertIn("attachment;", response["Content-Disposition"])
+        lines = self._content(response).splitlines()
+        self.assertEqual(lines[0], "date,amount,description")
+        self.assertEqual(lines[1], '2025-01-05,-50.00,"Row, 4"')
+        self.assertEqual(len(lines), 6)
+
+    def test_csv_export_neutralises_formulas(self):
+        """Test text cells starting with a formula character are prefixed"""
+        self.food.name = "@SUM(A1:A9)"
+        self.food.save()
+        Transaction.objects.filter(user=self.user).update(
+            description='=HYPERLINK("http://example.com")'
+        )
+        response = self.client.get(
+            self.url, {"fields": "amount,description,category_name"}
+        )
+        lines = self._content(response).splitlines()
+        self.assertEqual(
+            lines[1],
+            '-50.00,"\'=HYPERLINK(""http://example.com"")",\'@SUM(A1:A9)',
+        )
+
+    def test_ndjson_export_honours_filters(self):
+        """Test NDJSON export applies TransactionFilter fields"""
+        response = self.client.get(
+            self.url,
+            {
+                "export_format": "ndjson",
+                "category": self.food.id,
+                "date__gte": "2025-01-02",
+            },
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        rows = [json.loads(line) for line in self._content(response).splitlines()]
+        self.assertEqual([row["date"] for row in rows], ["2025-01-05", "2025-01-03"])
+        self.assertEqual(rows[0]["category_name"], "Food")
+
+    def test_export_is_scoped_to_user(self):
+        """Test other users' transactions are not exported"""
+        other = User.objects.create_user(username="other", password="testpass123")
+        self.client.force_authenticate(user=other)
+        response = self.client.get(self.url)
+        self.assertEqual(self._content(response).splitlines()[1:], [])
+
+    def test_invalid_format_returns_400(self):
+        response = self.client.get(self.url, {"export_format": "xml"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_unknown_field_returns_400(self):
+        response = self.client.get(self.url, {"fields": "id,password"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class BackupStreamingAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        category = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        for i in range(3):
+            Transaction.objects.create(
+                amount=Decimal("-10.25") * (i + 1),
+                description=f"Row {i}",
+                date=date(2025, 1, 1) + timedelta(days=i),
+                category=category,
+                account=account,
+                user=self.user,
+            )
+        self.url = reverse("backup_database")
+
+    def _download(self, params=None):
+        params = {"models": "categories,bank_accounts,transactions", **(params or {})}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content)
+
+    def test_backup_is_streamed_json(self):
+        """Test the streamed backup is a complete JSON document"""
+        response, content = self._download()
+        self.assertEqual(response["Content-Type"], "application/json")
+        data = json.loads(content)
+        self.assertEqual(data["version"], "1.0")
+        self.assertEqual(len(data["transactions"]), 3)
+        self.assertEqual(data["categories"][0]["name"], "Food")
+        # Decimals keep full precision as strings
+        self.assertIn("-30.75", {row["amount"] for row in data["transactions"]})
+
+    def test_full_backup_includes_wealth_data(self):
+        """Test the wealth entities can be selected for a backup"""
+        Investment.objects.create(
+            user=self.user,
+            symbol="AAPL",
+            name="Apple",
+            quantity=Decimal("10"),
+            purchase_price=Decimal("150.00"),
+            purchase_date=date(2025, 1, 1),
+        )
+
+        _, content = self._download(
+            {"models": "investments,heritages,retirement_accounts"}
+        )
+
+        data = json.loads(content)
+        self.assertEqual([row["symbol"] for row in data["investments"]], ["AAPL"])
+        self.assertEqual(data["heritages"], [])
+        self.assertEqual(data["retirement_accounts"], [])
+
+    def test_gzip_backup_round_trip(self):
+        """Test a gzip backup can be restored as-is"""
+        response, content = self._download({"compress": "gzip"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('.json.gz"', response["Content-Disposition"])
+        self.assertEqual(len(json.loads(gzip.decompress(content))["transactions"]), 3)
+
+        upload = SimpleUploadedFile("backup.json.gz", content)
+        response = self.client.post(
+            reverse("restore_database"),
+            {"file": upload, "replace_existing": "true"},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["summary"]["transactions"], 3)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_invalid_compress_returns_400(self):
+        response = self.client.get(self.url, {"compress": "zip"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def _restore(self, name, content):
+        return self.client.post(
+            reverse("restore_database"),
+            {"file": SimpleUploadedFile(name, content), "replace_existing": "true"},
+            format="multipart",
+        )
+
+    def test_ndjson_backup_round_trip(self):
+        """Test an NDJSON backup has one record per line and restores"""
+        response, content = self._download({"backup_format": "ndjson"})
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        lines = [json.loads(line) for line in content.splitlines()]
+        self.assertEqual(lines[0]["version"], "1.0")
+        self.assertIn({"section": "transactions"}, lines)
+        # header + (marker + rows) for categories, bank_accounts, transactions
+        self.assertEqual(len(lines), 1 + 2 + 2 + 4)
+
+        response = self._restore("backup.ndjson", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["summary"]["transactions"], 3)
+
+    def test_gzip_ndjson_restore(self):
+        """Test .ndjson.gz uploads are decompressed and restored"""
+        _, content = self._download({"backup_format": "ndjson", "compress": "gzip"})
+        response = self._restore("backup.ndjson.gz", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_columnar_backup_round_trip(self):
+        """Test a columnar backup is gzip-compressed by default and restores"""
+        response, content = self._download({"backup_format": "columnar"})
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn('.columnar.gz"', response["Content-Disposition"])
+        lines = [json.loads(line) for line in gzip.decompress(content).splitlines()]
+        self.assertEqual(lines[0]["format"], "columnar")
+        marker = next(
+            line
+            for line in lines
+            if isinstance(line, dict) and line.get("section") == "transactions"
+        )
+        amounts = lines[lines.index(marker) + 1][marker["columns"].index("amount")]
+        self.assertEqual(sorted(amounts), ["-10.25", "-20.50", "-30.75"])
+
+        # Restore detects the layout from the content, not the file name
+        response = self._restore("backup.json.gz", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()["summary"]["transactions"], 3)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_decompression_bomb_rejected(self):
+        """Test a small .json.gz expanding past the cap is rejected early"""
+        limit = 1024 * 1024
+        content = gzip.compress(b'{"version": "1.0", "pad": "' + b"0" * 16 * limit)
+        self.assertLess(len(content), 64 * 1024)
+
+        class CountingFile(io.BytesIO):
+            written = 0
+
+            def write(self, data):
+                CountingFile.written += len(data)
+                return super().write(data)
+
+        with (
+            mock.patch("budget.views.BACKUP_MAX_JSON_SIZE", limit),
+            mock.patch("core.streaming.tempfile.TemporaryFile", CountingFile),
+        ):
+            response = self._restore("backup.json.gz", content)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("too large", response.json()["error"])
+        self.assertLessEqual(CountingFile.written, limit)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_upload_size_cap(self):
+        """Test restore uploads are capped by BACKUP_MAX_UPLOAD"""
+        _, content = self._download()
+
+        with self.settings(BACKUP_MAX_UPLOAD=len(content) - 1):
+            response = self._restore("backup.json", content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("Upload too large", response.json()["error"])
+
+    def test_streamed_backup_size_cap(self):
+        """Test NDJSON backups are capped by BACKUP_MAX_STREAMED_SIZE"""
+        _, content = self._download({"backup_format": "ndjson", "compress": "gzip"})
+        size = len(gzip.decompress(content))
+
+        with self.settings(BACKUP_MAX_STREAMED_SIZE=size - 1):
+            response = self._restore("backup.ndjson.gz", content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("too large", response.json()["error"])
+
+        with self.settings(BACKUP_MAX_STREAMED_SIZE=size):
+            response = self._restore("backup.ndjson.gz", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @skipUnless(ZSTD_AVAILABLE, "zstandard is not installed")
+    def test_zstd_columnar_round_trip(self):
+        """Test zstd-compressed backups download and restore"""
+        response, content = self._download(
+            {"backup_format": "columnar", "compress": "zstd"}
+        )
+        self.assertEqual(response["Content-Type"], "application/zstd")
+        response = self._restore("backup.columnar.zst", content)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+    def test_malformed_ndjson_returns_400(self):
+        """Test malformed NDJSON records are rejected without a partial restore"""
+        content = b'{"version": "1.0"}\n{"section": "transactions"}\n[1, 2]\n'
+        response = self._restore("backup.ndjson", content)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Transaction.objects.filter(user=self.user).count(), 3)
+
+
+class IncrementalBackupAPITest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.category = Category.objects.create(name="Food", user=self.user)
+        self.account = BankAccount.objects.create(user=self.user, name="Checking")
+        for i in range(3):
+            self._create(f"Row {i}", Decimal("-10.00"))
+        self.url = reverse("backup_database")
+        # Rows saved in this test are all newer than the overlap window allows
+        patcher = mock.patch("budget.views.INCREMENTAL_OVERLAP", timedelta(0))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _create(self, description, amount):
+        return Transaction.objects.create(
+            amount=amount,
+            description=description,
+            date=date(2025, 1, 1),
+            category=self.category,
+            account=self.account,
+            user=self.user,
+        )
+
+    def _download(self, **params):
+        params = {"models": "categories,bank_accounts,transactions", **params}
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, b"".join(response.streaming_content)
+
+    def test_incremental_backup_and_chain_restore(self):
+        """Test a diff holds only changes and restores on top of its base"""
+        response, base = self._download()
+        base_id = json.loads(base)["backup_id"]
+        self.assertEqual(response["X-Backup-Id"], str(base_id))
+
+        row = Transaction.objects.get(description="Row 0")
+        row.amount = Decimal("-99.00")
+        row.save()
+        Transaction.objects.get(description="Row 1").delete()
+        Transaction.objects.filter(description="Row 2").delete()
+        self._create("Row 3", Decimal("-5.00"))
+
+        response, diff = self._download(since=base_id, backup_format="ndjson")
+        self.assertIn("_incremental.ndjson", response["Content-Disposition"])
+        reader = NDJSONBackupReader(io.BytesIO(diff))
+        self.assertEqual(reader["parent_id"], base_id)
+        self.assertEqual(list(reader["categories"]), [])
+        self.assertEqual(
+            {t["description"] for t in reader["transactions"]}, {"Row 0", "Row 3"}
+        )
+        self.assertEqual({t["entity"] for t in reader["deleted"]}, {"transactions"})
+        self.assertEqual(len(list(reader["deleted"])), 2)
+
+        # Files may be uploaded in any order
+        response = self.client.post(
+            reverse("restore_database"),
+            {
+                "file": [
+                    SimpleUploadedFile("diff.ndjson", diff),
+                    SimpleUploadedFile("base.json", base),
+                ],
+                "replace_existing": "true",
+            },
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.content)
+        self.assertEqual(
+            dict(
+                Transaction.objects.filter(user=self.user).values_list(
+                    "description", "amount"
+                )
+            ),
+            {"Row 0": Decimal("-99.00"), "Row 3": Decimal("-5.00")},
+        )
+
+    def test_incremental_backup_alone_is_rejected(self):
+        """Test an incremental backup cannot be restored without its base"""
+        _, base = self._download()
+        _, diff = self._download(since=json.loads(base)["backup_id"])
+        response = self.client.post(
+            reverse("restore_database"),
+            {"file": SimpleUploadedFile("diff.json", diff)},
+            format="multipart",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("base", response.json()["error"])
+
+    def test_since_timestamp_and_invalid_values(self):
+        """Test since accepts ISO timestamps and rejects unknown ids"""
+        _, diff = self._download(since="2999-01-01T00:00:00Z")
+        self.assertEqual(json.loads(diff)["transactions"], [])
+        self.assertIsNone(json.loads(diff)["parent_id"])
+
+        for since in ("12345", "yesterday"):
+            response = self.client.get(self.url, {"since": since})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_deletes_record_tombstones(self):
+        """Test instance and queryset deletes both leave tombstones"""
+        row = Transaction.objects.get(description="Row 0")
+        row.delete()
+        Transaction.objects.filter(user=self.user).delete()
+        self.assertEqual(
+            DeletedRecord.objects.filter(user=self.user, entity="transactions").count(),
+            3,
+        )
+
+
+class MergeBackupChainTest(SimpleTestCase):
+    base = {
+        "version": "1.0",
+        "exported_at": "2026-01-01T00:00:00+00:00",
+        "since": None,
+        "transactions": [{"id": 1, "v": "a"}, {"id": 2, "v": "a"}],
+    }
+    diff = {
+        "version": "1.0",
+        "exported_at": "2026-01-02T00:00:00+00:00",
+        "since": "2026-01-01T00:00:00+00:00",
+        "transactions": [{"id": 1, "v": "b"}, {"id": 3, "v": "b"}],
+        "deleted": [{"entity": "transactions", "object_id": 2}],
+    }
+
+    def test_later_backups_win(self):
+        merged = merge_backup_chain([self.diff, self.base])
+        self.assertEqual(
+            list(merged["transactions"]), [{"id": 1, "v": "b"}, {"id": 3, "v": "b"}]
+        )
+        self.assertNotIn("deleted", merged)
+        self.assertIsNone(merged["since"])
+        self.assertEqual(merged["exported_at"], self.diff["exported_at"])
+
+    def test_gap_in_chain_raises(self):
+        gap = {**self.diff, "since": "2026-01-01T12:00:00+00:00"}
+        with self.assertRaisesMessage(ValueError, "gap"):
+            merge_backup_chain([self.base, gap])
+
+
+class NDJSONBackupReaderTest(SimpleTestCase):
+    content = (
+        b'{"version": "1.0", "multi_user": false}\n'
+        b'{"section": "categories"}\n'
+        b'{"id": 1, "name": "Food"}\n'
+        b'{"id": 2, "name": "Rent"}\n'
+        b'{"section": "transactions"}\n'
+        b'{"id": 3, "amount": "-1.00"}\n'
+        b"\n"
+        b'{"section": "reclassification_rules"}\n'
+    )
+
+    def test_sections_are_read_lazily_and_independently(self):
+        """Test sections can be iterated repeatedly and interleaved"""
+        reader = NDJSONBackupReader(io.BytesIO(self.content))
+        self.assertEqual(reader["version"], "1.0")
+        self.assertNotIn("users", reader)
+        self.assertEqual(
+            list(reader),
+            [
+                "version",
+                "multi_user",
+                "categories",
+                "transactions",
+                "reclassification_rules",
+            ],
+        )
+        categories = iter(reader["categories"])
+        self.assertEqual(next(categories)["name"], "Food")
+        self.assertEqual(list(reader["transactions"]), [{"id": 3, "amount": "-1.00"}])
+        self.assertEqual(next(categories)["name"], "Rent")
+        self.assertEqual(list(reader["reclassification_rules"]), [])
+        self.assertEqual(len(list(reader["categories"])), 2)
+
+    def test_columnar_row_groups_expand_to_records(self):
+        """Test columnar row groups read back as one dict per record"""
+        content = b"".join(
+            stream_backup_columnar(
+                {"version": "1.0"},
+                [
+                    ("categories", [{"id": i, "name": f"C{i}"} for i in range(3)]),
+                    ("transactions", []),
+                ],
+            )
+        )
+        reader = NDJSONBackupReader(io.BytesIO(content))
+        self.assertEqual(reader["format"], "columnar")
+        self.assertEqual(
+            list(reader["categories"]),
+            [{"id": 0, "name": "C0"}, {"id": 1, "name": "C1"}, {"id": 2, "name": "C2"}],
+        )
+        self.assertEqual(list(reader["transactions"]), [])
+
+        broken = NDJSONBackupReader(
+            io.BytesIO(
+                b'{"version": "1.0"}\n'
+                b'{"section": "categories", "columns": ["id", "name"]}\n'
+                b"[[1, 2], []]\n"
+            )
+        )
+        with self.assertRaises(ValueError):
+            list(broken["categories"])
+
+    def test_missing_header_raises(self):
+        with self.assertRaises(ValueError):
+            NDJSONBackupReader(io.BytesIO(b'["not", "a", "header"]\n'))
+
+
+class ParallelSectionsTest(SimpleTestCase):
+    def test_sections_keep_order(self):
+        """Test sections read by the pool come back in their original order"""
+        sections = [(f"s{i}", range(i * 2500)) for i in range(5)]
+        result = [(key, list(rows)) for key, rows in parallel_sections(sections, 3)]
+        self.assertEqual(result, [(key, list(rows)) for key, rows in sections])
+
+    def test_reader_errors_propagate(self):
+        """Test an exception raised while reading a section reaches the writer"""
+
+        def broken():
+            yield {"id": 1}
+            raise RuntimeError("read failed")
+
+        sections = iter(parallel_sections([("ok", [1]), ("bad", broken())], 2))
+        self.assertEqual(list(next(sections)[1]), [1])
+        with self.assertRaisesMessage(RuntimeError, "read failed"):
+            list(next(sections)[1])
+
+    def test_closing_early_stops_workers(self):
+        """Test workers blocked on a full queue exit when the writer stops"""
+        sections = parallel_sections([("a", range(10**6)), ("b", range(10**6))], 2)
+        key, rows = next(sections)
+        self.assertEqual(next(iter(rows)), 0)
+        # Returns only once the pool has shut down
+        sections.close()
+
+
+class ConsistentSectionsTest(APITestCase):
+    def test_passes_through_inside_transaction(self):
+        """Test sections are read as-is when a transaction is already open"""
+        sections = [("a", [1, 2]), ("b", [3])]
+        with mock.patch.object(snapshot, "parallel_sections") as parallel:
+            result = [(key, list(rows)) for key, rows in consistent_sections(sections)]
+        self.assertEqual(result, sections)
+        parallel.assert_not_called()
+
+
+@skipUnless(connection.vendor == "postgresql", "PostgreSQL exported snapshots")
+class ConsistentBackupTest(TransactionTestCase):
+    def test_backup_reads_one_snapshot_concurrently(self):
+        """Test every section is read from the snapshot taken at backup start"""
+        user = User.objects.create_user(username="testuser", password="testpass123")
+        account = BankAccount.objects.create(user=user, name="Checking")
+        Transaction.objects.create(
+            user=user,
+            account=account,
+            date=date(2026, 3, 1),
+            amount=Decimal("-1.00"),
+            description="Before",
+        )
+        committed = threading.Event()
+
+        def after_commit(rows):
+            # Hold the worker back until the concurrent write is committed
+            committed.wait(timeout=10)
+            yield from rows
+
+        def commit_concurrently():
+            try:
+                Transaction.objects.create(
+                    user=user,
+                    account=account,
+                    date=date(2026, 3, 2),
+                    amount=Decimal("-2.00"),
+                    description="After",
+                )
+            finally:
+                connections.close_all()
+
+        sections = consistent_sections(
+            (
+                (key, after_commit(rows) if key == "transactions" else rows)
+                for key, rows in iter_backup_sections(
+                    user, include={"bank_accounts", "transactions"}
+                )
+            ),
+            max_workers=2,
+        )
+        key, rows = next(sections)
+        self.assertEqual(key, "bank_accounts")
+        self.assertEqual(len(list(rows)), 1)
+        # Committed on another connection after the snapshot was exported
+        # but before the section is read: must not appear
+        writer = threading.Thread(target=commit_concurrently)
+        writer.start()
+        writer.join()
+        committed.set()
+        key, rows = next(sections)
+        self.assertEqual(key, "transactions")
+        self.assertEqual([row["description"] for row in rows], ["Before"])
+        sections.close()
+
+        self.assertTrue(Transaction.objects.filter(description="After").exists())
+
+
+class BulkRestoreTest(APITestCase):
+    def setUp(self):
+        """Set up test data"""
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.existing = Category.objects.create(name="Food", user=self.user)
+        account = BankAccount.objects.create(user=self.user, name="Checking")
+        Transaction.objects.create(
+            amount=-1,
+            description="Already imported",
+            date=date(2025, 1, 1),
+            category=self.existing,
+            account=account,
+            user=self.user,
+            reference_id="ref-0",
+        )
+
+    def _backup(self, count):
+        return {
+            "version": "1.0",
+            "categories": [
+                {"id": 10, "name": "Food", "classification": "spend"},
+                {"id": 11, "name": "Salary", "classification": "credit"},
+            ],
+            "bank_accounts": [{"id": 20, "name": "Savings", "account_type": "savings"}],
+            "transactions": [
+                {
+                    "id": i,
+                    "date": "2025-02-01",
+                    "amount": "-12.50",
+                    "description": f"Row {i}",
+                    "account_id": 20,
+                    "category_id": 10 + i % 2,
+                    # ref-0 exists already and ref-1 repeats within the backup
+                    "reference_id": f"ref-{min(i, 1)}" if i < 3 else None,
+                }
+                for i in range(count)
+            ],
+            "reclassification_rules": [
+                {
+                    "id": 30,
+                    "rule_name": "Food to Salary",
+                    "from_category_id": 10,
+                    "to_category_id": 11,
+                }
+            ],
+            "category_deletion_rules": [{"id": 40, "category_id": 11}],
+        }
+
+    def test_restore_maps_ids_and_skips_duplicates(self):
+        """Test restore maps backup IDs and dedupes existing rows"""
+        summary = restore_all(self.user, self._backup(10))
+        self.assertEqual(summary["categories"], 1)
+        self.assertEqual(summary["bank_accounts"], 1)
+        self.assertEqual(summary["transactions"], 8)
+        self.assertEqual(summary["reclassification_rules"], 1)
+
+        restored = Transaction.objects.filter(user=self.user, description="Row 4")
+        self.assertEqual(restored.get().category, self.existing)
+        self.assertEqual(restored.get().account.name, "Savings")
+        rule = ReclassificationRule.objects.get(user=self.user)
+        self.assertEqual(rule.to_category.name, "Salary")
+
+    def test_query_count_does_not_grow_with_rows(self):
+        """Test restore queries are batched rather than issued per record"""
+        small_user = User.objects.create_user(username="small", password="x")
+        large_user = User.objects.create_user(username="large", password="x")
+        with CaptureQueriesContext(connection) as small:
+            restore_all(small_user, self._backup(20))
+        with CaptureQueriesContext(connection) as large:
+            restore_all(large_user, self._backup(400))
+        # sqlite may split one bulk_create into a few statements (parameter
+        # limit), but per-record queries would run into the hundreds
+        self.assertLess(len(large), len(small) + 10)
+        self.assertEqual(Transaction.objects.filter(user=large_user).count(), 397)
+
+    def test_multi_user_restore_creates_users(self):
+        """Test multi-user backups create missing users and assign ownership"""
+        staff = User.objects.create_user(
+            username="staffuser", password="testpass123", is_staff=True
+        )
+        backup = self._backup(3)
+        backup["users"] = [{"id": 7, "username": "restored"}]
+        for key in ("categories", "bank_accounts", "transactions"):
+            for row in backup[key]:
+                row["user_id"] = 7
+
+        summary = restore_all(staff, backup)
+        restored = User.objects.get(username="restored")
+        self.assertEqual(summary["users"], 1)
+        self.assertFalse(restored.has_usable_password())
+        self.assertEqual(Category.objects.filter(user=restored).count(), 2)
+        # reference_id is globally unique, so ref-0 and the repeated ref-1 skip
+        self.assertEqual(Transaction.objects.filter(user=restored).count(), 1)
@@ -13,13 +13,3 @@ class UploadRateThrottle(UserRateThrottle):
 
     scope = "upload"
     rate = "100/hour"
-
-
-class BulkOperationThrottle(UserRateThrottle):
-    """
-    Rate limit for bulk operations to prevent system overload.
-    Limits to 100 bulk operations per hour per authenticated user.
-    """
-
-    scope = "bulk_operation"
-    rate = "100/hour"
@@ -10,6 +10,7 @@ from .views import (
     TransactionViewSet,
     backup_database,
     balance_by_period,
+    budget_rollover,
     bulk_delete_transactions_by_category,
     bulk_execute_reclassification_rules,
     bulk_reclassify_transactions,
@@ -37,6 +38,7 @@ urlpatterns = [
         name="category_spending_by_period",
     ),
     path("spending-summary/", spending_summary, name="spending_summary"),
+    path("budget-rollover/", budget_rollover, name="budget_rollover"),
     path(
         "upload-bank-statement/",
         upload_bank_statement,
@@ -3,15 +3,22 @@ import hashlib
 import io
 import json
 import logging
-from datetime import datetime, timedelta
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from datetime import date as date_type
+from datetime import datetime, time
 from decimal import Decimal
+from functools import partial
+from itertools import chain
 from typing import Any
 
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Count, Q, Sum
 from django.db.models.functions import Coalesce, TruncMonth
-from django.http import JsonResponse
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 import django_filters
 from django_filters.rest_framework import DjangoFilterBackend
@@ -19,18 +26,49 @@ from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import status, viewsets
 from rest_framework.decorators import (
+    action,
     api_view,
     parser_classes,
     permission_classes,
     throttle_classes,
 )
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
 from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
-from core.backup import backup_all, register_backup_provider, restore_all
+from core.backup import (
+    BACKUP_CHUNK_SIZE,
+    DELETED_SECTION,
+    INCREMENTAL_OVERLAP,
+    RESTORE_BATCH_SIZE,
+    BackupRows,
+    NDJSONBackupReader,
+    bulk_insert,
+    iter_backup_sections,
+    iter_tombstones,
+    merge_backup_chain,
+    restore_all,
+    stream_backup_columnar,
+    stream_backup_json,
+    stream_backup_ndjson,
+)
+from core.bulk import BulkModelMixin
+from core.models import BackupManifest
+from core.snapshot import consistent_sections
+from core.streaming import (
+    ZSTD_AVAILABLE,
+    DecompressedSizeError,
+    gzip_stream,
+    iter_chunks,
+    open_decompressed,
+    read_decompressed_head,
+    zstd_stream,
+)
+from core.throttles import BulkOperationThrottle
 
+from .budgeting import ZERO, compute_budget_rollover
+from .exports import EXPORT_FORMATS, stream_transactions
 from .models import (
     BankAccount,
     Category,
@@ -38,14 +76,26 @@ from .models import (
     ReclassificationRule,
     Transaction,
 )
+from .pagination import TransactionCursorPagination
+from .periods import (
+    CURRENT_PERIODS,
+    DateRange,
+    fiscal_year_range,
+    iter_months,
+    month_range_from_param,
+    parse_month,
+    resolve_period,
+)
+from .search import TransactionSearchFilter
 from .serializers import (
     BankAccountSerializer,
     CategoryDeletionRuleSerializer,
     CategorySerializer,
     ReclassificationRuleSerializer,
+    TransactionListSerializer,
     TransactionSerializer,
 )
-from .throttles import BulkOperationThrottle, UploadRateThrottle
+from .throttles import UploadRateThrottle
 
 # Resolved once at import time — avoids N806 and repeated calls
 user_model = get_user_model()
@@ -53,7 +103,7 @@ logger = logging.getLogger(__name__)
 
 
 @extend_schema(tags=["Categories"])
-class CategoryViewSet(viewsets.ModelViewSet):
+class CategoryViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
     ordering = ["name"]
@@ -69,28 +119,14 @@ class CategoryViewSet(viewsets.ModelViewSet):
         serializer.save(user=self.request.user)
 
 
-class BankAccountViewSet(viewsets.ModelViewSet):
+class BankAccountViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = BankAccount.objects.all()
     serializer_class = BankAccountSerializer
     ordering = ["name"]
 
     def get_queryset(self):
-        month_param = self.request.query_params.get("month", "")
-        if month_param and len(month_param) == 7 and month_param[4] == "-":
-            try:
-                year = int(month_param[:4])
-                month = int(month_param[5:])
-            except ValueError:
-                now = timezone.now()
-                year, month = now.year, now.month
-        else:
-            now = timezone.now()
-            year, month = now.year, now.month
-
-        month_filter = Q(
-            transactions__date__year=year,
-            transactions__date__month=month,
-        )
+        month = month_range_from_param(self.request.query_params.get("month", ""))
+        month_filter = Q(**month.as_filter("transactions__date"))
         return (
             BankAccount.objects.filter(user=self.request.user)
             .select_related("user")
@@ -120,14 +156,30 @@ class TransactionFilter(django_filters.FilterSet):
         fields = ["category", "account", "date__gte", "date__lte"]
 
 
-class TransactionViewSet(viewsets.ModelViewSet):
+class TransactionViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, TransactionSearchFilter, OrderingFilter]
     filterset_class = TransactionFilter
     search_fields = ["description"]
     ordering_fields = ["date", "amount"]
 
+    @property
+    def paginator(self):
+        """Use keyset pagination when ``?pagination=cursor`` or a cursor is sent.
+
+        Page-number pagination stays the default for existing clients; cursor
+        mode is ordered by (-date, -id), rejects ``?ordering=`` and skips the
+        COUNT(*) query.
+        """
+        if not hasattr(self, "_paginator"):
+            params = self.request.query_params if self.request else {}
+            if params.get("pagination") == "cursor" or "cursor" in params:
+                self._paginator = TransactionCursorPagination()
+            else:
+                return super().paginator
+        return self._paginator
+
     def get_queryset(self):
         return (
             Transaction.objects.filter(user=self.request.user)
@@ -135,12 +187,104 @@ class TransactionViewSet(viewsets.ModelViewSet):
             .order_by("-date")
         )
 
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Comma-separated subset of fields to return",
+                required=False,
+            )
+        ]
+    )
+    def list(self, request, *args, **kwargs):
+        """List transactions through a lean ``.values()`` projection.
+
+        Joined names are selected in SQL and rows are rendered by
+        TransactionListSerializer, so no model instances or per-row DRF
+        fields are created. Output matches TransactionSerializer.
+        """
+        list_serializer = TransactionListSerializer(self._requested_fields())
+        queryset = list_serializer.get_values_queryset(
+            self.filter_queryset(self.get_queryset())
+        )
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(list_serializer.to_representation(page))
+        return Response(list_serializer.to_representation(queryset))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Output format (defaults to csv)",
+                enum=[*EXPORT_FORMATS],
+                required=False,
+            ),
+            OpenApiParameter(
+                name="fields",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description="Comma-separated subset of fields to export",
+                required=False,
+            ),
+        ],
+        responses={
+            (200, "text/csv"): OpenApiTypes.STR,
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        pagination_class=None,
+        throttle_classes=[BulkOperationThrottle],
+    )
+    def export(self, request):
+        """Stream every matching transaction as CSV or NDJSON.
+
+        Honours the same filters, search and ordering as the list endpoint.
+        Rows are read through a server-side cursor in chunks (see
+        budget.exports), so memory stays flat for any export size.
+        """
+        export_format = request.query_params.get("export_format", "csv").lower()
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"error": f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        list_serializer = TransactionListSerializer(self._requested_fields())
+        queryset = self.filter_queryset(self.get_queryset())
+        content_type, extension = EXPORT_FORMATS[export_format]
+        filename = (
+            f"transactions_{request.user.username}_"
+            f"{datetime.now().strftime('%Y%m%d_%H%M%S')}.{extension}"
+        )
+        response = StreamingHttpResponse(
+            stream_transactions(queryset, list_serializer, export_format),
+            content_type=content_type,
+        )
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
+    def _requested_fields(self):
+        return [
+            name.strip()
+            for name in self.request.query_params.get("fields", "").split(",")
+            if name.strip()
+        ]
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
 @extend_schema(tags=["Reclassification Rules"])
-class ReclassificationRuleViewSet(viewsets.ModelViewSet):
+class ReclassificationRuleViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = ReclassificationRule.objects.all()
     serializer_class = ReclassificationRuleSerializer
     ordering = ["-created_at"]
@@ -157,7 +301,7 @@ class ReclassificationRuleViewSet(viewsets.ModelViewSet):
 
 
 @extend_schema(tags=["Category Deletion Rules"])
-class CategoryDeletionRuleViewSet(viewsets.ModelViewSet):
+class CategoryDeletionRuleViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = CategoryDeletionRule.objects.all()
     serializer_class = CategoryDeletionRuleSerializer
     ordering = ["-created_at"]
@@ -179,56 +323,43 @@ class CategoryDeletionRuleViewSet(viewsets.ModelViewSet):
             name="period",
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
-            description="Time period (week, month, quarter, year)",
-            enum=["week", "month", "quarter", "year"],
+            description=(
+                "Current calendar period (week, month, quarter, year) or an "
+                "explicit one (YYYY-MM, YYYY-Qn, YYYY-Www, YYYY)"
+            ),
         )
     ],
     responses={
-        200: {"type": "object", "properties": {"balance_week": {"type": "number"}}},
+        200: {"type": "object", "properties": {"balance_week": {"type": "string"}}},
         400: {"type": "object", "properties": {"error": {"type": "string"}}},
     },
 )
 @api_view(["GET"])
 def balance_by_period(request, period):
-    """Calculate balance for a specific time period."""
-    # Validate period parameter
-    valid_periods = ["week", "month", "quarter", "year"]
-    if period not in valid_periods:
-        return JsonResponse(
+    """Calculate balance for a calendar period (see budget.periods)."""
+    try:
+        date_range = resolve_period(period)
+    except ValueError:
+        valid_periods = [*CURRENT_PERIODS, "YYYY-MM", "YYYY-Qn", "YYYY-Www", "YYYY"]
+        return Response(
             {"error": f"Invalid period. Must be one of: {', '.join(valid_periods)}"},
-            status=400,
-        )
-
-    now = timezone.localdate()
-    if period == "week":
-        start = now - timedelta(days=7)
-    elif period == "month":
-        start = now - timedelta(days=30)
-    elif period == "quarter":
-        start = now - timedelta(days=90)
-    elif period == "year":
-        start = now - timedelta(days=365)
-
-    total = (
-        Transaction.objects.filter(user=request.user, date__gte=start).aggregate(
-            total=Sum("amount")
-        )["total"]
-        or 0
-    )
-    return JsonResponse({f"balance_{period}": total})
+            status=status.HTTP_400_BAD_REQUEST,
+        )
 
+    total = Transaction.objects.filter(
+        user=request.user, **date_range.as_filter()
+    ).aggregate(total=Sum("amount"))["total"] or Decimal("0")
+    # The balance is part of the public contract as a two-decimal string
+    return Response({f"balance_{period}": f"{total:.2f}"})
 
-def _get_spending_by_category(user, start_date, end_date):
+
+def _get_spending_by_category(user, date_range):
     """
     Return a dict mapping category_id -> Decimal total for transactions
-    within the given date range for a user.
+    within the given half-open date range for a user.
     """
     rows = (
-        Transaction.objects.filter(
-            user=user,
-            date__gte=start_date,
-            date__lte=end_date,
-        )
+        Transaction.objects.filter(user=user, **date_range.as_filter())
         .values("category_id")
         .annotate(total=Sum("amount"))
     )
@@ -241,7 +372,10 @@ def _get_spending_by_category(user, start_date, end_date):
             name="period",
             type=OpenApiTypes.STR,
             location=OpenApiParameter.PATH,
-            description="Time period (week, month, quarter, year) or YYYY-MM format",
+            description=(
+                "Current calendar period (week, month, quarter, year) or an "
+                "explicit one (YYYY-MM, YYYY-Qn, YYYY-Www, YYYY)"
+            ),
         )
     ],
     responses={
@@ -266,51 +400,26 @@ def _get_spending_by_category(user, start_date, end_date):
 def category_spending_by_period(request, period):
     """
     Get spending by category for a specific period.
-    Supports both predefined periods ('week', 'month', 'quarter', 'year')
-    and specific year-month format ('YYYY-MM').
+    Supports the current calendar period ('week', 'month', 'quarter', 'year')
+    and explicit periods ('YYYY-MM', 'YYYY-Qn', 'YYYY-Www', 'YYYY').
     Returns category budgets vs actual spending.
     Optimized to prevent N+1 queries.
     """
-    now = timezone.now().date()
-
-    # Check if period is in YYYY-MM format
-    if len(period) == 7 and period[4] == "-":
-        try:
-            year = int(period[:4])
-            month = int(period[5:])
-            from datetime import date as date_type
-
-            current_year = timezone.now().year
-            if year < 2000 or year > current_year + 1:
-                return Response(
-                    {"error": "Period out of valid range."},
-                    status=status.HTTP_400_BAD_REQUEST,
-                )
+    try:
+        date_range = resolve_period(period)
+    except ValueError:
+        return Response({"error": "Invalid period"}, status=status.HTTP_400_BAD_REQUEST)
 
-            start: date_type = datetime(year, month, 1).date()
-            # Calculate end of month
-            if month == 12:
-                end: date_type = datetime(year + 1, 1, 1).date() - timedelta(days=1)
-            else:
-                end: date_type = datetime(year, month + 1, 1).date() - timedelta(days=1)
-        except ValueError:
-            return JsonResponse({"error": "Invalid year-month format"}, status=400)
-    else:
-        # Handle predefined periods
-        if period == "week":
-            start = now - timedelta(days=7)
-        elif period == "month":
-            start = now - timedelta(days=30)
-        elif period == "quarter":
-            start = now - timedelta(days=90)
-        elif period == "year":
-            start = now - timedelta(days=365)
-        else:
-            return JsonResponse({"error": "Invalid period"}, status=400)
-        end = now
+    if period not in CURRENT_PERIODS:
+        current_year = timezone.now().year
+        if date_range.start.year < 2000 or date_range.start.year > current_year + 1:
+            return Response(
+                {"error": "Period out of valid range."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
     # Optimized: Get all spending in one query grouped by category
-    spending_by_category = _get_spending_by_category(request.user, start, end)
+    spending_by_category = _get_spending_by_category(request.user, date_range)
 
     # Get all categories with their budgets
     categories = Category.objects.filter(
@@ -321,31 +430,26 @@ def category_spending_by_period(request, period):
     result = []
     for category in categories:
         # Get pre-calculated spending from dict (no additional query)
-        spending = spending_by_category.get(category.id, 0)
-
-        # Calculate budget vs spending
-        budget = float(category.monthly_budget)
-        spending_float = float(spending)
-        balance = budget - spending_float
+        spending = spending_by_category.get(category.id, ZERO)
 
+        # Calculate budget vs spending; Decimals are encoded by the renderer
+        budget = category.monthly_budget
         result.append(
             {
                 "id": category.id,
                 "name": category.name,
                 "budget": budget,
-                "spending": spending_float,
-                "balance": balance,
-                "percentage_used": (
-                    (spending_float / budget * 100) if budget > 0 else 0
-                ),
+                "spending": spending,
+                "balance": budget - spending,
+                "percentage_used": (spending / budget * 100) if budget > 0 else 0,
             }
         )
 
-    return JsonResponse(
+    return Response(
         {
             "period": period,
-            "start_date": start.isoformat(),
-            "end_date": end.isoformat(),
+            "start_date": date_range.start.isoformat(),
+            "end_date": date_range.last_day.isoformat(),
             "categories": result,
         }
     )
@@ -382,25 +486,8 @@ def category_spending_by_period(request, period):
 @permission_classes([IsAuthenticated])
 def spending_summary(request):
     """Get current month spending grouped by spend category."""
-    month_param = request.query_params.get("month", "")
-    if month_param and len(month_param) == 7 and month_param[4] == "-":
-        try:
-            year = int(month_param[:4])
-            month_num = int(month_param[5:])
-        except ValueError:
-            now = timezone.now()
-            year, month_num = now.year, now.month
-    else:
-        now = timezone.now()
-        year, month_num = now.year, now.month
-
-    start = datetime(year, month_num, 1).date()
-    if month_num == 12:
-        end = datetime(year + 1, 1, 1).date() - timedelta(days=1)
-    else:
-        end = datetime(year, month_num + 1, 1).date() - timedelta(days=1)
-
-    spending_dict = _get_spending_by_category(request.user, start, end)
+    month = month_range_from_param(request.query_params.get("month", ""))
+    spending_dict = _get_spending_by_category(request.user, month)
 
     categories = Category.objects.filter(
         user=request.user,
@@ -409,8 +496,8 @@ def spending_summary(request):
 
     result = []
     for category in categories:
-        total_spent = float(spending_dict.get(category.id, 0))
-        budget_limit = float(category.monthly_budget)
+        total_spent = spending_dict.get(category.id, ZERO)
+        budget_limit = category.monthly_budget
         percentage_used = (
             (total_spent / budget_limit * 100) if budget_limit > 0 else None
         )
@@ -425,14 +512,114 @@ def spending_summary(request):
             }
         )
 
-    return JsonResponse(
+    return Response(
         {
-            "month": f"{year:04d}-{month_num:02d}",
+            "month": month.start.strftime("%Y-%m"),
             "categories": result,
         }
     )
 
 
+MAX_BUDGET_ROLLOVER_MONTHS = 60
+
+
+@extend_schema(
+    tags=["Categories"],
+    parameters=[
+        OpenApiParameter(
+            name="start",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description="First month (YYYY-MM); defaults to January of the current year",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="end",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description="Last month (YYYY-MM, inclusive); defaults to December of the start year",
+            required=False,
+        ),
+    ],
+    responses={
+        200: {
+            "type": "object",
+            "properties": {
+                "start_month": {"type": "string", "example": "2026-01"},
+                "end_month": {"type": "string", "example": "2026-12"},
+                "as_of": {"type": "string", "format": "date"},
+                "categories": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "name": {"type": "string"},
+                            "monthly_budget": {"type": "number"},
+                            "total_budget": {"type": "number"},
+                            "total_spent": {"type": "number"},
+                            "carryover": {"type": "number"},
+                            "months": {"type": "array"},
+                        },
+                    },
+                },
+            },
+        },
+        400: {"type": "object", "properties": {"error": {"type": "string"}}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def budget_rollover(request):
+    """Budget carry-over, pacing and month-end projection per spend category.
+
+    Surpluses and deficits roll forward month to month across the requested
+    range. All months are computed from one grouped spending query (see
+    budget.budgeting).
+    """
+    today = timezone.localdate()
+    try:
+        start_param = request.query_params.get("start", "")
+        start = (
+            parse_month(start_param).start
+            if start_param
+            else date_type(today.year, 1, 1)
+        )
+        end_param = request.query_params.get("end", "")
+        end = (
+            parse_month(end_param).end
+            if end_param
+            else fiscal_year_range(start.year, start_month=1).end
+        )
+    except ValueError:
+        return Response(
+            {"error": "start and end must use the YYYY-MM format."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    date_range = DateRange(start, end)
+    month_count = sum(1 for _ in iter_months(date_range))
+    if month_count == 0:
+        return Response(
+            {"error": "end must not be before start."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if month_count > MAX_BUDGET_ROLLOVER_MONTHS:
+        return Response(
+            {"error": f"At most {MAX_BUDGET_ROLLOVER_MONTHS} months per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    return Response(
+        {
+            "start_month": date_range.start.strftime("%Y-%m"),
+            "end_month": date_range.last_day.strftime("%Y-%m"),
+            "as_of": today.isoformat(),
+            "categories": compute_budget_rollover(request.user, date_range, today),
+        }
+    )
+
+
 @extend_schema(
     tags=["Transactions"],
     responses={
@@ -1000,10 +1187,11 @@ def bulk_reclassify_transactions(request):
         from_category = Category.objects.get(id=from_category_id, user=request.user)
         to_category = Category.objects.get(id=to_category_id, user=request.user)
 
-        # Update all transactions from source category to target category
+        # Update all transactions from source category to target category.
+        # update() skips auto_now, so stamp updated_at for incremental backups.
         transactions_updated = Transaction.objects.filter(
             user=request.user, category=from_category
-        ).update(category=to_category)
+        ).update(category=to_category, updated_at=timezone.now())
 
         return Response(
             {
@@ -1156,7 +1344,7 @@ def bulk_execute_reclassification_rules(request):
             # Execute batch updates
             for category_id, txn_ids in category_transaction_map.items():
                 updated = Transaction.objects.filter(id__in=txn_ids).update(
-                    category_id=category_id
+                    category_id=category_id, updated_at=timezone.now()
                 )
                 total_updated += updated
 
@@ -1376,8 +1564,45 @@ BACKUP_ENTITIES = (
     "transactions",
     "reclassification_rules",
     "category_deletion_rules",
+    "investments",
+    "heritages",
+    "retirement_accounts",
 )
 
+# backup_format -> (stream writer, content type)
+BACKUP_FORMATS = {
+    "json": (stream_backup_json, "application/json"),
+    "ndjson": (stream_backup_ndjson, "application/x-ndjson"),
+    "columnar": (stream_backup_columnar, "application/x-ndjson"),
+}
+# compress -> (stream compressor, content type, file extension)
+BACKUP_COMPRESSIONS = {
+    "gzip": (gzip_stream, "application/gzip", ".gz"),
+    "zstd": (zstd_stream, "application/zstd", ".zst"),
+}
+
+# Restore detects format and compression from the content; the file name
+# only has to look like a backup
+BACKUP_UPLOAD_SUFFIXES = tuple(
+    f".{backup_format}{suffix}"
+    for backup_format in BACKUP_FORMATS
+    for suffix in ("", ".gz", ".zst")
+)
+# A line-delimited backup's header fits on its first line
+BACKUP_HEADER_SNIFF_SIZE = 64 * 1024
+# JSON documents are parsed in memory; larger backups must be line-delimited,
+# which are capped by settings.BACKUP_MAX_STREAMED_SIZE instead
+BACKUP_MAX_JSON_SIZE = 50 * 1024 * 1024
+
+
+def get_backup_compressor(backup_format: str, compress: str):
+    """Return the stream compressor used for a backup download."""
+    if backup_format == "columnar" and compress == "gzip":
+        # Column arrays leave little for slower levels to find: level 1 is
+        # ~2.5x faster than the default for a 15% larger file
+        return partial(gzip_stream, level=1)
+    return BACKUP_COMPRESSIONS[compress][0]
+
 
 def _backup_budget_domain(
     user: Any,
@@ -1385,25 +1610,29 @@ def _backup_budget_domain(
     include: set[str] | None = None,
     multi_user_mode: bool = False,
     user_filter: dict[str, Any] | None = None,
-) -> dict[str, list[dict[str, Any]]]:
+    since: datetime | None = None,
+) -> dict[str, BackupRows]:
     include = include or set(BACKUP_ENTITIES)
     user_filter = user_filter or {"user": user}
+    # Incremental backups only export rows created or updated after ``since``
+    user_filter = {**user_filter, "updated_at__gt": since} if since else user_filter
 
     def _values(*fields: str) -> tuple[str, ...]:
         return (*fields, "user_id") if multi_user_mode else fields
 
-    domain_data: dict[str, list[dict[str, Any]]] = {}
+    domain_data: dict[str, BackupRows] = {}
 
     if "categories" in include:
-        domain_data["categories"] = list(
-            Category.objects.filter(**user_filter).values(
-                *_values("id", "name", "classification", "monthly_budget")
-            )
+        domain_data["categories"] = (
+            Category.objects.filter(**user_filter)
+            .values(*_values("id", "name", "classification", "monthly_budget"))
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "bank_accounts" in include:
-        domain_data["bank_accounts"] = list(
-            BankAccount.objects.filter(**user_filter).values(
+        domain_data["bank_accounts"] = (
+            BankAccount.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "name",
@@ -1415,11 +1644,13 @@ def _backup_budget_domain(
                     "is_active",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "transactions" in include:
-        domain_data["transactions"] = list(
-            Transaction.objects.filter(**user_filter).values(
+        domain_data["transactions"] = (
+            Transaction.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "date",
@@ -1431,11 +1662,13 @@ def _backup_budget_domain(
                     "category_id",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "reclassification_rules" in include:
-        domain_data["reclassification_rules"] = list(
-            ReclassificationRule.objects.filter(**user_filter).values(
+        domain_data["reclassification_rules"] = (
+            ReclassificationRule.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "rule_name",
@@ -1446,13 +1679,14 @@ def _backup_budget_domain(
                     "created_at",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "category_deletion_rules" in include:
-        domain_data["category_deletion_rules"] = list(
-            CategoryDeletionRule.objects.filter(**user_filter).values(
-                *_values("id", "category_id", "is_active", "created_at")
-            )
+        domain_data["category_deletion_rules"] = (
+            CategoryDeletionRule.objects.filter(**user_filter)
+            .values(*_values("id", "category_id", "is_active", "created_at"))
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     return domain_data
@@ -1464,27 +1698,42 @@ def _restore_budget_domain(
     *,
     clear_existing: bool = False,
 ) -> dict[str, int]:
+    """Restore budget entities in phases with batched inserts.
+
+    Existing rows for the target users are prefetched once, backup IDs are
+    mapped to live objects in memory, and each entity type is inserted with
+    ``bulk_create`` in batches, so the query count does not grow per record.
+    """
     multi_user_mode = "users" in data
     old_id_to_user: dict[int, Any] = {}
     users_created = 0
 
     if multi_user_mode:
-        for u in data.get("users", []):
-            obj, created = user_model.objects.get_or_create(
+        backup_users = list(data.get("users", []))
+        usernames = {u["username"] for u in backup_users}
+        existing_users = user_model.objects.in_bulk(usernames, field_name="username")
+        new_users = []
+        for u in backup_users:
+            if u["username"] in existing_users:
+                continue
+            obj = user_model(
                 username=u["username"],
-                defaults={
-                    "email": u.get("email", ""),
-                    "first_name": u.get("first_name", ""),
-                    "last_name": u.get("last_name", ""),
-                    "is_active": u.get("is_active", True),
-                },
+                email=u.get("email", ""),
+                first_name=u.get("first_name", ""),
+                last_name=u.get("last_name", ""),
+                is_active=u.get("is_active", True),
+            )
+            # Restored users cannot log in until they reset their password.
+            obj.set_unusable_password()
+            existing_users[u["username"]] = obj
+            new_users.append(obj)
+        users_created = bulk_insert(user_model, new_users)
+        if users_created:
+            # Re-read so every user has a primary key on all backends
+            existing_users = user_model.objects.in_bulk(
+                usernames, field_name="username"
             )
-            if created:
-                # Restored users cannot log in until they reset their password.
-                obj.set_unusable_password()
-                obj.save(update_fields=["password"])
-                users_created += 1
-            old_id_to_user[u["id"]] = obj
+        old_id_to_user = {u["id"]: existing_users[u["username"]] for u in backup_users}
 
     def resolve_user(entity: dict[str, Any]) -> Any | None:
         """Return the live User for an entity, or None to skip it."""
@@ -1493,91 +1742,98 @@ def _restore_budget_domain(
             return old_id_to_user.get(uid)
         return requester
 
-    if clear_existing:
-        targets = list(old_id_to_user.values()) if old_id_to_user else [requester]
-        for target in targets:
-            CategoryDeletionRule.objects.filter(user=target).delete()
-            ReclassificationRule.objects.filter(user=target).delete()
-            Transaction.objects.filter(user=target).delete()
-            BankAccount.objects.filter(user=target).delete()
-            Category.objects.filter(user=target).delete()
-
-    old_id_to_category: dict[tuple[int, int], Category] = {}
-    categories_created = 0
+    user_ids = {requester.id, *(u.id for u in old_id_to_user.values())}
 
+    if clear_existing:
+        target_ids = [u.id for u in old_id_to_user.values()] or [requester.id]
+        CategoryDeletionRule.objects.filter(user_id__in=target_ids).delete()
+        ReclassificationRule.objects.filter(user_id__in=target_ids).delete()
+        Transaction.objects.filter(user_id__in=target_ids).delete()
+        BankAccount.objects.filter(user_id__in=target_ids).delete()
+        Category.objects.filter(user_id__in=target_ids).delete()
+
+    # Categories and bank accounts are unique per (user, name): reuse live rows
+    categories_by_name = {
+        (c.user_id, c.name): c for c in Category.objects.filter(user_id__in=user_ids)
+    }
+    category_refs: list[tuple[int, Any, str]] = []
+    new_categories = []
     for cat in data.get("categories", []):
         target = resolve_user(cat)
         if target is None:
             continue
-        obj, created = Category.objects.get_or_create(
-            name=cat["name"],
-            user=target,
-            defaults={
-                "classification": cat.get("classification", Category.SPEND),
-                "monthly_budget": cat.get("monthly_budget", 0),
-            },
-        )
-        old_id_to_category[(target.id, cat["id"])] = obj
-        if created:
-            categories_created += 1
-
-    old_id_to_bank_account: dict[tuple[int, int], BankAccount] = {}
-    bank_accounts_created = 0
+        key = (target.id, cat["name"])
+        if key not in categories_by_name:
+            categories_by_name[key] = Category(
+                name=cat["name"],
+                user=target,
+                classification=cat.get("classification", Category.SPEND),
+                monthly_budget=cat.get("monthly_budget", 0),
+            )
+            new_categories.append(categories_by_name[key])
+        category_refs.append((target.id, cat["id"], cat["name"]))
+    categories_created = bulk_insert(Category, new_categories)
+    if categories_created and new_categories[0].pk is None:
+        # Backends without RETURNING support leave bulk-created PKs unset
+        categories_by_name = {
+            (c.user_id, c.name): c
+            for c in Category.objects.filter(user_id__in=user_ids)
+        }
+    old_id_to_category = {
+        (user_id, old_id): categories_by_name[(user_id, name)]
+        for user_id, old_id, name in category_refs
+    }
+    live_categories = {(c.user_id, c.id): c for c in categories_by_name.values()}
 
+    accounts_by_name = {
+        (a.user_id, a.name): a for a in BankAccount.objects.filter(user_id__in=user_ids)
+    }
+    account_refs: list[tuple[int, Any, str]] = []
+    new_accounts = []
     for ba in data.get("bank_accounts", []):
         target = resolve_user(ba)
         if target is None:
             continue
-        obj, created = BankAccount.objects.get_or_create(
-            user=target,
-            name=ba["name"],
-            defaults={
-                "account_type": ba.get("account_type", BankAccount.CHECKING),
-                "institution": ba.get("institution", ""),
-                "account_number": ba.get("account_number") or None,
-                "currency": ba.get("currency", "USD"),
-                "notes": ba.get("notes") or None,
-                "is_active": ba.get("is_active", True),
-            },
-        )
-        old_id_to_bank_account[(target.id, ba["id"])] = obj
-        if created:
-            bank_accounts_created += 1
-
-    transactions_created = 0
-    for t in data.get("transactions", []):
-        target = resolve_user(t)
-        if target is None:
-            continue
-
-        old_cat_id = t.get("category_id")
-        category = old_id_to_category.get((target.id, old_cat_id))
-        if not category:
-            continue
-
-        ref_id = t.get("reference_id") or ""
-        if (
-            ref_id
-            and Transaction.objects.filter(reference_id=ref_id, user=target).exists()
-        ):
-            continue
-
-        try:
-            date = datetime.fromisoformat(t["date"]).date() if t.get("date") else None
-        except ValueError:
-            continue
+        key = (target.id, ba["name"])
+        if key not in accounts_by_name:
+            accounts_by_name[key] = BankAccount(
+                user=target,
+                name=ba["name"],
+                account_type=ba.get("account_type", BankAccount.CHECKING),
+                institution=ba.get("institution", ""),
+                account_number=ba.get("account_number") or None,
+                currency=ba.get("currency", "USD"),
+                notes=ba.get("notes") or None,
+                is_active=ba.get("is_active", True),
+            )
+            new_accounts.append(accounts_by_name[key])
+        account_refs.append((target.id, ba["id"], ba["name"]))
+    bank_accounts_created = bulk_insert(BankAccount, new_accounts)
+    if bank_accounts_created and new_accounts[0].pk is None:
+        accounts_by_name = {
+            (a.user_id, a.name): a
+            for a in BankAccount.objects.filter(user_id__in=user_ids)
+        }
+    old_id_to_bank_account = {
+        (user_id, old_id): accounts_by_name[(user_id, name)]
+        for user_id, old_id, name in account_refs
+    }
+    live_accounts = {(a.user_id, a.id): a for a in accounts_by_name.values()}
+    default_accounts: dict[int, BankAccount] = {}
 
-        account_id = t.get("account_id") or t.get("account")
-        account = None
+    def resolve_account(target: Any, account_id: Any) -> BankAccount:
+        """Map a backup account ID, falling back to the user's checking account."""
         if account_id:
             account = old_id_to_bank_account.get((target.id, account_id))
             if account is None:
                 try:
-                    account = BankAccount.objects.get(id=int(account_id), user=target)
-                except (BankAccount.DoesNotExist, ValueError):
-                    pass
-        if account is None:
-            account, _ = BankAccount.objects.get_or_create(
+                    account = live_accounts.get((target.id, int(account_id)))
+                except ValueError:
+                    account = None
+            if account is not None:
+                return account
+        if target.id not in default_accounts:
+            default_accounts[target.id], _ = BankAccount.objects.get_or_create(
                 user=target,
                 account_type=BankAccount.CHECKING,
                 defaults={
@@ -1585,18 +1841,56 @@ def _restore_budget_domain(
                     "currency": "USD",
                 },
             )
+        return default_accounts[target.id]
 
-        Transaction.objects.create(
-            date=date,
-            amount=t.get("amount", 0),
-            description=t.get("description", ""),
-            account=account,
-            import_source=t.get("import_source", "backup"),
-            reference_id=ref_id or None,
-            category=category,
-            user=target,
-        )
-        transactions_created += 1
+    seen_reference_ids: set[str] = set()
+
+    def transactions_to_create():
+        """Yield new Transaction instances, skipping duplicates by reference_id."""
+        for batch in iter_chunks(data.get("transactions", []), RESTORE_BATCH_SIZE):
+            pending = []
+            for t in batch:
+                target = resolve_user(t)
+                if target is None:
+                    continue
+                category = old_id_to_category.get((target.id, t.get("category_id")))
+                if not category:
+                    continue
+                try:
+                    date = datetime.fromisoformat(t["date"]).date()
+                except (KeyError, TypeError, ValueError):
+                    continue
+                ref_id = t.get("reference_id") or None
+                pending.append(
+                    Transaction(
+                        date=date,
+                        amount=t.get("amount", 0),
+                        description=t.get("description", ""),
+                        account=resolve_account(
+                            target, t.get("account_id") or t.get("account")
+                        ),
+                        import_source=t.get("import_source", "backup"),
+                        reference_id=ref_id,
+                        category=category,
+                        user=target,
+                    )
+                )
+
+            # reference_id is globally unique: one lookup per batch
+            refs = {obj.reference_id for obj in pending if obj.reference_id}
+            seen_reference_ids.update(
+                Transaction.objects.filter(reference_id__in=refs).values_list(
+                    "reference_id", flat=True
+                )
+            )
+            for obj in pending:
+                if obj.reference_id:
+                    if obj.reference_id in seen_reference_ids:
+                        continue
+                    seen_reference_ids.add(obj.reference_id)
+                yield obj
+
+    transactions_created = bulk_insert(Transaction, transactions_to_create())
 
     def resolve_category(target: Any, old_cat_id: Any) -> Category | None:
         """Look up a category by old backup ID, falling back to the live DB."""
@@ -1604,13 +1898,10 @@ def _restore_budget_domain(
             return None
         cat = old_id_to_category.get((target.id, old_cat_id))
         if cat is None:
-            try:
-                cat = Category.objects.get(id=old_cat_id, user=target)
-            except Category.DoesNotExist:
-                pass
+            cat = live_categories.get((target.id, old_cat_id))
         return cat
 
-    rules_created = 0
+    new_rules = []
     for rule in data.get("reclassification_rules", []):
         target = resolve_user(rule)
         if target is None:
@@ -1622,16 +1913,25 @@ def _restore_budget_domain(
         to_cat = resolve_category(target, rule.get("to_category_id"))
         if not to_cat:
             continue
-        ReclassificationRule.objects.create(
-            rule_name=rule.get("rule_name", ""),
-            from_category=from_cat,
-            to_category=to_cat,
-            conditions=rule.get("conditions") or {},
-            is_active=rule.get("is_active", True),
-            user=target,
+        new_rules.append(
+            ReclassificationRule(
+                rule_name=rule.get("rule_name", ""),
+                from_category=from_cat,
+                to_category=to_cat,
+                conditions=rule.get("conditions") or {},
+                is_active=rule.get("is_active", True),
+                user=target,
+            )
         )
-        rules_created += 1
+    rules_created = bulk_insert(ReclassificationRule, new_rules)
 
+    # Deletion rules are unique per (user, category); existing ones are kept
+    existing_deletion_rules = set(
+        CategoryDeletionRule.objects.filter(user_id__in=user_ids).values_list(
+            "user_id", "category_id"
+        )
+    )
+    new_deletion_rules = []
     deletion_rules_created = 0
     for rule in data.get("category_deletion_rules", []):
         target = resolve_user(rule)
@@ -1640,12 +1940,17 @@ def _restore_budget_domain(
         cat = resolve_category(target, rule.get("category_id"))
         if not cat:
             continue
-        CategoryDeletionRule.objects.get_or_create(
-            category=cat,
-            user=target,
-            defaults={"is_active": rule.get("is_active", True)},
-        )
+        if (target.id, cat.id) not in existing_deletion_rules:
+            existing_deletion_rules.add((target.id, cat.id))
+            new_deletion_rules.append(
+                CategoryDeletionRule(
+                    category=cat,
+                    user=target,
+                    is_active=rule.get("is_active", True),
+                )
+            )
         deletion_rules_created += 1
+    bulk_insert(CategoryDeletionRule, new_deletion_rules)
 
     summary: dict[str, int] = {
         "categories": categories_created,
@@ -1660,9 +1965,6 @@ def _restore_budget_domain(
     return summary
 
 
-register_backup_provider("budget", _backup_budget_domain, _restore_budget_domain)
-
-
 @extend_schema(
     parameters=[
         {
@@ -1676,7 +1978,41 @@ register_backup_provider("budget", _backup_budget_domain, _restore_budget_domain
             ),
             "required": False,
             "schema": {"type": "string"},
-        }
+        },
+        {
+            "name": "backup_format",
+            "in": "query",
+            "description": (
+                "json (default) for a single JSON document, ndjson for one "
+                "record per line, or columnar for compressed column arrays per "
+                "entity (the smallest and fastest; gzip unless compress=zstd). "
+                "ndjson and columnar backups can be restored without size limits"
+            ),
+            "required": False,
+            "schema": {"type": "string", "enum": list(BACKUP_FORMATS)},
+        },
+        {
+            "name": "compress",
+            "in": "query",
+            "description": (
+                "Compress the download: gzip (.gz) or zstd (.zst, when the "
+                "server has zstandard installed)"
+            ),
+            "required": False,
+            "schema": {"type": "string", "enum": list(BACKUP_COMPRESSIONS)},
+        },
+        {
+            "name": "since",
+            "in": "query",
+            "description": (
+                "Incremental backup: a previous backup id (see the backup_id "
+                "header field) or an ISO 8601 date/timestamp. Only rows created "
+                "or updated since then are exported, plus a 'deleted' section "
+                "listing rows deleted since then."
+            ),
+            "required": False,
+            "schema": {"type": "string"},
+        },
     ],
     responses={
         200: {
@@ -1687,7 +2023,8 @@ register_backup_provider("budget", _backup_budget_domain, _restore_budget_domain
     description=(
         "Export selected user data as a JSON backup file. "
         "Including 'users' requires staff privileges and exports all "
-        "non-staff/non-superuser accounts together with their data."
+        "non-staff/non-superuser accounts together with their data. "
+        "The file is streamed, so memory use does not grow with its size."
     ),
 )
 @api_view(["GET"])
@@ -1700,10 +2037,15 @@ def backup_database(request):
     Multi-user mode (when 'users' is in the models param, staff only):
       exports all non-staff/non-superuser accounts and their associated data,
       with a 'user_id' field on every entity record for restore remapping.
-    """
-    from django.core.serializers.json import DjangoJSONEncoder
-    from django.http import HttpResponse
 
+    The document is encoded incrementally from queryset iterators and
+    streamed, optionally compressed (``?compress=gzip|zstd``). Columnar
+    backups are always compressed.
+
+    Every backup is recorded as a BackupManifest whose id is written to the
+    header as ``backup_id``. ``?since=<backup_id or timestamp>`` exports an
+    incremental backup against it; restore applies it on top of its base.
+    """
     user = request.user
 
     # Determine which entities to include
@@ -1719,6 +2061,47 @@ def backup_database(request):
                 status=status.HTTP_400_BAD_REQUEST,
             )
 
+    backup_format = request.query_params.get("backup_format", "json").strip().lower()
+    if backup_format not in BACKUP_FORMATS:
+        return Response(
+            {"error": f"backup_format must be one of: {', '.join(BACKUP_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    compress = request.query_params.get("compress", "").strip().lower()
+    if not compress and backup_format == "columnar":
+        compress = "gzip"
+    if compress and compress not in BACKUP_COMPRESSIONS:
+        return Response(
+            {"error": f"compress must be one of: {', '.join(BACKUP_COMPRESSIONS)}"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if compress == "zstd" and not ZSTD_AVAILABLE:
+        return Response(
+            {"error": "zstd compression is not available on this server"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    parent = None
+    since_param = request.query_params.get("since", "").strip()
+    if since_param.isdigit():
+        parent = BackupManifest.objects.filter(user=user, pk=since_param).first()
+        if parent is None:
+            return Response(
+                {"error": f"Backup {since_param} not found"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        since = parent.taken_at
+    elif since_param:
+        since = _parse_since(since_param)
+        if since is None:
+            return Response(
+                {"error": "since must be a backup id or an ISO 8601 date/timestamp"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    else:
+        since = None
+
     # Multi-user mode requires staff privilege
     multi_user_mode = "users" in include
     if multi_user_mode and not user.is_staff:
@@ -1727,47 +2110,179 @@ def backup_database(request):
             status=status.HTTP_403_FORBIDDEN,
         )
 
-    backup_data: dict = {
+    manifest = BackupManifest.objects.create(
+        user=user,
+        parent=parent,
+        since=since,
+        taken_at=timezone.now(),
+        entities=sorted(include),
+    )
+    header = {
         "version": BACKUP_VERSION,
-        "exported_at": datetime.now().isoformat(),
+        "exported_at": manifest.taken_at.isoformat(),
         "username": user.username,
         "multi_user": multi_user_mode,
+        "backup_id": manifest.pk,
+        "parent_id": parent.pk if parent else None,
+        "since": since.isoformat() if since else None,
     }
+    stream = encode_backup(
+        header, backup_sections(user, include, since), backup_format, compress
+    )
+    filename = (
+        f"backup_{user.username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        f"{'_incremental' if since else ''}.{backup_format}"
+    )
+    if compress:
+        _, content_type, extension = BACKUP_COMPRESSIONS[compress]
+        filename += extension
+    else:
+        _, content_type = BACKUP_FORMATS[backup_format]
+    response = StreamingHttpResponse(stream, content_type=content_type)
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    response["X-Backup-Id"] = str(manifest.pk)
+    return response
+
+
+def backup_sections(
+    user: Any, include: set[str], since: datetime | None = None
+) -> Iterator[tuple[str, BackupRows]]:
+    """Yield the ``(entity_key, rows)`` sections of a backup of ``include``.
+
+    Single-user mode exports ``user``'s own data. With 'users' in
+    ``include`` (multi-user mode) all non-staff/non-superuser accounts are
+    exported together with their data, with a 'user_id' on every record.
+    ``since`` makes the backup incremental. Every section is read from one
+    database snapshot, concurrently where supported.
+    """
+    multi_user_mode = "users" in include
+    sections: list[Iterable[tuple[str, BackupRows]]] = []
 
     # In multi-user mode query all regular users; otherwise scope to requester
     if multi_user_mode:
         target_users_qs = user_model.objects.filter(is_staff=False, is_superuser=False)
         user_filter: dict = {"user__in": target_users_qs}
-        backup_data["users"] = list(
-            target_users_qs.values(
-                "id",
-                "username",
-                "email",
-                "first_name",
-                "last_name",
-                "is_active",
-                "date_joined",
-            )
-        )
+        users = target_users_qs.values(
+            "id",
+            "username",
+            "email",
+            "first_name",
+            "last_name",
+            "is_active",
+            "date_joined",
+        ).iterator(chunk_size=BACKUP_CHUNK_SIZE)
+        sections.append([("users", users)])
     else:
         user_filter = {"user": user}
 
-    backup_data.update(
-        backup_all(
+    changed_since = since - INCREMENTAL_OVERLAP if since else None
+    sections.append(
+        iter_backup_sections(
             user,
             include=include,
             multi_user_mode=multi_user_mode,
             user_filter=user_filter,
+            since=changed_since,
         )
     )
+    if since:
+        tombstones = iter_tombstones(user_filter, include, changed_since)
+        sections.append([(DELETED_SECTION, tombstones)])
+
+    return consistent_sections(chain.from_iterable(sections))
 
-    filename = f"backup_{user.username}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    response = HttpResponse(
-        json.dumps(backup_data, indent=2, cls=DjangoJSONEncoder),
-        content_type="application/json",
+
+def encode_backup(
+    header: dict[str, Any],
+    sections: Iterable[tuple[str, BackupRows]],
+    backup_format: str,
+    compress: str = "",
+) -> Iterator[bytes]:
+    """Encode backup sections as ``backup_format``, optionally compressed."""
+    writer, _ = BACKUP_FORMATS[backup_format]
+    stream = writer(header, sections)
+    if compress:
+        stream = get_backup_compressor(backup_format, compress)(stream)
+    return stream
+
+
+def _parse_since(value: str) -> datetime | None:
+    """Parse an ISO 8601 date or timestamp; naive values use the local zone."""
+    try:
+        parsed = parse_datetime(value)
+        if parsed is None:
+            day = parse_date(value)
+            parsed = datetime.combine(day, time.min) if day else None
+    except ValueError:
+        return None
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def _is_line_delimited(head: bytes) -> bool:
+    """Whether a backup starting with ``head`` has a one-line header (NDJSON
+    or columnar)."""
+    line, newline, _ = head.partition(b"\n")
+    if not newline:
+        return False
+    try:
+        return isinstance(json.loads(line), dict)
+    except ValueError:
+        return False
+
+
+def _too_large(limit: int, line_delimited: bool) -> Response:
+    hint = "" if line_delimited else ", use an .ndjson or .columnar backup"
+    return Response(
+        {
+            "error": f"File too large (max {limit // (1024 * 1024)} MB uncompressed{hint})"
+        },
+        status=status.HTTP_400_BAD_REQUEST,
     )
-    response["Content-Disposition"] = f'attachment; filename="{filename}"'
-    return response
+
+
+def _load_backup_upload(uploaded_file) -> Any:
+    """Parse an uploaded backup file, or return an error Response.
+
+    Compression (gzip or zstd) and layout (JSON document, NDJSON or columnar)
+    are detected from the content. JSON documents are parsed in memory and
+    capped at BACKUP_MAX_JSON_SIZE; line-delimited backups are read section
+    by section from disk (see NDJSONBackupReader) and capped at
+    settings.BACKUP_MAX_STREAMED_SIZE. Both caps apply to the decompressed
+    content, and decompression stops as soon as one is exceeded.
+    """
+    if not uploaded_file.name.endswith(BACKUP_UPLOAD_SUFFIXES):
+        return Response(
+            {
+                "error": (
+                    "File must be a .json, .ndjson or .columnar backup file, "
+                    "optionally compressed (.gz, .zst)"
+                )
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        head = read_decompressed_head(uploaded_file.file, BACKUP_HEADER_SNIFF_SIZE)
+        line_delimited = _is_line_delimited(head)
+        limit = (
+            settings.BACKUP_MAX_STREAMED_SIZE
+            if line_delimited
+            else BACKUP_MAX_JSON_SIZE
+        )
+        if uploaded_file.size > limit:
+            return _too_large(limit, line_delimited)
+        fileobj = open_decompressed(uploaded_file.file, max_bytes=limit)
+        if line_delimited:
+            return NDJSONBackupReader(fileobj)
+        return json.loads(fileobj.read().decode("utf-8"))
+    except DecompressedSizeError:
+        return _too_large(limit, line_delimited)
+    except (OSError, EOFError, UnicodeDecodeError, ValueError):
+        return Response(
+            {"error": "Invalid JSON file"}, status=status.HTTP_400_BAD_REQUEST
+        )
 
 
 @extend_schema(
@@ -1775,7 +2290,15 @@ def backup_database(request):
         "multipart/form-data": {
             "type": "object",
             "properties": {
-                "file": {"type": "string", "format": "binary"},
+                "file": {
+                    "type": "array",
+                    "items": {"type": "string", "format": "binary"},
+                    "description": (
+                        "Backup file; to restore incremental backups, upload "
+                        "their full base backup and every incremental backup "
+                        "taken after it"
+                    ),
+                },
                 "replace_existing": {
                     "type": "boolean",
                     "description": "If true, deletes all existing user data before restoring",
@@ -1794,7 +2317,15 @@ def backup_database(request):
         },
         400: {"type": "object", "properties": {"error": {"type": "string"}}},
     },
-    description="Restore user data from a previously exported JSON backup file.",
+    description=(
+        "Restore user data from a previously exported backup file: .json "
+        "(max 50 MB uncompressed), .ndjson or .columnar, optionally gzip "
+        "(.gz) or zstd (.zst) compressed, at most BACKUP_MAX_UPLOAD bytes as "
+        "uploaded. The format is detected from the "
+        "content. NDJSON and columnar backups are streamed from disk and are "
+        "capped by the BACKUP_MAX_STREAMED_SIZE setting. Incremental "
+        "backups are applied on top of their base backup in order."
+    ),
 )
 @api_view(["POST"])
 @parser_classes([MultiPartParser, FormParser])
@@ -1802,7 +2333,8 @@ def backup_database(request):
 @throttle_classes([BulkOperationThrottle])
 def restore_database(request):
     """
-    Restore user data from a JSON backup file.
+    Restore user data from a JSON, NDJSON or columnar backup file (optionally
+    gzip or zstd compressed).
 
     Single-user mode (backup has no 'users' key): all entities are restored
     under the authenticated user (same as before).
@@ -1811,41 +2343,45 @@ def restore_database(request):
     missing regular users from the backup, then restores every entity under
     the correct owner using the user_id field embedded in the backup.
 
+    Several files may be uploaded: a full backup and the incremental
+    backups taken after it are merged into the latest state before restoring.
+
     Optionally replaces all existing user data when replace_existing=true.
     """
-    if "file" not in request.FILES:
+    uploaded_files = request.FILES.getlist("file")
+    if not uploaded_files:
         return Response(
             {"error": "No file provided"}, status=status.HTTP_400_BAD_REQUEST
         )
-
-    uploaded_file = request.FILES["file"]
-
-    if not uploaded_file.name.endswith(".json"):
-        return Response(
-            {"error": "File must be a .json backup file"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
-
-    max_size = 50 * 1024 * 1024  # 50 MB
-    if uploaded_file.size > max_size:
+    if sum(f.size for f in uploaded_files) > settings.BACKUP_MAX_UPLOAD:
         return Response(
-            {"error": "File too large (max 50 MB)"},
+            {
+                "error": (
+                    "Upload too large (max "
+                    f"{settings.BACKUP_MAX_UPLOAD // (1024 * 1024)} MB)"
+                )
+            },
             status=status.HTTP_400_BAD_REQUEST,
         )
 
-    try:
-        raw = uploaded_file.read().decode("utf-8")
-        data = json.loads(raw)
-    except (UnicodeDecodeError, json.JSONDecodeError):
-        return Response(
-            {"error": "Invalid JSON file"}, status=status.HTTP_400_BAD_REQUEST
-        )
+    documents = []
+    for uploaded_file in uploaded_files:
+        data = _load_backup_upload(uploaded_file)
+        if isinstance(data, Response):
+            return data
+        if "version" not in data or not any(k in data for k in BACKUP_ENTITIES):
+            return Response(
+                {"error": "Invalid backup format: missing required fields"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        documents.append(data)
 
-    if "version" not in data or not any(k in data for k in BACKUP_ENTITIES):
-        return Response(
-            {"error": "Invalid backup format: missing required fields"},
-            status=status.HTTP_400_BAD_REQUEST,
-        )
+    # A base backup followed by incremental backups is restored as one
+    if len(documents) > 1 or documents[0].get("since"):
+        try:
+            data = merge_backup_chain(documents)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
 
     replace_existing = str(request.data.get("replace_existing", "false")).lower() in (
         "true",
@@ -1867,6 +2403,13 @@ def restore_database(request):
         summary = restore_all(request.user, data, clear_existing=replace_existing)
         return Response({"message": "Backup restored successfully", "summary": summary})
 
+    except (ValueError, KeyError, TypeError):
+        # Malformed records in a streamed backup surface only while restoring
+        logger.warning("Malformed backup file", exc_info=True)
+        return Response(
+            {"error": "Invalid backup format: malformed records"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except Exception:
         logger.exception("Error restoring backup")
         return Response(
@@ -1875,6 +2418,45 @@ def restore_database(request):
         )
 
 
+MAX_INCOME_EXPENSE_YEARS = 10
+INCOME_EXPENSE_BREAKDOWNS = {"account": "accounts", "category": "categories"}
+
+
+def _income_expense_rows(user, date_range, breakdown):
+    """Aggregate income/expenses per month in a single grouped query.
+
+    Rows are grouped by month plus the requested breakdown dimensions, so
+    per-account and per-category figures come from the same scan as the
+    monthly totals and are rolled up in Python.
+    """
+    group_fields = ["month"]
+    if "account" in breakdown:
+        group_fields += ["account_id", "account__name"]
+    if "category" in breakdown:
+        group_fields += ["category_id", "category__name"]
+
+    return (
+        Transaction.objects.filter(user=user, **date_range.as_filter())
+        .annotate(month=TruncMonth("date"))
+        .values(*group_fields)
+        .annotate(
+            income=Coalesce(Sum("amount", filter=Q(amount__gt=0)), Decimal("0.00")),
+            expenses=Coalesce(Sum("amount", filter=Q(amount__lte=0)), Decimal("0.00")),
+        )
+        .order_by()
+    )
+
+
+def _empty_totals() -> dict[str, Decimal]:
+    return {"income": Decimal("0.00"), "expenses": Decimal("0.00")}
+
+
+def _totals_entry(totals: dict[str, Decimal]) -> dict[str, Decimal]:
+    income = totals["income"]
+    expenses = abs(totals["expenses"])
+    return {"income": income, "expenses": expenses, "net": income - expenses}
+
+
 @extend_schema(
     tags=["Transactions"],
     parameters=[
@@ -1884,7 +2466,42 @@ def restore_database(request):
             location=OpenApiParameter.QUERY,
             description="Year to retrieve monthly income vs expenses for (defaults to current year)",
             required=False,
-        )
+        ),
+        OpenApiParameter(
+            name="start_year",
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "First year of a multi-year range (overrides 'year'). "
+                f"At most {MAX_INCOME_EXPENSE_YEARS} years per request."
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="end_year",
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description=(
+                "Last year of the range (defaults to the current year, or "
+                f"the last of {MAX_INCOME_EXPENSE_YEARS} years from start_year)"
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="breakdown",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description="Comma-separated breakdowns to include: account, category",
+            required=False,
+        ),
+        OpenApiParameter(
+            name="compare",
+            type=OpenApiTypes.STR,
+            location=OpenApiParameter.QUERY,
+            description="Set to 'yoy' to add previous-year comparison columns",
+            enum=["yoy"],
+            required=False,
+        ),
     ],
     responses={
         200: {
@@ -1896,6 +2513,23 @@ def restore_database(request):
                     "income": {"type": "number"},
                     "expenses": {"type": "number"},
                     "net": {"type": "number"},
+                    "cumulative_net": {"type": "number"},
+                    "previous_year": {
+                        "type": "object",
+                        "description": "Present when compare=yoy",
+                    },
+                    "net_change": {
+                        "type": "number",
+                        "description": "Present when compare=yoy",
+                    },
+                    "accounts": {
+                        "type": "array",
+                        "description": "Present when breakdown includes account",
+                    },
+                    "categories": {
+                        "type": "array",
+                        "description": "Present when breakdown includes category",
+                    },
                 },
             },
         },
@@ -1904,67 +2538,120 @@ def restore_database(request):
 )
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
-@throttle_classes([BulkOperationThrottle])
 def monthly_income_expenses(request):
-    """Get monthly income vs expenses for a given year.
+    """Get monthly income vs expenses for one year or a range of years.
 
-    Returns a 12-element array with income, expenses (positive), and net
-    for each month. Months with no transactions are filled with zeros.
+    Returns one entry per month in the range with income, expenses
+    (positive), net and the running cumulative net. Months with no
+    transactions are filled with zeros. Optional per-account/per-category
+    breakdowns and year-over-year columns are computed from the same grouped
+    query; for YoY the scan simply starts one year earlier.
     """
-    year_param = request.query_params.get("year", "")
-    if year_param:
+
+    years: dict[str, int | None] = {}
+    for name in ("year", "start_year", "end_year"):
+        value = request.query_params.get(name, "")
+        if not value:
+            years[name] = None
+            continue
         try:
-            year = int(year_param)
+            years[name] = int(value)
         except ValueError:
             return Response(
                 {"error": "Invalid year parameter. Must be a valid integer."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        if not (1900 <= year <= 2100):
+        if not (1900 <= years[name] <= 2100):
             return Response(
                 {"error": "Year must be between 1900 and 2100."},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-    else:
-        year = timezone.now().year
 
-    rows = (
-        Transaction.objects.filter(user=request.user, date__year=year)
-        .annotate(month=TruncMonth("date"))
-        .values("month")
-        .annotate(
-            income=Coalesce(Sum("amount", filter=Q(amount__gt=0)), Decimal("0.00")),
-            expenses=Coalesce(Sum("amount", filter=Q(amount__lte=0)), Decimal("0.00")),
+    year, start_year, end_year = years["year"], years["start_year"], years["end_year"]
+    current_year = timezone.now().year
+    if start_year is None:
+        start_year = end_year = year or current_year
+    elif end_year is None:
+        # Up to the current year, within the span allowed per request
+        end_year = min(
+            max(start_year, current_year), start_year + MAX_INCOME_EXPENSE_YEARS - 1
         )
-        .order_by("month")
+
+    if start_year > end_year:
+        return Response(
+            {"error": "start_year must not be after end_year."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if end_year - start_year + 1 > MAX_INCOME_EXPENSE_YEARS:
+        return Response(
+            {"error": f"At most {MAX_INCOME_EXPENSE_YEARS} years per request."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    breakdown = {
+        b.strip()
+        for b in request.query_params.get("breakdown", "").lower().split(",")
+        if b.strip()
+    }
+    if not breakdown <= INCOME_EXPENSE_BREAKDOWNS.keys():
+        return Response(
+            {"error": "Invalid breakdown. Must be any of: account, category"},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    compare_yoy = request.query_params.get("compare", "").lower() == "yoy"
+
+    scan_start_year = start_year - 1 if compare_yoy else start_year
+    date_range = DateRange(
+        fiscal_year_range(scan_start_year, start_month=1).start,
+        fiscal_year_range(end_year, start_month=1).end,
     )
 
-    # Build a lookup keyed by month number
-    data_by_month: dict[int, dict] = {}
-    for row in rows:
-        month_num = row["month"].month
-        income = float(row["income"])
-        expenses = abs(float(row["expenses"]))
-        data_by_month[month_num] = {
-            "income": income,
-            "expenses": expenses,
-            "net": income - expenses,
-        }
+    # Roll the grouped rows up into month totals and breakdown buckets
+    totals_by_month: dict[tuple[int, int], dict] = defaultdict(_empty_totals)
+    buckets: dict[str, dict[tuple[int, int], dict]] = {
+        key: defaultdict(dict) for key in breakdown
+    }
+    for row in _income_expense_rows(request.user, date_range, breakdown):
+        month_key = (row["month"].year, row["month"].month)
+        month_totals = totals_by_month[month_key]
+        month_totals["income"] += row["income"]
+        month_totals["expenses"] += row["expenses"]
+        for key in breakdown:
+            item_id = row[f"{key}_id"]
+            bucket = buckets[key][month_key].setdefault(
+                item_id,
+                {"id": item_id, "name": row[f"{key}__name"], **_empty_totals()},
+            )
+            bucket["income"] += row["income"]
+            bucket["expenses"] += row["expenses"]
 
-    # Fill in all 12 months with zeros where there are no transactions
     result = []
-    for month_num in range(1, 13):
-        month_str = f"{year:04d}-{month_num:02d}"
-        entry = data_by_month.get(
-            month_num, {"income": 0.0, "expenses": 0.0, "net": 0.0}
-        )
-        result.append(
-            {
-                "month": month_str,
-                "income": entry["income"],
-                "expenses": entry["expenses"],
-                "net": entry["net"],
+    cumulative_net = ZERO
+    for year_num in range(start_year, end_year + 1):
+        for month_num in range(1, 13):
+            month_key = (year_num, month_num)
+            entry = {
+                "month": f"{year_num:04d}-{month_num:02d}",
+                **_totals_entry(totals_by_month.get(month_key, _empty_totals())),
             }
-        )
+            cumulative_net += entry["net"]
+            entry["cumulative_net"] = cumulative_net
+
+            if compare_yoy:
+                previous = _totals_entry(
+                    totals_by_month.get((year_num - 1, month_num), _empty_totals())
+                )
+                entry["previous_year"] = previous
+                entry["net_change"] = entry["net"] - previous["net"]
+
+            for key in sorted(breakdown):
+                entry[INCOME_EXPENSE_BREAKDOWNS[key]] = [
+                    {"id": item["id"], "name": item["name"], **_totals_entry(item)}
+                    for item in sorted(
+                        buckets[key].get(month_key, {}).values(),
+                        key=lambda item: item["name"] or "",
+                    )
+                ]
+            result.append(entry)
 
     return Response(result)
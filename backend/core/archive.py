@@ -0,0 +1,148 @@
+"""
+Server-side backup snapshots in a Django storage backend.
+
+Snapshots are written to the ``"backups"`` entry of ``settings.STORAGES`` (a
+local directory by default) under one directory per scope, e.g.
+``system/snapshot-20260101T020000Z.columnar.gz``. Each snapshot gets a
+``.sha256`` sidecar in ``sha256sum`` format that is checked right after the
+upload and by ``verify_snapshot``. ``prune_snapshots`` keeps the newest
+snapshot of each of the last N days and M ISO weeks.
+"""
+
+import hashlib
+import tempfile
+from collections.abc import Iterable
+from datetime import UTC, datetime
+
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import Storage, storages
+
+BACKUP_STORAGE = "backups"
+CHECKSUM_SUFFIX = ".sha256"
+SNAPSHOT_PREFIX = "snapshot-"
+_TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+_READ_SIZE = 1024 * 1024
+
+
+def get_backup_storage() -> Storage:
+    return storages[BACKUP_STORAGE]
+
+
+def snapshot_name(scope: str, taken_at: datetime, extension: str) -> str:
+    """Storage path of a snapshot, e.g. ``users/42/snapshot-...columnar.gz``."""
+    stamp = taken_at.astimezone(UTC).strftime(_TIMESTAMP_FORMAT)
+    return f"{scope}/{SNAPSHOT_PREFIX}{stamp}{extension}"
+
+
+def snapshot_time(name: str) -> datetime | None:
+    """Parse the timestamp out of a snapshot file name, or None."""
+    basename = name.rsplit("/", 1)[-1]
+    if not basename.startswith(SNAPSHOT_PREFIX) or basename.endswith(CHECKSUM_SUFFIX):
+        return None
+    stamp = basename[len(SNAPSHOT_PREFIX) :].split(".", 1)[0]
+    try:
+        return datetime.strptime(stamp, _TIMESTAMP_FORMAT).replace(tzinfo=UTC)
+    except ValueError:
+        return None
+
+
+def write_snapshot(
+    name: str, chunks: Iterable[bytes], storage: Storage | None = None
+) -> tuple[str, str]:
+    """Store the streamed ``chunks`` under ``name`` with a checksum sidecar.
+
+    The stream is spooled to a temporary file while it is hashed, so memory
+    stays flat, then uploaded and read back to verify the stored copy.
+    Returns the stored name and its SHA-256 hex digest.
+
+    Raises OSError if the stored copy does not match the checksum.
+    """
+    storage = storage or get_backup_storage()
+    digest = hashlib.sha256()
+    with tempfile.TemporaryFile() as spooled:
+        for chunk in chunks:
+            digest.update(chunk)
+            spooled.write(chunk)
+        spooled.seek(0)
+        name = storage.save(name, File(spooled, name=name))
+
+    checksum = digest.hexdigest()
+    basename = name.rsplit("/", 1)[-1]
+    storage.save(
+        name + CHECKSUM_SUFFIX, ContentFile(f"{checksum}  {basename}\n".encode())
+    )
+    if not verify_snapshot(name, storage):
+        delete_snapshot(name, storage)
+        raise OSError(f"Stored snapshot {name} does not match its checksum")
+    return name, checksum
+
+
+def verify_snapshot(name: str, storage: Storage | None = None) -> bool:
+    """Whether the stored snapshot matches its ``.sha256`` sidecar."""
+    storage = storage or get_backup_storage()
+    try:
+        with storage.open(name + CHECKSUM_SUFFIX, "rb") as sidecar:
+            expected = sidecar.read().decode().split(maxsplit=1)[0]
+        digest = hashlib.sha256()
+        with storage.open(name, "rb") as snapshot:
+            while chunk := snapshot.read(_READ_SIZE):
+                digest.update(chunk)
+    except (OSError, IndexError, UnicodeDecodeError):
+        return False
+    return digest.hexdigest() == expected
+
+
+def delete_snapshot(name: str, storage: Storage | None = None) -> None:
+    storage = storage or get_backup_storage()
+    storage.delete(name)
+    storage.delete(name + CHECKSUM_SUFFIX)
+
+
+def list_snapshots(scope: str, storage: Storage | None = None) -> list[str]:
+    """Snapshot names stored for ``scope``, oldest first."""
+    storage = storage or get_backup_storage()
+    try:
+        _, files = storage.listdir(scope)
+    except FileNotFoundError:
+        return []
+    names = [f"{scope}/{name}" for name in files if snapshot_time(name)]
+    return sorted(names, key=snapshot_time)
+
+
+def retained_snapshots(names: Iterable[str], daily: int, weekly: int) -> set[str]:
+    """Select the snapshots to keep.
+
+    That is the newest snapshot of each of the ``daily`` most recent days and
+    of each of the ``weekly`` most recent ISO weeks that have one. The newest
+    snapshot is always kept.
+    """
+    newest_first = sorted(names, key=snapshot_time, reverse=True)
+    keep: set[str] = set(newest_first[:1])
+    for buckets, period in (
+        (daily, lambda taken_at: taken_at.date()),
+        (weekly, lambda taken_at: taken_at.isocalendar()[:2]),
+    ):
+        seen = set()
+        for name in newest_first:
+            bucket = period(snapshot_time(name))
+            if bucket in seen:
+                continue
+            if len(seen) == buckets:
+                break
+            seen.add(bucket)
+            keep.add(name)
+    return keep
+
+
+def prune_snapshots(
+    scope: str, daily: int, weekly: int, storage: Storage | None = None
+) -> list[str]:
+    """Delete the snapshots of ``scope`` outside the retention policy."""
+    storage = storage or get_backup_storage()
+    names = list_snapshots(scope, storage)
+    keep = retained_snapshots(names, daily, weekly)
+    deleted = [name for name in names if name not in keep]
+    for name in deleted:
+        delete_snapshot(name, storage)
+    return deleted
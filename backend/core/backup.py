@@ -1,9 +1,37 @@
-from collections.abc import Callable
-from typing import Any
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from datetime import datetime, timedelta
+from itertools import chain, pairwise, repeat
+from typing import IO, Any
 
-from django.db import transaction
+from django.db import models, transaction
+from django.db.models.functions import Coalesce, Least
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 
-BackupProvider = Callable[..., dict[str, list[dict[str, Any]]]]
+from .renderers import json_dumps, json_loads
+from .snapshot import consistent_sections
+from .streaming import iter_chunks
+
+# Rows fetched per round trip by provider querysets and encoded per write
+BACKUP_CHUNK_SIZE = 2000
+# Rows inserted per bulk_create statement during restore
+RESTORE_BATCH_SIZE = 1000
+# NDJSON backups mark the start of each entity section with {"section": key}
+SECTION_KEY = "section"
+# Columnar backups set {"format": "columnar"} in the header and list the
+# section's column names in its marker: {"section": key, "columns": [...]}
+COLUMNAR_FORMAT = "columnar"
+COLUMNS_KEY = "columns"
+_SECTION_PREFIX = b'{"' + SECTION_KEY.encode() + b'":'
+# Incremental backups list deleted rows as {"entity": key, "object_id": id}
+DELETED_SECTION = "deleted"
+# Incremental backups reach back this far before ``since``, so rows saved by a
+# transaction that committed after the previous backup's snapshot are not
+# missed. Rows exported twice are harmless: the later copy wins on restore.
+INCREMENTAL_OVERLAP = timedelta(minutes=5)
+
+BackupRows = Iterable[dict[str, Any]]
+BackupProvider = Callable[..., dict[str, BackupRows]]
 RestoreProvider = Callable[..., dict[str, int]]
 
 _backup_providers: list[tuple[str, BackupProvider]] = []
@@ -30,14 +58,361 @@ def register_backup_provider(
     _restore_providers.append((domain_key, restore_fn))
 
 
-def backup_all(user: Any, **kwargs: Any) -> dict[str, list[dict[str, Any]]]:
-    """Collect backup data from all registered domain providers."""
-    merged: dict[str, list[dict[str, Any]]] = {}
+def iter_backup_sections(user: Any, **kwargs: Any) -> Iterator[tuple[str, BackupRows]]:
+    """Yield ``(entity_key, rows)`` from all registered domain providers.
+
+    Providers return lazy row iterables (``.values().iterator()`` querysets),
+    so nothing is fetched until a section is consumed.
+    """
     for _, backup_fn in _backup_providers:
-        domain_data = backup_fn(user, **kwargs)
-        for key, value in domain_data.items():
-            merged[key] = value
-    return merged
+        yield from backup_fn(user, **kwargs).items()
+
+
+def backup_all(user: Any, **kwargs: Any) -> dict[str, list[dict[str, Any]]]:
+    """Collect backup data from all registered domain providers.
+
+    Entity queries run concurrently from one consistent snapshot where the
+    database supports it (see ``core.snapshot``).
+    """
+    return {
+        key: list(rows)
+        for key, rows in consistent_sections(iter_backup_sections(user, **kwargs))
+    }
+
+
+def iter_tombstones(
+    user_filter: dict[str, Any], entities: Iterable[str], since: datetime
+) -> BackupRows:
+    """Rows deleted from ``entities`` after ``since``, for incremental backups."""
+    from .models import DeletedRecord
+
+    return (
+        DeletedRecord.objects.filter(
+            **user_filter, entity__in=[*entities], deleted_at__gt=since
+        )
+        .values("entity", "object_id")
+        .iterator(chunk_size=BACKUP_CHUNK_SIZE)
+    )
+
+
+def prune_backup_history(keep_full: int, before: datetime) -> tuple[int, int]:
+    """Delete the backup manifests and tombstones no retained backup needs.
+
+    Per user, the ``keep_full`` newest full backups are retained along with
+    every backup taken after the oldest of them. An incremental backup is
+    restored on top of one of those, so older manifests and tombstones
+    (allowing for ``INCREMENTAL_OVERLAP``) are deleted. Nothing newer than
+    ``before``, the oldest stored snapshot, is deleted either: snapshots are
+    full backups too. Returns ``(manifests, tombstones)`` deleted.
+    """
+    from .models import BackupManifest, DeletedRecord
+
+    if keep_full < 1:
+        raise ValueError("At least one full backup per user must be kept")
+
+    full = (
+        BackupManifest.objects.filter(user=models.OuterRef("user"), since=None)
+        .order_by("-taken_at")
+        .values("taken_at")
+    )
+    cutoff = Least(
+        Coalesce(
+            models.Subquery(full[keep_full - 1 : keep_full]),
+            models.Subquery(full.reverse()[:1]),
+            models.Value(before),
+        ),
+        models.Value(before),
+    )
+    with transaction.atomic():
+        tombstones, _ = (
+            DeletedRecord.objects.alias(cutoff=cutoff)
+            .filter(deleted_at__lt=models.F("cutoff") - INCREMENTAL_OVERLAP)
+            .delete()
+        )
+        manifests, _ = (
+            BackupManifest.objects.alias(cutoff=cutoff)
+            .filter(taken_at__lt=models.F("cutoff"))
+            .delete()
+        )
+    return manifests, tombstones
+
+
+def stream_backup_json(
+    header: dict[str, Any], sections: Iterable[tuple[str, BackupRows]]
+) -> Iterator[bytes]:
+    """Encode a backup document incrementally.
+
+    Produces the same JSON object as ``{**header, **dict(sections)}`` with
+    one record per line, holding at most ``BACKUP_CHUNK_SIZE`` rows in memory
+    at a time. Decimals are written as strings to keep full precision.
+    """
+    separator = b"{\n"
+    for key, value in header.items():
+        yield separator + b"  " + json_dumps(key) + b": " + _encode(value)
+        separator = b",\n"
+
+    for key, rows in sections:
+        yield separator + b"  " + json_dumps(key) + b": ["
+        row_separator = b"\n"
+        for chunk in iter_chunks(rows, BACKUP_CHUNK_SIZE):
+            yield row_separator + b",\n".join(b"    " + _encode(row) for row in chunk)
+            row_separator = b",\n"
+        yield b"]" if row_separator == b"\n" else b"\n  ]"
+        separator = b",\n"
+
+    yield b"{}\n" if separator == b"{\n" else b"\n}\n"
+
+
+def stream_backup_ndjson(
+    header: dict[str, Any], sections: Iterable[tuple[str, BackupRows]]
+) -> Iterator[bytes]:
+    """Encode a backup as NDJSON: one JSON value per line.
+
+    The first line is the header object. Each section starts with a
+    ``{"section": "<entity>"}`` marker line followed by one line per record.
+    Unlike the JSON document, this format can be restored without parsing the
+    whole file (see ``NDJSONBackupReader``).
+    """
+    yield _encode(header) + b"\n"
+    for key, rows in sections:
+        yield _encode({SECTION_KEY: key}) + b"\n"
+        for chunk in iter_chunks(rows, BACKUP_CHUNK_SIZE):
+            yield b"".join(_encode(row) + b"\n" for row in chunk)
+
+
+def stream_backup_columnar(
+    header: dict[str, Any], sections: Iterable[tuple[str, BackupRows]]
+) -> Iterator[bytes]:
+    """Encode a backup as column-oriented row groups, one JSON value per line.
+
+    Laid out like the NDJSON backup, but each section marker carries the
+    column names and is followed by one line per ``BACKUP_CHUNK_SIZE`` rows
+    holding an array of values per column. Keys are written once per section
+    instead of once per record, which also compresses much better.
+    """
+    yield _encode({**header, "format": COLUMNAR_FORMAT}) + b"\n"
+    for key, rows in sections:
+        chunks = iter_chunks(rows, BACKUP_CHUNK_SIZE)
+        first = next(chunks, [])
+        columns = [*first[0]] if first else []
+        yield _encode({SECTION_KEY: key, COLUMNS_KEY: columns}) + b"\n"
+        for chunk in chain([first] if first else [], chunks):
+            yield _encode([[row[name] for row in chunk] for name in columns]) + b"\n"
+
+
+def _encode(value: Any) -> bytes:
+    return json_dumps(value, decimals_as_strings=True)
+
+
+class NDJSONBackupReader(Mapping):
+    """Read-only mapping over an NDJSON or columnar backup in a seekable file.
+
+    Only the header and the byte offset of each section are read up front.
+    Looking up a section returns an iterable that parses its records from
+    the file in batches as it is consumed, so restore providers are fed
+    entity by entity and memory does not grow with the file size. Columnar
+    row groups are expanded back into one dict per record.
+
+    Raises ValueError if the file does not start with a JSON header object.
+    """
+
+    def __init__(self, fileobj: IO[bytes]) -> None:
+        self._file = fileobj
+        self._file.seek(0)
+        header = json_loads(self._file.readline() or b"null")
+        if not isinstance(header, dict):
+            raise ValueError("NDJSON backup must start with a header object")
+        self._header: dict[str, Any] = header
+        self._sections: dict[str, tuple[int, list[str] | None]] = {}
+        while line := self._file.readline():
+            if line.startswith(_SECTION_PREFIX):
+                marker = json_loads(line)
+                self._sections[marker[SECTION_KEY]] = (
+                    self._file.tell(),
+                    marker.get(COLUMNS_KEY),
+                )
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._sections:
+            return _NDJSONSection(self, *self._sections[key])
+        return self._header[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._header
+        yield from (key for key in self._sections if key not in self._header)
+
+    def __len__(self) -> int:
+        return len(self._header.keys() | self._sections.keys())
+
+    def _read_lines(self, offset: int, limit: int) -> tuple[list[bytes], int, bool]:
+        """Read up to ``limit`` record lines from ``offset``.
+
+        Returns the lines, the offset to continue from and whether the section
+        ended. Each call seeks first, so several sections can be iterated
+        alternately over the same file.
+        """
+        self._file.seek(offset)
+        lines = []
+        while len(lines) < limit:
+            line = self._file.readline()
+            if not line or line.startswith(_SECTION_PREFIX):
+                return lines, offset, True
+            lines.append(line)
+            offset = self._file.tell()
+        return lines, offset, False
+
+
+class _NDJSONSection:
+    """Re-iterable records of one ``NDJSONBackupReader`` section."""
+
+    def __init__(
+        self,
+        reader: NDJSONBackupReader,
+        offset: int,
+        columns: list[str] | None = None,
+    ) -> None:
+        self._reader = reader
+        self._offset = offset
+        self._columns = columns
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        # A columnar line already holds a whole chunk of records
+        batch_size = RESTORE_BATCH_SIZE if self._columns is None else 1
+        offset, done = self._offset, False
+        while not done:
+            lines, offset, done = self._reader._read_lines(offset, batch_size)
+            for line in lines:
+                if not line.strip():
+                    continue
+                if self._columns is None:
+                    yield self._record(json_loads(line))
+                else:
+                    yield from self._row_group(json_loads(line))
+
+    @staticmethod
+    def _record(record: Any) -> dict[str, Any]:
+        if not isinstance(record, dict):
+            raise ValueError("NDJSON backup records must be objects")
+        return record
+
+    def _row_group(self, values: Any) -> list[dict[str, Any]]:
+        if (
+            not isinstance(values, list)
+            or len(values) != len(self._columns)
+            or len({len(column) for column in values}) > 1
+        ):
+            raise ValueError("Columnar backup row groups must match the columns")
+        rows = len(values[0]) if values else 0
+        # map() keeps the per-record work in C; about 2x a dict comprehension
+        return [
+            *map(dict, map(zip, repeat(self._columns, rows), zip(*values, strict=True)))
+        ]
+
+
+def merge_backup_chain(documents: Sequence[Mapping[str, Any]]) -> Mapping[str, Any]:
+    """Combine a full backup with incremental backups taken after it.
+
+    Documents may be given in any order; they are applied by ``exported_at``.
+    The result reads like a single full backup of the latest state: a record
+    is taken from the last backup that contains it, and records deleted by a
+    later backup's tombstones are dropped. Only the IDs found in incremental
+    backups are held in memory, so a large NDJSON base is still streamed.
+
+    Raises ValueError if the first backup is not a full backup, or if an
+    incremental backup starts after the previous one was taken (a gap).
+    """
+    documents = sorted(documents, key=lambda doc: _backup_time(doc, "exported_at"))
+    if documents[0].get("since"):
+        raise ValueError("Incremental backups must be restored with their base")
+    for previous, document in pairwise(documents):
+        if not document.get("since"):
+            raise ValueError("Only the first backup in a chain may be a full backup")
+        if _backup_time(document, "since") > _backup_time(previous, "exported_at"):
+            raise ValueError(
+                "Backup chain has a gap: an incremental backup starts after "
+                "the previous backup was taken"
+            )
+    return _MergedBackup(documents)
+
+
+def _backup_time(document: Mapping[str, Any], key: str) -> datetime:
+    value = parse_datetime(str(document.get(key) or ""))
+    if value is None:
+        raise ValueError(f"Backup is missing a valid '{key}' timestamp")
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+class _MergedBackup(Mapping):
+    """Read-only mapping over a validated backup chain (see merge_backup_chain)."""
+
+    def __init__(self, documents: Sequence[Mapping[str, Any]]) -> None:
+        self._documents = documents
+        self._keys = [
+            *dict.fromkeys(
+                key for doc in documents for key in doc if key != DELETED_SECTION
+            )
+        ]
+
+    def __getitem__(self, key: str) -> Any:
+        values = [doc[key] for doc in self._documents if key in doc]
+        if key == DELETED_SECTION or not values:
+            raise KeyError(key)
+        if key == "since":
+            return None
+        if isinstance(values[0], (list, _NDJSONSection)):
+            return _MergedSection(self._documents, key)
+        return values[-1]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+
+class _MergedSection:
+    """Re-iterable records of one entity across a backup chain."""
+
+    def __init__(self, documents: Sequence[Mapping[str, Any]], key: str) -> None:
+        self._documents = documents
+        self._key = key
+
+    def __iter__(self) -> Iterator[dict[str, Any]]:
+        # IDs each document must skip because a later one updates or deletes them
+        superseded: list[set[Any]] = [set()]
+        later: set[Any] = set()
+        for document in reversed(self._documents[1:]):
+            later.update(row.get("id") for row in document.get(self._key, []))
+            later.update(
+                row["object_id"]
+                for row in document.get(DELETED_SECTION, [])
+                if row.get("entity") == self._key
+            )
+            superseded.append(set(later))
+        superseded.reverse()
+        for document, skip in zip(self._documents, superseded, strict=True):
+            for row in document.get(self._key, []):
+                if row.get("id") not in skip:
+                    yield row
+
+
+def bulk_insert(
+    model: type[models.Model],
+    objs: Iterable[models.Model],
+    batch_size: int = RESTORE_BATCH_SIZE,
+) -> int:
+    """``bulk_create`` ``objs`` in batches and return how many were inserted.
+
+    ``objs`` may be a generator; at most ``batch_size`` instances are held in
+    memory at a time.
+    """
+    inserted = 0
+    for batch in iter_chunks(objs, batch_size):
+        model.objects.bulk_create(batch)
+        inserted += len(batch)
+    return inserted
 
 
 @transaction.atomic
@@ -0,0 +1,255 @@
+"""
+Bulk create, update and delete for ModelViewSets.
+
+``BulkModelMixin`` adds a ``bulk/`` route to a viewset:
+
+- ``POST`` a list of objects: inserted with ``bulk_create``
+- ``PATCH`` a list of partial objects, each with its ``id``: one
+  ``bulk_update`` (``PUT`` is the same with full validation)
+- ``DELETE`` ``{"ids": [...]}``: one queryset delete, which records
+  tombstones for ``TombstoneModel`` rows
+
+Every item is validated by the viewset's serializer with ``many=True``
+before anything is written, and the write runs in one transaction. If any
+item is invalid nothing is written and the response is 400 with ``errors``
+aligned with the request: ``{}`` for a valid item, its errors otherwise.
+
+Objects are written without ``Model.save()`` where the database returns
+the primary keys of inserted rows, so the bulk paths assume, as for every
+model here today, that ``save()`` is not overridden and no model signals
+are connected. Without that (MySQL), created objects are saved one by one
+so the response has their ids. Created objects get ``get_bulk_save_kwargs()``, the
+same extra attributes ``perform_create`` passes to ``serializer.save()``;
+viewsets whose ``perform_create`` does more override
+``perform_bulk_create``.
+"""
+
+from django.db import IntegrityError, connection, transaction
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.response import Response
+
+from .throttles import BulkOperationThrottle
+
+MAX_BULK_ITEMS = 1000
+# Rows per INSERT / UPDATE statement
+BULK_BATCH_SIZE = 500
+
+_BULK_ERROR = {
+    "type": "object",
+    "properties": {
+        "error": {"type": "string"},
+        "errors": {"type": "array", "items": {"type": "object"}},
+    },
+}
+
+
+def _pk(value):
+    """``value`` as an integer primary key, or None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _prefetch_related(child, items):
+    """Resolve ``child``'s primary key related fields for all ``items`` with
+    one query per field instead of one per item.
+
+    Keys that were not found fall through to the field's own lookup, which
+    reports them as usual.
+    """
+    for name, field in child.fields.items():
+        if field.read_only or not isinstance(field, serializers.PrimaryKeyRelatedField):
+            continue
+        pks = {_pk(item.get(name)) for item in items if isinstance(item, dict)}
+        objects = field.get_queryset().in_bulk(pks - {None})
+
+        def to_internal_value(data, objects=objects, lookup=field.to_internal_value):
+            obj = objects.get(_pk(data))
+            return obj if obj is not None else lookup(data)
+
+        field.to_internal_value = to_internal_value
+
+
+class BulkUpdateListSerializer(serializers.ListSerializer):
+    """Validates each item against the instance named by its ``id``.
+
+    ``instance`` is a ``{str(pk): object}`` mapping.
+    """
+
+    def run_child_validation(self, data):
+        pk = _pk(data.get("id")) if isinstance(data, dict) else None
+        instance = self.instance.get(str(pk))
+        if instance is None:
+            raise serializers.ValidationError({"id": ["Not found."]})
+        self.child.instance = instance
+        self.child.initial_data = data
+        return super().run_child_validation(data)
+
+
+class BulkModelMixin:
+    """Adds ``bulk/`` create, update and delete to a ModelViewSet."""
+
+    def get_bulk_save_kwargs(self):
+        return {"user": self.request.user}
+
+    @extend_schema(
+        methods=["POST"],
+        summary="Create objects in bulk",
+        responses={201: OpenApiTypes.OBJECT, 400: _BULK_ERROR},
+    )
+    @extend_schema(
+        methods=["PUT", "PATCH"],
+        summary="Update objects in bulk; each item needs its id",
+        responses={200: OpenApiTypes.OBJECT, 400: _BULK_ERROR},
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        summary="Delete objects in bulk",
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {"ids": {"type": "array", "items": {"type": "integer"}}},
+            }
+        },
+        responses={
+            200: {"type": "object", "properties": {"deleted": {"type": "integer"}}},
+            400: _BULK_ERROR,
+        },
+    )
+    @action(
+        detail=False,
+        methods=["post", "put", "patch", "delete"],
+        pagination_class=None,
+        throttle_classes=[BulkOperationThrottle],
+    )
+    def bulk(self, request):
+        """Create, update or delete up to MAX_BULK_ITEMS objects at once."""
+        if request.method == "DELETE":
+            items = request.data.get("ids") if isinstance(request.data, dict) else None
+        else:
+            items = request.data
+        if not isinstance(items, list) or not items:
+            expected = "ids" if request.method == "DELETE" else "a list of objects"
+            return Response(
+                {"error": f"Expected a non-empty list of {expected}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > MAX_BULK_ITEMS:
+            return Response(
+                {"error": f"At most {MAX_BULK_ITEMS} items per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            with transaction.atomic():
+                if request.method == "POST":
+                    return self._bulk_create(items)
+                if request.method == "DELETE":
+                    return self._bulk_delete(items)
+                return self._bulk_update(items, partial=request.method == "PATCH")
+        except IntegrityError:
+            return Response(
+                {"error": "The objects conflict with existing data or each other"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+    def _invalid(self, errors):
+        return Response(
+            {"error": "Invalid items", "errors": errors},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    def _bulk_response(self, objs, status_code):
+        """Serialize ``objs`` re-read through ``get_queryset`` so that list
+        annotations are present, in request order."""
+        fetched = self.get_queryset().in_bulk(
+            [obj.pk for obj in objs if obj.pk is not None]
+        )
+        objs = [fetched.get(obj.pk, obj) for obj in objs]
+        return Response(self.get_serializer(objs, many=True).data, status=status_code)
+
+    def _bulk_create(self, items):
+        serializer = self.get_serializer(data=items, many=True)
+        _prefetch_related(serializer.child, items)
+        if not serializer.is_valid():
+            return self._invalid(serializer.errors)
+
+        model = self.get_queryset().model
+        extra = self.get_bulk_save_kwargs()
+        objs = self.perform_bulk_create(
+            [model(**attrs, **extra) for attrs in serializer.validated_data]
+        )
+        return self._bulk_response(objs, status.HTTP_201_CREATED)
+
+    def perform_bulk_create(self, objs):
+        """Insert the validated, unsaved ``objs``; the bulk ``perform_create``."""
+        if not connection.features.can_return_rows_from_bulk_insert:
+            # bulk_create() would leave the primary keys unset
+            for obj in objs:
+                obj.save(force_insert=True)
+            return objs
+        return type(objs[0]).objects.bulk_create(objs, batch_size=BULK_BATCH_SIZE)
+
+    def _bulk_update(self, items, partial):
+        ids = [
+            _pk(item.get("id")) if isinstance(item, dict) else None for item in items
+        ]
+        known = [pk for pk in ids if pk is not None]
+        if len(set(known)) < len(known):
+            return Response(
+                {"error": "Each object may only be updated once per request"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        queryset = self.get_queryset()
+        serializer = BulkUpdateListSerializer(
+            child=self.get_serializer(partial=partial),
+            instance={str(pk): obj for pk, obj in queryset.in_bulk(known).items()},
+            data=items,
+            partial=partial,
+            context=self.get_serializer_context(),
+        )
+        _prefetch_related(serializer.child, items)
+        if not serializer.is_valid():
+            return self._invalid(serializer.errors)
+
+        fields = set()
+        objs = []
+        for pk, attrs in zip(ids, serializer.validated_data, strict=True):
+            obj = serializer.instance[str(pk)]
+            for name, value in attrs.items():
+                setattr(obj, name, value)
+            fields.update(attrs)
+            objs.append(obj)
+        for field in queryset.model._meta.concrete_fields:
+            if getattr(field, "auto_now", False):
+                for obj in objs:
+                    field.pre_save(obj, add=False)
+                fields.add(field.name)
+
+        queryset.model.objects.bulk_update(
+            objs, sorted(fields), batch_size=BULK_BATCH_SIZE
+        )
+        return self._bulk_response(objs, status.HTTP_200_OK)
+
+    def _bulk_delete(self, ids):
+        ids = [_pk(pk) for pk in ids]
+        queryset = self.get_queryset()
+        found = set(
+            queryset.filter(pk__in=[pk for pk in ids if pk is not None])
+            .order_by()
+            .values_list("pk", flat=True)
+        )
+        errors = [{} if pk in found else {"id": ["Not found."]} for pk in ids]
+        if any(errors):
+            return self._invalid(errors)
+
+        queryset.model.objects.filter(pk__in=found).delete()
+        return Response({"deleted": len(found)})
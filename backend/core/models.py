@@ -0,0 +1,118 @@
+from django.conf import settings
+from django.db import models, transaction
+
+from .streaming import iter_chunks
+
+# Tombstones written per bulk_create statement when a queryset is deleted
+TOMBSTONE_BATCH_SIZE = 1000
+
+
+class BackupManifest(models.Model):
+    """One exported backup; incremental backups point at the one they follow.
+
+    ``since`` is None for a full backup. Otherwise the backup holds the rows
+    created or updated after ``since`` plus tombstones for rows deleted since
+    then, up to ``taken_at``.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="backup_manifests",
+    )
+    parent = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="children",
+        help_text="Backup this incremental backup was taken against",
+    )
+    since = models.DateTimeField(null=True, blank=True)
+    taken_at = models.DateTimeField()
+    entities = models.JSONField(default=list, blank=True)
+
+    class Meta:
+        ordering = ["-taken_at"]
+        indexes = [
+            models.Index(fields=["user", "-taken_at"]),
+        ]
+
+    def __str__(self):
+        kind = "incremental" if self.since else "full"
+        return f"{kind} backup {self.pk} of {self.user} at {self.taken_at}"
+
+    @property
+    def is_incremental(self) -> bool:
+        return self.since is not None
+
+
+class DeletedRecord(models.Model):
+    """Tombstone for a deleted row of a backed-up model.
+
+    Written by ``TombstoneModel`` deletes so that incremental backups can tell
+    restore which rows disappeared. Rows removed by a cascade are not
+    recorded: deleting their parent on restore cascades the same way.
+    """
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="deleted_records",
+    )
+    entity = models.CharField(max_length=50, help_text="Backup section key")
+    object_id = models.BigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "deleted_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} #{self.object_id} deleted at {self.deleted_at}"
+
+
+class TombstoneQuerySet(models.QuerySet):
+    def delete(self):
+        """Delete the rows, recording a tombstone for each in bulk.
+
+        Only primary keys are read, so deletes that Django can run as a
+        single ``DELETE`` still do.
+        """
+        with transaction.atomic(using=self.db):
+            rows = self.values_list("pk", "user_id").iterator(
+                chunk_size=TOMBSTONE_BATCH_SIZE
+            )
+            for batch in iter_chunks(rows, TOMBSTONE_BATCH_SIZE):
+                DeletedRecord.objects.bulk_create(
+                    DeletedRecord(
+                        user_id=user_id,
+                        entity=self.model.backup_entity,
+                        object_id=pk,
+                    )
+                    for pk, user_id in batch
+                )
+            return super().delete()
+
+
+class TombstoneModel(models.Model):
+    """Base for models included in backups: direct deletes leave tombstones.
+
+    Subclasses set ``backup_entity`` to their backup section key and must
+    have a ``user`` foreign key.
+    """
+
+    backup_entity: str = ""
+
+    objects = TombstoneQuerySet.as_manager()
+
+    class Meta:
+        abstract = True
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            DeletedRecord.objects.create(
+                user_id=self.user_id, entity=self.backup_entity, object_id=self.pk
+            )
+            return super().delete(*args, **kwargs)
@@ -0,0 +1,120 @@
+"""
+Fast JSON encoding for API responses and backups.
+
+``orjson`` is used when it is installed; otherwise encoding falls back to the
+standard library with DRF's encoder, so output is the same either way:
+
+- Decimal -> number (as DRF does), or string with ``decimals_as_strings``
+- date / datetime / time -> ISO 8601 with microseconds, UTC datetimes with a
+  ``Z`` suffix (DRF's encoder does not trim them, unlike Django's)
+- timedelta -> its total seconds as a string, as DRF does
+- UUID, lazy translation strings, bytes, querysets and NumPy values ->
+  str / list / number
+"""
+
+import json
+from datetime import timedelta
+from decimal import Decimal
+from typing import Any
+
+from django.db.models import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _float_default(obj: Any) -> Any:
+    """The types orjson does not encode natively, encoded as DRF's
+    ``JSONEncoder`` does."""
+    if isinstance(obj, Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _string_default(obj: Any) -> Any:
+    if isinstance(obj, Decimal):
+        return str(obj)
+    return _float_default(obj)
+
+
+class _StringDecimalEncoder(JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return str(obj)
+        return super().default(obj)
+
+
+def json_dumps(
+    data: Any, *, indent: bool = False, decimals_as_strings: bool = False
+) -> bytes:
+    """Encode ``data`` as UTF-8 JSON bytes.
+
+    Decimals become numbers unless ``decimals_as_strings`` is set, which keeps
+    full precision for data that is read back (e.g. backups). ``indent``
+    pretty-prints with two spaces.
+    """
+    if orjson is not None:
+        option = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        default = _string_default if decimals_as_strings else _float_default
+        return orjson.dumps(data, default=default, option=option)
+
+    encoder = _StringDecimalEncoder if decimals_as_strings else JSONEncoder
+    return json.dumps(
+        data,
+        cls=encoder,
+        ensure_ascii=False,
+        indent=2 if indent else None,
+        separators=(",", ": ") if indent else (",", ":"),
+    ).encode()
+
+
+def json_loads(data: bytes | str) -> Any:
+    """Decode JSON, with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+    """``JSONRenderer`` that encodes with orjson when it is available.
+
+    Requests for indented output (e.g. from the browsable API) and
+    environments without orjson use DRF's stock implementation.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b""
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = json_dumps(data)
+        # Keep DRF's guarantee that output is a strict JavaScript subset.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
@@ -0,0 +1,33 @@
+"""
+Minimal in-process scheduler for periodic management commands.
+
+Commands such as ``backup_snapshots --every 24`` run their job in a loop
+inside a long-lived container, so no cron daemon is needed.
+"""
+
+import logging
+import time
+from collections.abc import Callable
+from typing import NoReturn
+
+from django.db import close_old_connections
+
+
+def run_every(
+    hours: float, job: Callable[[], None], logger: logging.Logger
+) -> NoReturn:
+    """Run ``job`` now and then every ``hours``, forever.
+
+    A failing run is logged and the schedule continues. Database connections
+    are closed between runs so none is held open while sleeping.
+    """
+    interval = hours * 3600
+    while True:
+        started = time.monotonic()
+        try:
+            job()
+        except Exception:
+            logger.exception("Scheduled run failed")
+        finally:
+            close_old_connections()
+        time.sleep(max(0, interval - (time.monotonic() - started)))
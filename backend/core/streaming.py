@@ -0,0 +1,119 @@
+"""
+Helpers for building streamed (chunked) HTTP responses and reading
+compressed uploads.
+"""
+
+import gzip
+import io
+import tempfile
+import zlib
+from collections.abc import Iterable, Iterator
+from itertools import islice
+from typing import IO, Any
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+ZSTD_AVAILABLE = zstandard is not None
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+# Bytes decompressed per read
+DECOMPRESS_CHUNK_SIZE = 1024 * 1024
+
+
+def iter_chunks(iterable: Iterable[Any], size: int) -> Iterator[list[Any]]:
+    """Yield lists of up to ``size`` items from ``iterable``."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def gzip_stream(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+    """Compress a byte stream into a gzip stream, chunk by chunk."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+def zstd_stream(chunks: Iterable[bytes], level: int = 3) -> Iterator[bytes]:
+    """Compress a byte stream into a zstd frame, chunk by chunk.
+
+    Requires the optional ``zstandard`` package.
+    """
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    for chunk in chunks:
+        if data := compressor.compress(chunk):
+            yield data
+    yield compressor.flush()
+
+
+class DecompressedSizeError(ValueError):
+    """Decompressed content is larger than the allowed maximum."""
+
+
+def _decompressor(fileobj: IO[bytes]) -> IO[bytes] | None:
+    """A reader of the decompressed content of gzip or zstd ``fileobj``, or
+    None for other input. Leaves ``fileobj`` at the start.
+
+    Raises OSError for zstd input when ``zstandard`` is not installed.
+    """
+    magic = fileobj.read(4)
+    fileobj.seek(0)
+    if magic.startswith(GZIP_MAGIC):
+        return gzip.GzipFile(fileobj=fileobj)
+    if magic == ZSTD_MAGIC:
+        if zstandard is None:
+            raise OSError("zstd support requires the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(fileobj, closefd=False)
+    return None
+
+
+def read_decompressed_head(fileobj: IO[bytes], size: int) -> bytes:
+    """The first ``size`` bytes of the (decompressed) content of
+    ``fileobj``, without decompressing the rest."""
+    source = _decompressor(fileobj)
+    if source is None:
+        head = fileobj.read(size)
+    else:
+        with source:
+            head = source.read(size)
+    fileobj.seek(0)
+    return head
+
+
+def open_decompressed(fileobj: IO[bytes], max_bytes: int | None = None) -> IO[bytes]:
+    """Return a seekable binary file with the content of ``fileobj``.
+
+    gzip and zstd input is detected by its magic bytes and decompressed to a
+    temporary file on disk in chunks, since seeking within a compressed
+    stream means decompressing it again. Other input is returned as is.
+
+    Raises DecompressedSizeError as soon as the content exceeds
+    ``max_bytes``, so a small archive expanding to gigabytes is never
+    written out in full, and OSError for zstd input when ``zstandard`` is
+    not installed.
+    """
+    source = _decompressor(fileobj)
+    if source is None:
+        if max_bytes is not None and fileobj.seek(0, io.SEEK_END) > max_bytes:
+            raise DecompressedSizeError(f"Content exceeds {max_bytes} bytes")
+        fileobj.seek(0)
+        return fileobj
+
+    spooled = tempfile.TemporaryFile()
+    written = 0
+    with source:
+        while chunk := source.read(DECOMPRESS_CHUNK_SIZE):
+            written += len(chunk)
+            if max_bytes is not None and written > max_bytes:
+                spooled.close()
+                raise DecompressedSizeError(
+                    f"Decompressed content exceeds {max_bytes} bytes"
+                )
+            spooled.write(chunk)
+    spooled.seek(0)
+    return spooled
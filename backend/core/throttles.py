@@ -0,0 +1,15 @@
+"""
+Throttle classes shared by the apps' endpoints.
+"""
+
+from rest_framework.throttling import UserRateThrottle
+
+
+class BulkOperationThrottle(UserRateThrottle):
+    """
+    Rate limit for bulk operations to prevent system overload.
+    Limits to 100 bulk operations per hour per authenticated user.
+    """
+
+    scope = "bulk_operation"
+    rate = "100/hour"
@@ -45,6 +45,10 @@ REST_FRAMEWORK = {
         "rest_framework_simplejwt.authentication.JWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.FastJSONRenderer",  # orjson when installed
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
     "DEFAULT_PAGINATION_CLASS": "budget.pagination.StandardResultsPagination",
     "PAGE_SIZE": 100,
     "DEFAULT_THROTTLE_CLASSES": [
@@ -200,9 +204,52 @@ USE_I18N = True
 
 USE_TZ = True
 
+# First month of the fiscal year used by quarter/year reporting periods
+# (1 = calendar year, 10 = October-September, ...).
+FISCAL_YEAR_START_MONTH = config("FISCAL_YEAR_START_MONTH", default=1, cast=int)
+
+# Concurrent readers used when exporting backups (PostgreSQL only; 1 disables)
+BACKUP_WORKERS = config("BACKUP_WORKERS", default=4, cast=int)
+
+# Largest restore upload in bytes, all files together and as uploaded
+# (compressed). nginx/backend.conf caps /api/v1/restore/ bodies at the same size.
+BACKUP_MAX_UPLOAD = config("BACKUP_MAX_UPLOAD", default=256 * 1024 * 1024, cast=int)
+
+# Largest restorable NDJSON or columnar backup, in bytes once decompressed
+# (JSON documents are capped at 50 MB)
+BACKUP_MAX_STREAMED_SIZE = config(
+    "BACKUP_MAX_STREAMED_SIZE", default=2 * 1024 * 1024 * 1024, cast=int
+)
+
+# Scheduled snapshots (manage.py backup_snapshots): kept for the newest N days
+# and M ISO weeks, written to the "backups" storage below
+BACKUP_RETENTION_DAILY = config("BACKUP_RETENTION_DAILY", default=7, cast=int)
+BACKUP_RETENTION_WEEKLY = config("BACKUP_RETENTION_WEEKLY", default=4, cast=int)
+# Backup manifests and tombstones are kept per user from the oldest of their
+# N newest downloaded full backups (and the oldest stored snapshot) on
+BACKUP_RETENTION_FULL = config("BACKUP_RETENTION_FULL", default=10, cast=int)
+
 STATIC_URL = "static/"
 STATIC_ROOT = BASE_DIR / "staticfiles"
 
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {
+        "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage",
+    },
+    # Any Django storage backend works (e.g. django-storages' S3Storage, where
+    # "location" is the key prefix)
+    "backups": {
+        "BACKEND": config(
+            "BACKUP_STORAGE_BACKEND",
+            default="django.core.files.storage.FileSystemStorage",
+        ),
+        "OPTIONS": {
+            "location": config("BACKUP_DIR", default=str(BASE_DIR / "backups")),
+        },
+    },
+}
+
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 # JWT Settings
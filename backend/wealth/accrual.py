@@ -0,0 +1,129 @@
+"""
+Time-accrued valuation of fixed-income investments.
+
+``Investment.current_value`` is the value at maturity. For "what was this
+worth on date X" (net worth over time) each fixed-income investment gets an
+accrual schedule: its compounded value at monthly points from the purchase
+date to maturity (``term_years`` after purchase, counted in months). Values
+between two points are interpolated linearly; before the purchase date an
+investment is worth nothing and after maturity it keeps its maturity value.
+
+Schedules are built once and kept in the Django cache under a key that
+includes the investment's ``updated_at``, so editing an investment simply
+makes its old schedule unreachable.
+"""
+
+from bisect import bisect_right
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date
+
+from django.core.cache import cache
+
+from dateutil.relativedelta import relativedelta
+
+from .models import Investment
+from .valuation import COMPOUNDING_PERIODS
+
+# Stale schedules are never read (the key changes with updated_at); the
+# timeout only bounds how long they occupy the cache
+ACCRUAL_CACHE_TIMEOUT = 7 * 24 * 60 * 60
+ACCRUAL_CACHE_PREFIX = "wealth:accrual"
+
+# Fields a schedule is built from
+ACCRUAL_FIELDS = (
+    "id",
+    "updated_at",
+    "purchase_date",
+    "principal_amount",
+    "interest_rate",
+    "compounding_frequency",
+    "term_years",
+)
+
+
+@dataclass(frozen=True)
+class AccrualSchedule:
+    """Value of one investment at increasing dates (as ordinals)."""
+
+    days: tuple[int, ...]
+    values: tuple[float, ...]
+
+    @property
+    def maturity_value(self) -> float:
+        return self.values[-1]
+
+    def value_at(self, day: date) -> float:
+        ordinal = day.toordinal()
+        if ordinal < self.days[0]:
+            return 0.0
+        index = bisect_right(self.days, ordinal)
+        if index == len(self.days):
+            return self.values[-1]
+        start, end = self.days[index - 1], self.days[index]
+        low, high = self.values[index - 1], self.values[index]
+        return low + (high - low) * (ordinal - start) / (end - start)
+
+
+def build_schedule(investment: Investment) -> AccrualSchedule:
+    """Monthly accrual points of a fixed-income investment.
+
+    Matches ``Investment._calculate_compound_value`` at maturity; an
+    investment without a rate or term stays at its principal.
+    """
+    start = investment.purchase_date
+    principal = float(investment.principal_amount or 0)
+    rate = float(investment.interest_rate or 0) / 100
+    term = float(investment.term_years or 0)
+    if not principal or not rate or not term:
+        return AccrualSchedule((start.toordinal(),), (principal,))
+
+    periods = COMPOUNDING_PERIODS.get(investment.compounding_frequency, 1)
+    months = max(1, round(term * 12))
+    days = tuple(
+        (start + relativedelta(months=k)).toordinal() for k in range(months + 1)
+    )
+    # Elapsed years per point; the last one is the exact term
+    years = [k / 12 for k in range(months)] + [term]
+    growth = 1 + rate / periods
+    return AccrualSchedule(
+        days, tuple(principal * growth ** (periods * t) for t in years)
+    )
+
+
+def _cache_key(investment: Investment) -> str | None:
+    if investment.pk is None or investment.updated_at is None:
+        return None
+    stamp = investment.updated_at.isoformat()
+    return f"{ACCRUAL_CACHE_PREFIX}:{investment.pk}:{stamp}"
+
+
+def get_schedules(investments: Iterable[Investment]) -> dict[int, AccrualSchedule]:
+    """Accrual schedules by investment id, from the cache where possible."""
+    investments = [*investments]
+    keys = {investment.pk: _cache_key(investment) for investment in investments}
+    cached = cache.get_many([key for key in keys.values() if key])
+
+    schedules: dict[int, AccrualSchedule] = {}
+    missing: dict[str, AccrualSchedule] = {}
+    for investment in investments:
+        key = keys[investment.pk]
+        schedule = cached.get(key) if key else None
+        if schedule is None:
+            schedule = build_schedule(investment)
+            if key:
+                missing[key] = schedule
+        schedules[investment.pk] = schedule
+    if missing:
+        cache.set_many(missing, ACCRUAL_CACHE_TIMEOUT)
+    return schedules
+
+
+def fixed_income_schedules(user) -> tuple[list[Investment], dict[int, AccrualSchedule]]:
+    """A user's fixed-income investments and their accrual schedules."""
+    investments = [
+        *Investment.objects.filter(user=user, investment_type=Investment.FIXED_INCOME)
+        .only("symbol", *ACCRUAL_FIELDS)
+        .order_by("purchase_date", "id")
+    ]
+    return investments, get_schedules(investments)
@@ -1,6 +1,13 @@
 from django.contrib import admin
 
-from .models import Heritage, Investment, RetirementAccount
+from .models import (
+    AllocationTarget,
+    Heritage,
+    Investment,
+    NetWorthSnapshot,
+    PriceQuote,
+    RetirementAccount,
+)
 
 
 @admin.register(Investment)
@@ -41,3 +48,30 @@ class RetirementAccountAdmin(admin.ModelAdmin):
     list_display = ["name", "user", "account_type", "provider", "current_balance"]
     list_filter = ["account_type", "user"]
     search_fields = ["name", "provider", "user__email"]
+
+
+@admin.register(NetWorthSnapshot)
+class NetWorthSnapshotAdmin(admin.ModelAdmin):
+    list_display = ["date", "user", "net_worth", "cash", "investments", "liabilities"]
+    list_filter = ["user"]
+    date_hierarchy = "date"
+    readonly_fields = ["user"]
+
+    def get_queryset(self, request):
+        """Optimize query with select_related to prevent N+1 queries."""
+        qs = super().get_queryset(request)
+        return qs.select_related("user")
+
+
+@admin.register(PriceQuote)
+class PriceQuoteAdmin(admin.ModelAdmin):
+    list_display = ["symbol", "date", "price", "updated_at"]
+    search_fields = ["symbol"]
+    date_hierarchy = "date"
+
+
+@admin.register(AllocationTarget)
+class AllocationTargetAdmin(admin.ModelAdmin):
+    list_display = ["user", "asset_class", "target_percentage"]
+    list_filter = ["asset_class"]
+    readonly_fields = ["user"]
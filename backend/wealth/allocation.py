@@ -0,0 +1,146 @@
+"""
+Asset allocation across investments, real estate and retirement accounts.
+
+Asset classes are the investment types, ``real_estate`` (heritage) and
+``retirement`` (retirement accounts), valued as in the net worth snapshots:
+``Investment.current_value``, ``heritage_value_expression()`` and the
+account balance. Each model is summed per asset
+class in one grouped query, so the number of holdings only matters to the
+database; weights, drift from the user's ``AllocationTarget`` rows and
+trades then come from one pass over the asset classes.
+
+Once a user has targets, classes without one have a target of zero.
+Rebalancing needs targets that add up to 100%: every class then moves by
+``target value - value``, and each trade sells one class to buy another,
+pairing the largest sale with the largest purchase. A class is in at most
+one partial trade, so ``n`` classes off target take at most ``n - 1``
+trades.
+"""
+
+from typing import Any
+
+from django.db.models import Count, F, Sum
+
+from .heritage import heritage_value_expression
+from .models import AllocationTarget, Heritage, Investment, RetirementAccount
+from .valuation import valuation_expressions
+
+ASSET_CLASSES = [asset_class for asset_class, _ in AllocationTarget.ASSET_CLASS_CHOICES]
+
+
+def asset_class_totals(user) -> dict[str, tuple[int, float]]:
+    """``{asset_class: (holdings, value)}`` of a user's wealth, summed in
+    one grouped query per model."""
+    rows = (
+        Investment.objects.filter(user=user)
+        .order_by()
+        .values("investment_type")
+        .annotate(
+            count=Count("id"), value=Sum(valuation_expressions()["current_value"])
+        )
+    )
+    totals = {
+        row["investment_type"]: (row["count"], float(row["value"] or 0)) for row in rows
+    }
+    for asset_class, queryset, value in (
+        (
+            AllocationTarget.REAL_ESTATE,
+            Heritage.objects.filter(user=user),
+            heritage_value_expression(),
+        ),
+        (
+            AllocationTarget.RETIREMENT,
+            RetirementAccount.objects.filter(user=user),
+            F("current_balance"),
+        ),
+    ):
+        row = queryset.aggregate(count=Count("id"), value=Sum(value))
+        if row["count"]:
+            totals[asset_class] = (row["count"], float(row["value"] or 0))
+    return totals
+
+
+def rebalancing_trades(differences: dict[str, float]) -> list[dict[str, Any]]:
+    """Trades moving each asset class by its difference (positive to buy),
+    as ``{"sell", "buy", "amount"}``.
+
+    Differences are matched in cents; the sales and purchases of targets
+    adding up to 100% cancel out up to rounding.
+    """
+    cents = {name: round(diff * 100) for name, diff in differences.items()}
+    sells = sorted(
+        ([name, -amount] for name, amount in cents.items() if amount < 0),
+        key=lambda item: -item[1],
+    )
+    buys = sorted(
+        ([name, amount] for name, amount in cents.items() if amount > 0),
+        key=lambda item: -item[1],
+    )
+
+    trades = []
+    while sells and buys:
+        sell, buy = sells[0], buys[0]
+        amount = min(sell[1], buy[1])
+        trades.append({"sell": sell[0], "buy": buy[0], "amount": amount / 100})
+        sell[1] -= amount
+        buy[1] -= amount
+        if not sell[1]:
+            sells.pop(0)
+        if not buy[1]:
+            buys.pop(0)
+    return trades
+
+
+def allocation(
+    totals: dict[str, tuple[int, float]], targets: dict[str, float]
+) -> dict[str, Any]:
+    """Weights of ``totals`` compared with ``targets`` (percentages by asset
+    class), and the trades to reach them.
+
+    ``trades`` is None unless the targets add up to 100%.
+    """
+    total_value = sum(value for _, value in totals.values())
+    targets_total = sum(targets.values())
+    rebalance = round(targets_total, 2) == 100
+
+    rows, differences = [], {}
+    for asset_class in ASSET_CLASSES:
+        if asset_class not in totals and asset_class not in targets:
+            continue
+        count, value = totals.get(asset_class, (0, 0.0))
+        weight = value * 100 / total_value if total_value else 0.0
+        row = {
+            "asset_class": asset_class,
+            "count": count,
+            "value": value,
+            "weight": weight,
+            "target_weight": None,
+            "drift": None,
+            "difference": None,
+        }
+        if targets:
+            target = targets.get(asset_class, 0.0)
+            row["target_weight"] = target
+            row["drift"] = weight - target
+            if rebalance:
+                row["difference"] = total_value * target / 100 - value
+                differences[asset_class] = row["difference"]
+        rows.append(row)
+
+    return {
+        "total_value": total_value,
+        "targets_total": targets_total,
+        "allocation": rows,
+        "trades": rebalancing_trades(differences) if rebalance else None,
+    }
+
+
+def portfolio_allocation(user) -> dict[str, Any]:
+    """A user's allocation against their ``AllocationTarget`` rows."""
+    targets = {
+        asset_class: float(percentage)
+        for asset_class, percentage in AllocationTarget.objects.filter(
+            user=user
+        ).values_list("asset_class", "target_percentage")
+    }
+    return allocation(asset_class_totals(user), targets)
@@ -1,6 +1,8 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any
 
+from core.backup import BACKUP_CHUNK_SIZE, BackupRows, bulk_insert
+
 
 def _backup_wealth_domain(
     user: Any,
@@ -8,20 +10,24 @@ def _backup_wealth_domain(
     include: set[str] | None = None,
     multi_user_mode: bool = False,
     user_filter: dict[str, Any] | None = None,
-) -> dict[str, list[dict[str, Any]]]:
+    since: datetime | None = None,
+) -> dict[str, BackupRows]:
     from .models import Heritage, Investment, RetirementAccount
 
     include = include or {"investments", "heritages", "retirement_accounts"}
     user_filter = user_filter or {"user": user}
+    # Incremental backups only export rows created or updated after ``since``
+    user_filter = {**user_filter, "updated_at__gt": since} if since else user_filter
 
     def _values(*fields: str) -> tuple[str, ...]:
         return (*fields, "user_id") if multi_user_mode else fields
 
-    domain_data: dict[str, list[dict[str, Any]]] = {}
+    domain_data: dict[str, BackupRows] = {}
 
     if "investments" in include:
-        domain_data["investments"] = list(
-            Investment.objects.filter(**user_filter).values(
+        domain_data["investments"] = (
+            Investment.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "name",
@@ -38,11 +44,13 @@ def _backup_wealth_domain(
                     "notes",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "heritages" in include:
-        domain_data["heritages"] = list(
-            Heritage.objects.filter(**user_filter).values(
+        domain_data["heritages"] = (
+            Heritage.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "name",
@@ -57,11 +65,13 @@ def _backup_wealth_domain(
                     "notes",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     if "retirement_accounts" in include:
-        domain_data["retirement_accounts"] = list(
-            RetirementAccount.objects.filter(**user_filter).values(
+        domain_data["retirement_accounts"] = (
+            RetirementAccount.objects.filter(**user_filter)
+            .values(
                 *_values(
                     "id",
                     "name",
@@ -77,11 +87,19 @@ def _backup_wealth_domain(
                     "notes",
                 )
             )
+            .iterator(chunk_size=BACKUP_CHUNK_SIZE)
         )
 
     return domain_data
 
 
+def _parse_date(value: Any) -> date | None:
+    try:
+        return datetime.fromisoformat(value).date() if value else None
+    except (TypeError, ValueError):
+        return None
+
+
 def _restore_wealth_domain(
     requester: Any,
     data: dict[str, Any],
@@ -97,12 +115,15 @@ def _restore_wealth_domain(
 
     old_id_to_user: dict[int, Any] = {}
     if multi_user_mode:
-        for u in data.get("users", []):
-            try:
-                obj = user_model.objects.get(username=u["username"])
-            except user_model.DoesNotExist:
-                continue
-            old_id_to_user[u["id"]] = obj
+        backup_users = list(data.get("users", []))
+        users_by_name = user_model.objects.in_bulk(
+            {u["username"] for u in backup_users}, field_name="username"
+        )
+        old_id_to_user = {
+            u["id"]: users_by_name[u["username"]]
+            for u in backup_users
+            if u["username"] in users_by_name
+        }
 
     def resolve_user(entity: dict[str, Any]) -> Any | None:
         uid = entity.get("user_id")
@@ -111,93 +132,85 @@ def _restore_wealth_domain(
         return requester
 
     if clear_existing:
-        targets = list(old_id_to_user.values()) if old_id_to_user else [requester]
-        for target in targets:
-            Investment.objects.filter(user=target).delete()
-            Heritage.objects.filter(user=target).delete()
-            RetirementAccount.objects.filter(user=target).delete()
-
-    investments_created = 0
-    for inv in data.get("investments", []):
-        target = resolve_user(inv)
-        if target is None:
-            continue
-        try:
-            purchase_date = (
-                datetime.fromisoformat(inv["purchase_date"]).date()
-                if inv.get("purchase_date")
-                else None
+        target_ids = [u.id for u in old_id_to_user.values()] or [requester.id]
+        Investment.objects.filter(user_id__in=target_ids).delete()
+        Heritage.objects.filter(user_id__in=target_ids).delete()
+        RetirementAccount.objects.filter(user_id__in=target_ids).delete()
+
+    # Investments are unique per (user, symbol): skip symbols already present
+    user_ids = {requester.id, *(u.id for u in old_id_to_user.values())}
+    existing_symbols = set(
+        Investment.objects.filter(user_id__in=user_ids).values_list("user_id", "symbol")
+    )
+
+    def investments_to_create():
+        for inv in data.get("investments", []):
+            target = resolve_user(inv)
+            if target is None:
+                continue
+            symbol = inv.get("symbol", "")
+            if (target.id, symbol) in existing_symbols:
+                continue
+            existing_symbols.add((target.id, symbol))
+            yield Investment(
+                name=inv.get("name", ""),
+                symbol=symbol,
+                investment_type=inv.get("investment_type", Investment.STOCK),
+                quantity=inv.get("quantity", 0),
+                purchase_price=inv.get("purchase_price", 0),
+                current_price=inv.get("current_price") or None,
+                purchase_date=_parse_date(inv.get("purchase_date")),
+                principal_amount=inv.get("principal_amount") or None,
+                interest_rate=inv.get("interest_rate") or None,
+                compounding_frequency=inv.get("compounding_frequency") or None,
+                term_years=inv.get("term_years") or None,
+                notes=inv.get("notes", ""),
+                user=target,
             )
-        except ValueError:
-            purchase_date = None
-        Investment.objects.create(
-            name=inv.get("name", ""),
-            symbol=inv.get("symbol", ""),
-            investment_type=inv.get("investment_type", Investment.STOCK),
-            quantity=inv.get("quantity", 0),
-            purchase_price=inv.get("purchase_price", 0),
-            current_price=inv.get("current_price") or None,
-            purchase_date=purchase_date,
-            principal_amount=inv.get("principal_amount") or None,
-            interest_rate=inv.get("interest_rate") or None,
-            compounding_frequency=inv.get("compounding_frequency") or None,
-            term_years=inv.get("term_years") or None,
-            notes=inv.get("notes", ""),
-            user=target,
-        )
-        investments_created += 1
-
-    heritages_created = 0
-    for h in data.get("heritages", []):
-        target = resolve_user(h)
-        if target is None:
-            continue
-        try:
-            purchase_date = (
-                datetime.fromisoformat(h["purchase_date"]).date()
-                if h.get("purchase_date")
-                else None
+
+    def heritages_to_create():
+        for h in data.get("heritages", []):
+            target = resolve_user(h)
+            if target is None:
+                continue
+            yield Heritage(
+                name=h.get("name", ""),
+                heritage_type=h.get("heritage_type", Heritage.HOUSE),
+                address=h.get("address", ""),
+                area=h.get("area") or None,
+                area_unit=h.get("area_unit", "sq_m"),
+                purchase_price=h.get("purchase_price", 0),
+                current_value=h.get("current_value") or None,
+                purchase_date=_parse_date(h.get("purchase_date")),
+                monthly_rental_income=h.get("monthly_rental_income", 0),
+                notes=h.get("notes", ""),
+                user=target,
+            )
+
+    def retirement_accounts_to_create():
+        for r in data.get("retirement_accounts", []):
+            target = resolve_user(r)
+            if target is None:
+                continue
+            yield RetirementAccount(
+                name=r.get("name", ""),
+                account_type=r.get("account_type", RetirementAccount.TRADITIONAL_401K),
+                provider=r.get("provider", ""),
+                account_number=r.get("account_number") or None,
+                current_balance=r.get("current_balance", 0),
+                monthly_contribution=r.get("monthly_contribution", 0),
+                employer_match_percentage=r.get("employer_match_percentage", 0),
+                employer_match_limit=r.get("employer_match_limit", 0),
+                risk_level=r.get("risk_level", RetirementAccount.MODERATE),
+                target_retirement_age=r.get("target_retirement_age", 65),
+                notes=r.get("notes", ""),
+                user=target,
             )
-        except ValueError:
-            purchase_date = None
-        Heritage.objects.create(
-            name=h.get("name", ""),
-            heritage_type=h.get("heritage_type", Heritage.HOUSE),
-            address=h.get("address", ""),
-            area=h.get("area") or None,
-            area_unit=h.get("area_unit", "sq_m"),
-            purchase_price=h.get("purchase_price", 0),
-            current_value=h.get("current_value") or None,
-            purchase_date=purchase_date,
-            monthly_rental_income=h.get("monthly_rental_income", 0),
-            notes=h.get("notes", ""),
-            user=target,
-        )
-        heritages_created += 1
-
-    retirement_created = 0
-    for r in data.get("retirement_accounts", []):
-        target = resolve_user(r)
-        if target is None:
-            continue
-        RetirementAccount.objects.create(
-            name=r.get("name", ""),
-            account_type=r.get("account_type", RetirementAccount.TRADITIONAL_401K),
-            provider=r.get("provider", ""),
-            account_number=r.get("account_number") or None,
-            current_balance=r.get("current_balance", 0),
-            monthly_contribution=r.get("monthly_contribution", 0),
-            employer_match_percentage=r.get("employer_match_percentage", 0),
-            employer_match_limit=r.get("employer_match_limit", 0),
-            risk_level=r.get("risk_level", RetirementAccount.MODERATE),
-            target_retirement_age=r.get("target_retirement_age", 65),
-            notes=r.get("notes", ""),
-            user=target,
-        )
-        retirement_created += 1
 
     return {
-        "investments": investments_created,
-        "heritages": heritages_created,
-        "retirement_accounts": retirement_created,
+        "investments": bulk_insert(Investment, investments_to_create()),
+        "heritages": bulk_insert(Heritage, heritages_to_create()),
+        "retirement_accounts": bulk_insert(
+            RetirementAccount, retirement_accounts_to_create()
+        ),
     }
@@ -0,0 +1,362 @@
+"""
+Loan amortization and compound growth calculations.
+
+The server-side counterparts of the loan and compound interest calculator
+pages. Results are column arrays (one list per column, equal lengths) so a
+30-year monthly schedule is five lists of 360 numbers rather than 360
+objects; money values are rounded to cents.
+
+Amortization is monthly. The payment is the level payment that clears the
+balance over the remaining term, recomputed whenever the rate changes (as
+on an adjustable-rate loan). Extra payments, recurring or one-off, go to
+principal and shorten the loan; the payment itself is not lowered: a rate
+change re-levels it over the scheduled balance, the one the loan would
+have without extra payments. Within a stretch at one rate the balance
+recursion ``B_k = B_{k-1} (1 + r) - p_k`` has the closed form
+``B_k = g^k (B_0 - sum(p_j / g^j for j <= k))`` with ``g = 1 + r``, which
+NumPy evaluates for every month at once.
+
+Compound growth matches the calculator page: the principal compounds
+``periods_per_year`` times a year and monthly contributions earn the same
+effective rate. For monthly compounding this is the page's formula; for
+other frequencies the page's ``pmt * 12 * (factor - 1) / r`` is only an
+approximation of it.
+
+Both calculations depend only on their parameters, so results are memoized
+in an in-process LRU cache keyed by them. Cached results are immutable.
+"""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+MAX_TERM_MONTHS = 600
+MAX_GROWTH_YEARS = 100
+# Compounding periods per year the calculator page offers
+COMPOUNDING_FREQUENCIES = (1, 2, 4, 12, 365)
+CALCULATOR_CACHE_SIZE = 256
+
+# A balance below half a cent is paid off
+_PAID_OFF = 0.005
+
+Number = int | float | Decimal
+
+
+@dataclass(frozen=True)
+class Table:
+    """Named columns of equal length."""
+
+    columns: tuple[str, ...]
+    data: tuple[tuple[float, ...], ...]
+
+    def as_dict(self) -> dict[str, tuple[float, ...]]:
+        return dict(zip(self.columns, self.data, strict=True))
+
+
+@dataclass(frozen=True)
+class AmortizationSchedule:
+    monthly_payment: float
+    total_paid: float
+    total_interest: float
+    monthly: Table
+    yearly: Table
+
+    @property
+    def months(self) -> int:
+        return len(self.monthly.data[0])
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "summary": {
+                "monthly_payment": self.monthly_payment,
+                "months": self.months,
+                "total_paid": self.total_paid,
+                "total_interest": self.total_interest,
+            },
+            "monthly": self.monthly.as_dict(),
+            "yearly": self.yearly.as_dict(),
+        }
+
+
+@dataclass(frozen=True)
+class GrowthTable:
+    final_balance: float
+    total_contributions: float
+    total_interest: float
+    yearly: Table
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "summary": {
+                "final_balance": self.final_balance,
+                "total_contributions": self.total_contributions,
+                "total_interest": self.total_interest,
+                "years": len(self.yearly.data[0]) - 1,
+            },
+            "yearly": self.yearly.as_dict(),
+        }
+
+
+def _cents(values: Iterable[float]) -> tuple[float, ...]:
+    return tuple(round(value, 2) for value in values)
+
+
+def level_payment(balance: float, monthly_rate: float, months: int) -> float:
+    """The monthly payment that clears ``balance`` in ``months``."""
+    if not monthly_rate:
+        return balance / months
+    return balance * monthly_rate / (1 - (1 + monthly_rate) ** -months)
+
+
+def _closing_balances(
+    balance: float, monthly_rate: float, outflows: list[float]
+) -> list[float]:
+    """Balance after each month's payment of ``outflows`` at one rate,
+    negative once the loan would be overpaid."""
+    if np is None:
+        closing = []
+        for outflow in outflows:
+            balance = balance * (1 + monthly_rate) - outflow
+            closing.append(balance)
+        return closing
+
+    outflows = np.array(outflows)
+    if not monthly_rate:
+        return (balance - np.cumsum(outflows)).tolist()
+    growth = (1 + monthly_rate) ** np.arange(1, len(outflows) + 1)
+    return (growth * (balance - np.cumsum(outflows / growth))).tolist()
+
+
+def _yearly(months: list[int], columns: list[list[float]]) -> list[list[float]]:
+    """Per loan year: the sum of each column in ``columns``."""
+    starts = range(0, len(months), 12)
+    return [
+        [start // 12 + 1 for start in starts],
+        *([sum(column[start : start + 12]) for start in starts] for column in columns),
+    ]
+
+
+@lru_cache(maxsize=CALCULATOR_CACHE_SIZE)
+def _amortize(
+    principal: float,
+    annual_rate: float,
+    term_months: int,
+    extra_monthly_payment: float,
+    extra_payments: tuple[tuple[int, float], ...],
+    rate_changes: tuple[tuple[int, float], ...],
+) -> AmortizationSchedule:
+    rates = {1: annual_rate, **dict(rate_changes)}
+    starts = sorted(month for month in rates if month <= term_months)
+    lumps = dict(extra_payments)
+
+    months, payments, interest, balances = [], [], [], []
+    monthly_payment = None
+    # Without extra payments: the balance the payment is leveled over
+    balance = scheduled = principal
+    for index, start in enumerate(starts):
+        if balance < _PAID_OFF:
+            break
+        end = starts[index + 1] - 1 if index + 1 < len(starts) else term_months
+        monthly_rate = rates[start] / 1200
+        payment = level_payment(scheduled, monthly_rate, term_months - start + 1)
+        if monthly_payment is None:
+            monthly_payment = payment
+
+        segment = range(start, end + 1)
+        scheduled = _closing_balances(
+            scheduled, monthly_rate, [payment] * len(segment)
+        )[-1]
+        closing = _closing_balances(
+            balance,
+            monthly_rate,
+            [payment + extra_monthly_payment + lumps.get(m, 0) for m in segment],
+        )
+        paid_off = next(
+            (k for k, value in enumerate(closing) if value < _PAID_OFF), None
+        )
+        if paid_off is not None:
+            closing = closing[: paid_off + 1]
+        if paid_off is not None or end == term_months:
+            # The last payment clears what is left, rounding included
+            closing[-1] = 0.0
+
+        opening = [balance, *closing[:-1]]
+        charged = [value * monthly_rate for value in opening]
+        months.extend(segment[: len(closing)])
+        interest.extend(charged)
+        payments.extend(
+            o + i - c for o, i, c in zip(opening, charged, closing, strict=True)
+        )
+        balances.extend(closing)
+        balance = closing[-1]
+
+    principal_paid = [p - i for p, i in zip(payments, interest, strict=True)]
+    year, *sums = _yearly(months, [payments, principal_paid, interest])
+    return AmortizationSchedule(
+        monthly_payment=round(monthly_payment or 0.0, 2),
+        total_paid=round(sum(payments), 2),
+        total_interest=round(sum(interest), 2),
+        monthly=Table(
+            ("month", "payment", "principal", "interest", "balance"),
+            (
+                tuple(months),
+                *(_cents(column) for column in (payments, principal_paid, interest)),
+                _cents(balances),
+            ),
+        ),
+        yearly=Table(
+            ("year", "payment", "principal", "interest", "balance"),
+            (
+                tuple(year),
+                *(_cents(column) for column in sums),
+                _cents(balances[min(len(balances), 12 * y) - 1] for y in year),
+            ),
+        ),
+    )
+
+
+def _by_month(
+    values: Mapping[int, Number] | Iterable[tuple[int, Number]], add: bool
+) -> tuple[tuple[int, float], ...]:
+    """``{month: value}`` or ``(month, value)`` pairs as a sorted, hashable
+    tuple. Values for the same month are added up, or the last one wins."""
+    items = values.items() if isinstance(values, Mapping) else values
+    merged: dict[int, float] = {}
+    for month, value in items:
+        month = int(month)
+        merged[month] = float(value) + (merged.get(month, 0.0) if add else 0.0)
+    return tuple(sorted(merged.items()))
+
+
+def amortization_schedule(
+    principal: Number,
+    annual_rate: Number,
+    term_months: int,
+    extra_monthly_payment: Number = 0,
+    extra_payments: Mapping[int, Number] | Iterable[tuple[int, Number]] = (),
+    rate_changes: Mapping[int, Number] | Iterable[tuple[int, Number]] = (),
+) -> AmortizationSchedule:
+    """Monthly amortization schedule of a loan.
+
+    ``annual_rate`` is a percentage. ``extra_payments`` are one-off
+    payments and ``rate_changes`` new annual rates, both by month
+    (1-based, month 1 is the first payment). A rate change applies from
+    its month on.
+    """
+    return _amortize(
+        float(principal),
+        float(annual_rate),
+        int(term_months),
+        float(extra_monthly_payment),
+        _by_month(extra_payments, add=True),
+        _by_month(rate_changes, add=False),
+    )
+
+
+def amortization(**parameters: Any) -> dict[str, Any]:
+    """``amortization_schedule`` as a response, compared with the same
+    loan without extra payments when there are any."""
+    schedule = amortization_schedule(**parameters)
+    result = schedule.as_dict()
+    if parameters.get("extra_monthly_payment") or parameters.get("extra_payments"):
+        baseline = amortization_schedule(
+            **{**parameters, "extra_monthly_payment": 0, "extra_payments": ()}
+        )
+        result["summary"]["months_saved"] = baseline.months - schedule.months
+        result["summary"]["interest_saved"] = round(
+            baseline.total_interest - schedule.total_interest, 2
+        )
+    return result
+
+
+@lru_cache(maxsize=CALCULATOR_CACHE_SIZE)
+def _grow(
+    principal: float,
+    monthly_contribution: float,
+    rates: tuple[float, ...],
+    years: int,
+    periods_per_year: int,
+) -> tuple[tuple[float, ...], ...]:
+    """Balance at the end of years 0..``years``, one row per annual rate."""
+    balances = []
+    for annual_rate in rates:
+        rate = annual_rate / 100 / periods_per_year
+        # Effective monthly rate of the compounding frequency
+        monthly_rate = (1 + rate) ** (periods_per_year / 12) - 1
+        if not monthly_rate:
+            balances.append(
+                [principal + monthly_contribution * 12 * t for t in range(years + 1)]
+            )
+        elif np is None:
+            factors = [(1 + rate) ** (periods_per_year * t) for t in range(years + 1)]
+            balances.append(
+                [
+                    principal * f + monthly_contribution * (f - 1) / monthly_rate
+                    for f in factors
+                ]
+            )
+        else:
+            factors = (1 + rate) ** (periods_per_year * np.arange(years + 1.0))
+            balances.append(
+                (
+                    principal * factors
+                    + monthly_contribution * (factors - 1) / monthly_rate
+                ).tolist()
+            )
+    return tuple(_cents(row) for row in balances)
+
+
+def compound_growth(
+    principal: Number,
+    monthly_contribution: Number,
+    annual_rate: Number,
+    years: int,
+    periods_per_year: int = 12,
+    rate_variance: Number = 0,
+) -> GrowthTable:
+    """Year-by-year growth of ``principal`` plus monthly contributions.
+
+    ``annual_rate`` and ``rate_variance`` are percentages. With a variance
+    the table also has ``balance_low`` and ``balance_high`` columns at the
+    rate minus (not below zero) and plus the variance, as on the
+    calculator page.
+    """
+    rate, variance = float(annual_rate), float(rate_variance)
+    rates = (rate, max(0.0, rate - variance), rate + variance) if variance else (rate,)
+    balances = _grow(
+        float(principal),
+        float(monthly_contribution),
+        rates,
+        int(years),
+        int(periods_per_year),
+    )
+    contributions = _cents(
+        float(principal) + float(monthly_contribution) * 12 * t
+        for t in range(int(years) + 1)
+    )
+    interest = _cents(b - c for b, c in zip(balances[0], contributions, strict=True))
+    columns = ["year", "balance", "contributions", "interest"]
+    if variance:
+        columns += ["balance_low", "balance_high"]
+    return GrowthTable(
+        final_balance=balances[0][-1],
+        total_contributions=contributions[-1],
+        total_interest=interest[-1],
+        yearly=Table(
+            tuple(columns),
+            (
+                tuple(range(int(years) + 1)),
+                balances[0],
+                contributions,
+                interest,
+                *balances[1:],
+            ),
+        ),
+    )
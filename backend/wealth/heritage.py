@@ -0,0 +1,131 @@
+"""
+Heritage (real estate) values computed in the database.
+
+``heritage_expressions`` mirrors the derived ``Heritage`` properties
+(``gain_loss``, ``gain_loss_percentage``, ``annual_rental_income`` and
+``rental_yield_percentage``) so that listings can be sorted by them and
+``heritage_summary`` can total a portfolio without loading it.
+
+Properties are valued by ``heritage_value_expression``, which net worth
+snapshots and asset allocation use too. Yields are weighted by value:
+the yield of a group is its annual rent over its current value, counting
+only properties that have a current value, as ``rental_yield_percentage``
+does per property.
+"""
+
+from typing import Any
+
+from django.db.models import Case, Count, DecimalField, F, Q, QuerySet, Sum, Value, When
+
+from .models import Heritage
+from .valuation import ANNOTATION_PREFIX
+
+HERITAGE_FIELDS = (
+    "gain_loss",
+    "gain_loss_percentage",
+    "annual_rental_income",
+    "rental_yield_percentage",
+)
+
+_ZERO = Value(0, output_field=DecimalField())
+# As the properties: any current value counts for gain/loss, yields need a
+# positive one
+_HAS_VALUE = Q(current_value__isnull=False) & ~Q(current_value=0)
+_VALUED = Q(current_value__gt=0)
+
+
+def heritage_value_expression() -> Case:
+    """A property's value: its current value, or its purchase price if it
+    has none (as ``gain_loss`` counts it)."""
+    return Case(When(_HAS_VALUE, then=F("current_value")), default=F("purchase_price"))
+
+
+def heritage_expressions() -> dict[str, Any]:
+    """Database expressions for the derived Heritage values."""
+    gain_loss = Case(
+        When(_HAS_VALUE, then=F("current_value") - F("purchase_price")),
+        default=_ZERO,
+        output_field=DecimalField(),
+    )
+    annual_rental_income = F("monthly_rental_income") * 12
+    return {
+        "gain_loss": gain_loss,
+        "gain_loss_percentage": Case(
+            When(purchase_price=0, then=_ZERO),
+            default=gain_loss * 100 / F("purchase_price"),
+            output_field=DecimalField(),
+        ),
+        "annual_rental_income": annual_rental_income,
+        "rental_yield_percentage": Case(
+            When(_VALUED, then=annual_rental_income * 100 / F("current_value")),
+            default=_ZERO,
+            output_field=DecimalField(),
+        ),
+    }
+
+
+def annotate_heritage(queryset: QuerySet) -> QuerySet:
+    """Compute the derived values in SQL, like ``annotate_valuation``.
+
+    Aliased under their own names for ``filter()`` and ``order_by()`` and
+    selected with the ``ANNOTATION_PREFIX``.
+    """
+    expressions = heritage_expressions()
+    return queryset.alias(**expressions).annotate(
+        **{ANNOTATION_PREFIX + name: F(name) for name in expressions}
+    )
+
+
+def heritage_summary(queryset: QuerySet) -> dict[str, Any]:
+    """Totals and value-weighted rental yield per heritage type and overall,
+    summed in one grouped query."""
+    annual_rent = heritage_expressions()["annual_rental_income"]
+    rows = (
+        queryset.order_by()
+        .values("heritage_type")
+        .annotate(
+            count=Count("id"),
+            purchase=Sum("purchase_price"),
+            value=Sum(heritage_value_expression()),
+            rent=Sum(annual_rent),
+            valued=Sum("current_value", filter=_VALUED),
+            valued_rent=Sum(annual_rent, filter=_VALUED),
+        )
+    )
+    totals = {
+        row["heritage_type"]: [
+            row["count"],
+            *(
+                float(row[key] or 0)
+                for key in ("purchase", "value", "rent", "valued", "valued_rent")
+            ),
+        ]
+        for row in rows
+    }
+    by_type = [
+        {"heritage_type": heritage_type, **_summary(*totals[heritage_type])}
+        for heritage_type, _ in Heritage.HERITAGE_TYPE_CHOICES
+        if heritage_type in totals
+    ]
+    overall = [sum(column) for column in zip(*totals.values(), strict=True)]
+    return {**_summary(*(overall or (0, *[0.0] * 5))), "by_type": by_type}
+
+
+def _summary(
+    count: int,
+    purchase: float,
+    value: float,
+    rent: float,
+    valued: float,
+    valued_rent: float,
+) -> dict[str, Any]:
+    gain_loss = value - purchase
+    return {
+        "count": count,
+        "total_purchase_price": purchase,
+        "total_current_value": value,
+        "gain_loss": gain_loss,
+        "gain_loss_percentage": gain_loss * 100 / purchase if purchase else 0.0,
+        "annual_rental_income": rent,
+        "rental_yield_percentage": valued_rent * 100 / valued if valued else 0.0,
+    }
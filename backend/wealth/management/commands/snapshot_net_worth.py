@@ -0,0 +1,61 @@
+import logging
+from functools import partial
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from core.scheduling import run_every
+from core.streaming import iter_chunks
+from wealth.networth import take_snapshots
+
+logger = logging.getLogger(__name__)
+
+# Users whose components are computed per batch of grouped queries
+SNAPSHOT_BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Record today's net worth of every active user (or of --user) in "
+        "NetWorthSnapshot. Re-running on the same day updates that day's "
+        "rows. Run it daily from cron, or keep it running with --every."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="usernames",
+            metavar="USERNAME",
+            help="Only snapshot this user (repeatable)",
+        )
+        parser.add_argument(
+            "--every",
+            type=float,
+            metavar="HOURS",
+            help="Keep running and take snapshots every HOURS hours",
+        )
+
+    def handle(self, *args, **options):
+        if not options["every"]:
+            self._run(options)
+            return
+        run_every(options["every"], partial(self._run, options), logger)
+
+    def _user_ids(self, options):
+        users = get_user_model().objects.filter(is_active=True)
+        if options["usernames"]:
+            users = users.filter(username__in=options["usernames"])
+            found = set(users.values_list("username", flat=True))
+            missing = set(options["usernames"]) - found
+            if missing:
+                raise CommandError(f"Unknown users: {', '.join(sorted(missing))}")
+        return [*users.order_by("pk").values_list("pk", flat=True)]
+
+    def _run(self, options):
+        day = timezone.localdate()
+        count = 0
+        for user_ids in iter_chunks(self._user_ids(options), SNAPSHOT_BATCH_SIZE):
+            count += len(take_snapshots(user_ids, day))
+        self.stdout.write(f"Net worth snapshots for {day}: {count} user(s)")
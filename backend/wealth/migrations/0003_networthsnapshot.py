@@ -0,0 +1,77 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wealth", "0002_update_content_types"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NetWorthSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                (
+                    "cash",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Balance of all non-credit-card bank accounts",
+                        max_digits=15,
+                    ),
+                ),
+                (
+                    "investments",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                (
+                    "real_estate",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                (
+                    "retirement",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                (
+                    "liabilities",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text=(
+                            "Outstanding credit card balances, as a positive amount"
+                        ),
+                        max_digits=15,
+                    ),
+                ),
+                (
+                    "net_worth",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=15),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="net_worth_snapshots",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["date"],
+                "unique_together": {("user", "date")},
+            },
+        ),
+    ]
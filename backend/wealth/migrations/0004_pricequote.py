@@ -0,0 +1,44 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wealth", "0003_networthsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceQuote",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "symbol",
+                    models.CharField(
+                        help_text="Upper-case ticker symbol", max_length=20
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("price", models.DecimalField(decimal_places=4, max_digits=15)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "ordering": ["symbol", "-date"],
+                "indexes": [
+                    models.Index(
+                        fields=["symbol", "-date"],
+                        name="wealth_pric_symbol_be4af8_idx",
+                    )
+                ],
+                "unique_together": {("symbol", "date")},
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wealth", "0004_pricequote"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="AllocationTarget",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "asset_class",
+                    models.CharField(
+                        choices=[
+                            ("stock", "Stock"),
+                            ("bond", "Bond"),
+                            ("etf", "ETF"),
+                            ("crypto", "Cryptocurrency"),
+                            ("mutual_fund", "Mutual Fund"),
+                            ("fixed_income", "Fixed Income"),
+                            ("real_estate", "Real Estate"),
+                            ("retirement", "Retirement"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                (
+                    "target_percentage",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Target share of total wealth, 0-100",
+                        max_digits=5,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="allocation_targets",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["asset_class"],
+                "unique_together": {("user", "asset_class")},
+            },
+        ),
+    ]
@@ -1,8 +1,12 @@
 from django.conf import settings
 from django.db import models
 
+from core.models import TombstoneModel
+
+
+class Investment(TombstoneModel):
+    backup_entity = "investments"
 
-class Investment(models.Model):
     STOCK = "stock"
     BOND = "bond"
     ETF = "etf"
@@ -169,7 +173,9 @@ class Investment(models.Model):
         return f"{self.symbol} - {self.name}"
 
 
-class Heritage(models.Model):
+class Heritage(TombstoneModel):
+    backup_entity = "heritages"
+
     LAND = "land"
     HOUSE = "house"
     APARTMENT = "apartment"
@@ -275,7 +281,9 @@ class Heritage(models.Model):
         return f"{self.name} - {self.get_heritage_type_display()}"
 
 
-class RetirementAccount(models.Model):
+class RetirementAccount(TombstoneModel):
+    backup_entity = "retirement_accounts"
+
     # Account Types
     TRADITIONAL_401K = "traditional_401k"
     ROTH_401K = "roth_401k"
@@ -399,3 +407,99 @@ class RetirementAccount(models.Model):
     def __str__(self):
         provider_display = f" - {self.provider}" if self.provider else ""
         return f"{self.name} ({self.get_account_type_display()}){provider_display}"
+
+
+class NetWorthSnapshot(models.Model):
+    """A user's net worth components on one day (see wealth.networth)."""
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="net_worth_snapshots",
+    )
+    date = models.DateField()
+    cash = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        help_text="Balance of all non-credit-card bank accounts",
+    )
+    investments = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    real_estate = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    retirement = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    liabilities = models.DecimalField(
+        max_digits=15,
+        decimal_places=2,
+        default=0,
+        help_text="Outstanding credit card balances, as a positive amount",
+    )
+    net_worth = models.DecimalField(max_digits=15, decimal_places=2, default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [["user", "date"]]
+        ordering = ["date"]
+
+    def __str__(self):
+        return f"{self.user} - {self.date}: {self.net_worth}"
+
+
+class PriceQuote(models.Model):
+    """Closing price of a symbol on one day, shared by every user.
+
+    Holdings resolve ``Investment.current_price`` from the latest quote of
+    their symbol (see wealth.quotes).
+    """
+
+    symbol = models.CharField(max_length=20, help_text="Upper-case ticker symbol")
+    date = models.DateField()
+    price = models.DecimalField(max_digits=15, decimal_places=4)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["symbol", "date"]]
+        ordering = ["symbol", "-date"]
+        indexes = [
+            models.Index(fields=["symbol", "-date"]),
+        ]
+
+    def __str__(self):
+        return f"{self.symbol} {self.date}: {self.price}"
+
+
+class AllocationTarget(models.Model):
+    """A user's target share of their wealth in one asset class.
+
+    Asset classes are the investment types plus real estate (heritage) and
+    retirement accounts; see wealth.allocation.
+    """
+
+    REAL_ESTATE = "real_estate"
+    RETIREMENT = "retirement"
+    ASSET_CLASS_CHOICES = [
+        *Investment.INVESTMENT_TYPE_CHOICES,
+        (REAL_ESTATE, "Real Estate"),
+        (RETIREMENT, "Retirement"),
+    ]
+
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="allocation_targets",
+    )
+    asset_class = models.CharField(max_length=20, choices=ASSET_CLASS_CHOICES)
+    target_percentage = models.DecimalField(
+        max_digits=5,
+        decimal_places=2,
+        help_text="Target share of total wealth, 0-100",
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = [["user", "asset_class"]]
+        ordering = ["asset_class"]
+
+    def __str__(self):
+        return f"{self.user} - {self.asset_class}: {self.target_percentage}%"
@@ -0,0 +1,113 @@
+"""
+Daily net worth snapshots.
+
+``take_snapshots`` computes every component of net worth for a batch of
+users with one grouped query per source and upserts one ``NetWorthSnapshot``
+row per user and day. The components match the dashboard's NetWorthView:
+
+- cash: balances of all non-credit-card bank accounts (transaction sums)
+- liabilities: credit card balances, as a positive amount
+- investments: ``Investment.current_value``
+- real_estate: ``heritage_value_expression()``
+- retirement: ``RetirementAccount.current_balance``
+"""
+
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+from typing import Any
+
+from django.db import connection
+from django.db.models import Sum
+
+from budget.models import BankAccount
+
+from .heritage import heritage_value_expression
+from .models import Heritage, Investment, NetWorthSnapshot, RetirementAccount
+from .valuation import valuation_expressions
+
+ZERO = Decimal("0.00")
+CENT = Decimal("0.01")
+SNAPSHOT_COMPONENTS = (
+    "cash",
+    "investments",
+    "real_estate",
+    "retirement",
+    "liabilities",
+)
+
+
+def _sum_by_user(queryset, expression) -> dict[int, Any]:
+    rows = queryset.order_by().values("user_id").annotate(total=Sum(expression))
+    return {row["user_id"]: row["total"] or 0 for row in rows}
+
+
+def compute_components(user_ids: Iterable[int]) -> dict[int, dict[str, Decimal]]:
+    """``{user_id: {component: amount}}`` for the given users, as of now."""
+    user_ids = [*user_ids]
+    components = {
+        user_id: dict.fromkeys(SNAPSHOT_COMPONENTS, ZERO) for user_id in user_ids
+    }
+
+    # One row per account, so a card in credit doesn't offset another card
+    balances = (
+        BankAccount.objects.filter(user_id__in=user_ids)
+        .order_by()
+        .values("id", "user_id", "account_type")
+        .annotate(balance=Sum("transactions__amount"))
+    )
+    for row in balances:
+        balance = row["balance"] or ZERO
+        if row["account_type"] == BankAccount.CREDIT_CARD:
+            components[row["user_id"]]["liabilities"] += abs(balance)
+        else:
+            components[row["user_id"]]["cash"] += balance
+
+    totals = {
+        "investments": _sum_by_user(
+            Investment.objects.filter(user_id__in=user_ids),
+            valuation_expressions()["current_value"],
+        ),
+        "real_estate": _sum_by_user(
+            Heritage.objects.filter(user_id__in=user_ids),
+            heritage_value_expression(),
+        ),
+        "retirement": _sum_by_user(
+            RetirementAccount.objects.filter(user_id__in=user_ids), "current_balance"
+        ),
+    }
+    for component, by_user in totals.items():
+        for user_id, total in by_user.items():
+            components[user_id][component] = Decimal(str(total))
+    return components
+
+
+def take_snapshots(user_ids: Iterable[int], day: date) -> list[NetWorthSnapshot]:
+    """Store today's components of each user as their snapshot for ``day``.
+
+    Re-running for the same day overwrites that day's snapshots.
+    """
+    snapshots = []
+    for user_id, values in compute_components(user_ids).items():
+        values = {name: amount.quantize(CENT) for name, amount in values.items()}
+        assets = (
+            values["cash"]
+            + values["investments"]
+            + values["real_estate"]
+            + values["retirement"]
+        )
+        net_worth = assets - values["liabilities"]
+        snapshots.append(
+            NetWorthSnapshot(user_id=user_id, date=day, net_worth=net_worth, **values)
+        )
+    return NetWorthSnapshot.objects.bulk_create(
+        snapshots,
+        update_conflicts=True,
+        # MySQL upserts on any unique key and rejects an explicit target
+        unique_fields=(
+            ["user", "date"]
+            if connection.features.supports_update_conflicts_with_target
+            else None
+        ),
+        update_fields=[*SNAPSHOT_COMPONENTS, "net_worth"],
+    )
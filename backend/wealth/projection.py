@@ -0,0 +1,179 @@
+"""
+Monte Carlo projection of retirement account balances.
+
+Each account grows by a random yearly return drawn from a lognormal
+distribution with the mean and volatility of its ``risk_level``, and
+receives its ``total_annual_contribution`` (contributions plus employer
+match) at the end of every year. Accounts share one market shock per path
+and year, so a bad year is bad for every account. Accounts at the same
+risk level then grow alike, so their balances and contributions are summed
+per risk level first and at most four columns are simulated, whatever the
+number of accounts; all paths, years and risk levels are simulated at once
+with NumPy array math.
+
+With ``G_t`` the cumulative growth factor after year ``t`` the balance
+recursion ``B_t = B_{t-1} (1 + r_t) + c`` has the closed form
+``B_t = G_t (B_0 + c * sum(1 / G_s for s <= t))``, which is evaluated with
+cumulative sums over the year axis instead of a loop over years.
+
+Projections are nominal (no inflation adjustment). Results are cached under
+a hash of every input, and the random seed is derived from the same hash,
+so an unchanged portfolio always gets the same answer.
+"""
+
+import hashlib
+import json
+from collections.abc import Iterable
+from datetime import date
+from typing import Any
+
+from django.core.cache import cache
+
+from .models import RetirementAccount
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# (mean yearly return, yearly volatility) per risk level
+RISK_ASSUMPTIONS = {
+    RetirementAccount.CONSERVATIVE: (0.04, 0.05),
+    RetirementAccount.MODERATE: (0.06, 0.10),
+    RetirementAccount.AGGRESSIVE: (0.08, 0.15),
+    RetirementAccount.VERY_AGGRESSIVE: (0.10, 0.20),
+}
+PROJECTION_PERCENTILES = (10, 25, 50, 75, 90)
+DEFAULT_PROJECTION_YEARS = 30
+MAX_PROJECTION_YEARS = 60
+DEFAULT_PROJECTION_PATHS = 10000
+MAX_PROJECTION_PATHS = 20000
+
+PROJECTION_CACHE_TIMEOUT = 24 * 60 * 60
+PROJECTION_CACHE_PREFIX = "wealth:projection"
+
+
+def projection_inputs(accounts: Iterable[RetirementAccount]) -> list[dict[str, Any]]:
+    """The account fields a projection depends on, in a stable order."""
+    return sorted(
+        (
+            {
+                "id": account.pk,
+                "balance": float(account.current_balance),
+                "contribution": float(account.total_annual_contribution),
+                "risk_level": account.risk_level,
+            }
+            for account in accounts
+        ),
+        key=lambda inputs: inputs["id"] or 0,
+    )
+
+
+def _by_risk_level(inputs: list[dict[str, Any]]) -> dict[str, tuple[float, float]]:
+    """``{risk_level: (balance, contribution)}`` summed over ``inputs``.
+
+    Unknown risk levels are projected as moderate.
+    """
+    totals: dict[str, tuple[float, float]] = {}
+    for account in inputs:
+        level = account["risk_level"]
+        if level not in RISK_ASSUMPTIONS:
+            level = RetirementAccount.MODERATE
+        balance, contribution = totals.get(level, (0.0, 0.0))
+        totals[level] = (
+            balance + account["balance"],
+            contribution + account["contribution"],
+        )
+    return totals
+
+
+def _lognormal_parameters(risk_levels: Iterable[str]) -> tuple[Any, Any]:
+    """Per-risk-level (mu, sigma) of log(1 + r) matching the assumed mean and
+    volatility of r."""
+    mean, volatility = np.array([RISK_ASSUMPTIONS[level] for level in risk_levels]).T
+    sigma2 = np.log1p((volatility / (1 + mean)) ** 2)
+    return np.log1p(mean) - sigma2 / 2, np.sqrt(sigma2)
+
+
+def simulate(inputs: list[dict[str, Any]], years: int, paths: int, seed: int) -> Any:
+    """Total balance of all accounts per path and year, ``(paths, years + 1)``.
+
+    Column 0 is today's balance.
+    """
+    levels = _by_risk_level(inputs)
+    balance, contribution = np.array(list(levels.values())).T
+    mu, sigma = _lognormal_parameters(levels)
+
+    shocks = np.random.default_rng(seed).standard_normal((paths, years, 1))
+    # Cumulative growth per path, year and risk level: (paths, years, levels)
+    growth = np.exp(np.cumsum(mu + sigma * shocks, axis=1))
+    balances = growth * (balance + contribution * np.cumsum(1 / growth, axis=1))
+
+    totals = np.empty((paths, years + 1))
+    totals[:, 0] = balance.sum()
+    totals[:, 1:] = balances.sum(axis=2)
+    return totals
+
+
+def _input_hash(inputs: list[dict[str, Any]], years: int, paths: int) -> str:
+    payload = json.dumps(
+        {
+            "accounts": inputs,
+            "years": years,
+            "paths": paths,
+            "assumptions": RISK_ASSUMPTIONS,
+            "percentiles": PROJECTION_PERCENTILES,
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def project(
+    accounts: Iterable[RetirementAccount],
+    years: int = DEFAULT_PROJECTION_YEARS,
+    paths: int = DEFAULT_PROJECTION_PATHS,
+    start_year: int | None = None,
+) -> dict[str, Any]:
+    """Percentile bands of the combined balance of ``accounts`` by year.
+
+    Raises RuntimeError if NumPy is not installed.
+    """
+    if np is None:
+        raise RuntimeError("Retirement projections require NumPy")
+
+    inputs = projection_inputs(accounts)
+    digest = _input_hash(inputs, years, paths)
+    key = f"{PROJECTION_CACHE_PREFIX}:{digest}"
+    percentiles = cache.get(key)
+    if percentiles is None:
+        if inputs:
+            totals = simulate(inputs, years, paths, seed=int(digest[:16], 16))
+            percentiles = np.percentile(totals, PROJECTION_PERCENTILES, axis=0).T
+            percentiles = percentiles.tolist()
+        else:
+            percentiles = [[0.0] * len(PROJECTION_PERCENTILES)] * (years + 1)
+        cache.set(key, percentiles, PROJECTION_CACHE_TIMEOUT)
+
+    start_year = start_year or date.today().year
+    return {
+        "years": years,
+        "paths": paths,
+        "percentiles": [*PROJECTION_PERCENTILES],
+        "bands": [
+            {
+                "year": start_year + offset,
+                **{
+                    f"p{percentile}": value
+                    for percentile, value in zip(
+                        PROJECTION_PERCENTILES, values, strict=True
+                    )
+                },
+            }
+            for offset, values in enumerate(percentiles)
+        ],
+        "assumptions": {
+            level: {"mean_return": mean, "volatility": volatility}
+            for level, (mean, volatility) in RISK_ASSUMPTIONS.items()
+        },
+    }
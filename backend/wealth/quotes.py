@@ -0,0 +1,92 @@
+"""
+Shared price history for investments.
+
+``PriceQuote`` rows are keyed by (symbol, date) and are not owned by any
+user, so a single quote feed updates every holding of a symbol.
+``upsert_quotes`` writes a batch of quotes with INSERT ... ON CONFLICT and
+then copies the latest price of each touched symbol into
+``Investment.current_price`` with one UPDATE. Keeping the resolved price in
+that column means the SQL valuations (see wealth.valuation) and the
+serializers keep reading a plain field.
+
+Symbols are matched case-insensitively: quotes are stored upper-case and
+holdings are compared on ``UPPER(symbol)``.
+"""
+
+from collections.abc import Iterable
+from datetime import date
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, QuerySet, Subquery
+from django.db.models.functions import Now, Upper
+
+from .models import Investment, PriceQuote
+
+# Quotes per INSERT ... ON CONFLICT statement
+QUOTE_BATCH_SIZE = 1000
+MAX_QUOTES_PER_REQUEST = 10000
+
+
+def normalize_symbol(symbol: str) -> str:
+    return symbol.strip().upper()
+
+
+def _latest(symbol) -> QuerySet:
+    """Quotes of ``symbol`` (a value or expression), newest first."""
+    return PriceQuote.objects.filter(symbol=symbol).order_by("-date")
+
+
+def latest_quotes(symbols: Iterable[str]) -> dict[str, PriceQuote]:
+    """``{symbol: latest PriceQuote}`` for the symbols that have quotes."""
+    symbols = {normalize_symbol(symbol) for symbol in symbols}
+    quotes = PriceQuote.objects.filter(
+        symbol__in=symbols,
+        date=Subquery(_latest(OuterRef("symbol")).values("date")[:1]),
+    )
+    return {quote.symbol: quote for quote in quotes}
+
+
+def reprice_investments(symbols: Iterable[str]) -> int:
+    """Set ``current_price`` of holdings of ``symbols`` to their latest quote.
+
+    Fixed-income holdings are valued from their terms and are left alone.
+    Returns the number of investments updated.
+    """
+    symbols = {normalize_symbol(symbol) for symbol in symbols}
+    latest = _latest(Upper(OuterRef("symbol")))
+    return (
+        Investment.objects.exclude(investment_type=Investment.FIXED_INCOME)
+        .filter(Exists(latest.filter(symbol__in=symbols)))
+        .update(
+            current_price=Subquery(latest.values("price")[:1]),
+            updated_at=Now(),
+        )
+    )
+
+
+def upsert_quotes(quotes: Iterable[tuple[str, date, Decimal]]) -> tuple[int, int]:
+    """Insert or overwrite ``(symbol, date, price)`` quotes and reprice holdings.
+
+    A later quote for the same symbol and date in the batch wins. Returns
+    ``(quotes written, investments repriced)``.
+    """
+    prices = {(normalize_symbol(symbol), day): price for symbol, day, price in quotes}
+    with transaction.atomic():
+        PriceQuote.objects.bulk_create(
+            [
+                PriceQuote(symbol=symbol, date=day, price=price)
+                for (symbol, day), price in prices.items()
+            ],
+            batch_size=QUOTE_BATCH_SIZE,
+            update_conflicts=True,
+            # MySQL upserts on any unique key and rejects an explicit target
+            unique_fields=(
+                ["symbol", "date"]
+                if connection.features.supports_update_conflicts_with_target
+                else None
+            ),
+            update_fields=["price", "updated_at"],
+        )
+        repriced = reprice_investments({symbol for symbol, _ in prices})
+    return len(prices), repriced
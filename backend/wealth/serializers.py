@@ -1,14 +1,81 @@
+from decimal import Decimal
+
 from rest_framework import serializers
 
-from .models import Heritage, Investment, RetirementAccount
+from .calculators import COMPOUNDING_FREQUENCIES, MAX_GROWTH_YEARS, MAX_TERM_MONTHS
+from .models import (
+    AllocationTarget,
+    Heritage,
+    Investment,
+    NetWorthSnapshot,
+    PriceQuote,
+    RetirementAccount,
+)
+from .networth import SNAPSHOT_COMPONENTS
+from .quotes import normalize_symbol
+from .valuation import (
+    ANNOTATION_PREFIX,
+    VALUATION_FIELDS,
+    is_annotated,
+    value_investments,
+)
+
+
+class AnnotatedFieldMixin:
+    """Reads a derived value from its SQL annotation (``ANNOTATION_PREFIX``
+    plus the field name) when the queryset selected one, otherwise from
+    ``get_unannotated_attribute``."""
+
+    def get_attribute(self, instance):
+        annotated = ANNOTATION_PREFIX + self.field_name
+        if hasattr(instance, annotated):
+            return getattr(instance, annotated)
+        return self.get_unannotated_attribute(instance)
+
+    def get_unannotated_attribute(self, instance):
+        return super().get_attribute(instance)
+
+
+class ValuationField(AnnotatedFieldMixin, serializers.ReadOnlyField):
+    """Derived investment value, without the per-instance model properties.
+
+    Values annotated by ``wealth.valuation.annotate_valuation`` take
+    precedence; otherwise the parent ``InvestmentSerializer`` values
+    instances in a batch.
+    """
+
+    def get_unannotated_attribute(self, instance):
+        if self.field_name in VALUATION_FIELDS:
+            return self.parent.get_valuation(instance)[self.field_name]
+        return super().get_unannotated_attribute(instance)
+
+
+class InvestmentListSerializer(serializers.ListSerializer):
+    """Values every listed investment in one batch before rendering."""
+
+    def to_representation(self, data):
+        investments = [*(data.all() if hasattr(data, "all") else data)]
+        unvalued = [i for i in investments if not is_annotated(i)]
+        if unvalued:
+            self.context.setdefault("valuations", {}).update(
+                value_investments(unvalued).by_id()
+            )
+        return super().to_representation(investments)
 
 
 class InvestmentSerializer(serializers.ModelSerializer):
-    total_invested = serializers.ReadOnlyField()
-    current_value = serializers.ReadOnlyField()
-    gain_loss = serializers.ReadOnlyField()
-    gain_loss_percentage = serializers.ReadOnlyField()
-    due_date = serializers.ReadOnlyField()
+    total_invested = ValuationField()
+    current_value = ValuationField()
+    gain_loss = ValuationField()
+    gain_loss_percentage = ValuationField()
+    due_date = ValuationField()
+
+    def get_valuation(self, instance):
+        """Precomputed values of ``instance``, valuing it on a cache miss."""
+        valuations = self.context.setdefault("valuations", {})
+        if instance.pk not in valuations or instance.pk is None:
+            valuations.update(value_investments([instance]).by_id())
+        return valuations[instance.pk]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
@@ -32,6 +99,7 @@ class InvestmentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Investment
+        list_serializer_class = InvestmentListSerializer
         fields = [
             "id",
             "user",
@@ -58,19 +126,19 @@ class InvestmentSerializer(serializers.ModelSerializer):
         read_only_fields = ["user"]
 
 
+class AnnotatedDecimalField(AnnotatedFieldMixin, serializers.DecimalField):
+    """Read-only derived decimal, read from its SQL annotation when present
+    (see ``wealth.heritage.annotate_heritage``), else from the property."""
+
+    def __init__(self, **kwargs):
+        super().__init__(read_only=True, **kwargs)
+
+
 class HeritageSerializer(serializers.ModelSerializer):
-    gain_loss = serializers.DecimalField(
-        max_digits=15, decimal_places=2, read_only=True
-    )
-    gain_loss_percentage = serializers.DecimalField(
-        max_digits=7, decimal_places=2, read_only=True
-    )
-    annual_rental_income = serializers.DecimalField(
-        max_digits=15, decimal_places=2, read_only=True
-    )
-    rental_yield_percentage = serializers.DecimalField(
-        max_digits=7, decimal_places=2, read_only=True
-    )
+    gain_loss = AnnotatedDecimalField(max_digits=15, decimal_places=2)
+    gain_loss_percentage = AnnotatedDecimalField(max_digits=7, decimal_places=2)
+    annual_rental_income = AnnotatedDecimalField(max_digits=15, decimal_places=2)
+    rental_yield_percentage = AnnotatedDecimalField(max_digits=7, decimal_places=2)
 
     class Meta:
         model = Heritage
@@ -106,3 +174,137 @@ class RetirementAccountSerializer(serializers.ModelSerializer):
         model = RetirementAccount
         fields = "__all__"
         read_only_fields = ["user"]
+
+
+class NetWorthSnapshotSerializer(serializers.ModelSerializer):
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Amounts as numbers for charting
+        for field in (*SNAPSHOT_COMPONENTS, "net_worth"):
+            data[field] = float(data[field])
+        return data
+
+    class Meta:
+        model = NetWorthSnapshot
+        fields = ["date", *SNAPSHOT_COMPONENTS, "net_worth"]
+
+
+class PriceQuoteSerializer(serializers.ModelSerializer):
+    def validate_symbol(self, value):
+        return normalize_symbol(value)
+
+    class Meta:
+        model = PriceQuote
+        fields = ["symbol", "date", "price"]
+        # Existing (symbol, date) pairs are overwritten, not rejected
+        validators = []
+
+
+class AllocationTargetListSerializer(serializers.ListSerializer):
+    """Validates new targets against the user's existing ones, loaded with
+    one query, and against each other."""
+
+    def to_internal_value(self, data):
+        self.child.taken_asset_classes = set(
+            AllocationTarget.objects.filter(
+                user=self.context["request"].user
+            ).values_list("asset_class", flat=True)
+        )
+        try:
+            return super().to_internal_value(data)
+        finally:
+            del self.child.taken_asset_classes
+
+
+class AllocationTargetSerializer(serializers.ModelSerializer):
+    def validate_asset_class(self, value):
+        taken = getattr(self, "taken_asset_classes", None)
+        if taken is None:
+            targets = AllocationTarget.objects.filter(
+                user=self.context["request"].user, asset_class=value
+            )
+            if self.instance is not None:
+                targets = targets.exclude(pk=self.instance.pk)
+            duplicate = targets.exists()
+        else:
+            duplicate = value in taken
+            taken.add(value)
+        if duplicate:
+            raise serializers.ValidationError(
+                "There already is a target for this asset class."
+            )
+        return value
+
+    def validate_target_percentage(self, value):
+        if not 0 <= value <= 100:
+            raise serializers.ValidationError("Must be between 0 and 100.")
+        return value
+
+    class Meta:
+        model = AllocationTarget
+        list_serializer_class = AllocationTargetListSerializer
+        fields = ["id", "asset_class", "target_percentage", "created_at", "updated_at"]
+
+
+def _money(**kwargs):
+    return serializers.DecimalField(max_digits=15, decimal_places=2, **kwargs)
+
+
+def _rate(**kwargs):
+    return serializers.DecimalField(
+        max_digits=7,
+        decimal_places=4,
+        min_value=Decimal("0"),
+        max_value=Decimal("100"),
+        **kwargs,
+    )
+
+
+class ExtraPaymentSerializer(serializers.Serializer):
+    month = serializers.IntegerField(min_value=1)
+    amount = _money(min_value=Decimal("0.01"))
+
+
+class RateChangeSerializer(serializers.Serializer):
+    month = serializers.IntegerField(min_value=1)
+    annual_rate = _rate()
+
+
+class AmortizationSerializer(serializers.Serializer):
+    """Parameters of ``wealth.calculators.amortization``; rates are
+    percentages and months count from the first payment."""
+
+    principal = _money(min_value=Decimal("0.01"))
+    annual_rate = _rate()
+    term_months = serializers.IntegerField(min_value=1, max_value=MAX_TERM_MONTHS)
+    extra_monthly_payment = _money(min_value=Decimal("0"), default=Decimal("0"))
+    extra_payments = ExtraPaymentSerializer(many=True, default=list)
+    rate_changes = RateChangeSerializer(many=True, default=list)
+
+    def validate(self, attrs):
+        term = attrs["term_months"]
+        for field in ("extra_payments", "rate_changes"):
+            if any(item["month"] > term for item in attrs[field]):
+                raise serializers.ValidationError(
+                    {field: [f"Months must be within the {term}-month term."]}
+                )
+        attrs["extra_payments"] = [
+            (item["month"], item["amount"]) for item in attrs["extra_payments"]
+        ]
+        attrs["rate_changes"] = [
+            (item["month"], item["annual_rate"]) for item in attrs["rate_changes"]
+        ]
+        return attrs
+
+
+class CompoundGrowthSerializer(serializers.Serializer):
+    """Parameters of ``wealth.calculators.compound_growth``."""
+
+    principal = _money(min_value=Decimal("0"))
+    monthly_contribution = _money(min_value=Decimal("0"), default=Decimal("0"))
+    annual_rate = _rate()
+    years = serializers.IntegerField(min_value=1, max_value=MAX_GROWTH_YEARS)
+    periods_per_year = serializers.ChoiceField(
+        choices=COMPOUNDING_FREQUENCIES, default=12
+    )
+    rate_variance = _rate(default=Decimal("0"))
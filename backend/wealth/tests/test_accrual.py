@@ -0,0 +1,105 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth import accrual
+from wealth.accrual import build_schedule, get_schedules
+from wealth.models import Investment
+
+
+class AccrualScheduleTest(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.bond = Investment.objects.create(
+            user=self.user,
+            symbol="CDB",
+            name="CDB",
+            investment_type=Investment.FIXED_INCOME,
+            quantity=Decimal("1"),
+            purchase_price=Decimal("0"),
+            purchase_date=date(2024, 1, 31),
+            principal_amount=Decimal("1000.00"),
+            interest_rate=Decimal("12.00"),
+            compounding_frequency="monthly",
+            term_years=Decimal("2.50"),
+        )
+
+    def test_schedule_accrues_to_maturity_value(self) -> None:
+        """Test the schedule runs from principal to the maturity value"""
+        schedule = build_schedule(self.bond)
+
+        self.assertEqual(len(schedule.days), 31)
+        self.assertEqual(schedule.value_at(date(2024, 1, 30)), 0.0)
+        self.assertEqual(schedule.value_at(date(2024, 1, 31)), 1000.0)
+        # Month ends are clamped: Jan 31 + 1 month is Feb 29
+        self.assertAlmostEqual(schedule.value_at(date(2024, 2, 29)), 1010.0)
+        self.assertAlmostEqual(
+            schedule.maturity_value, float(self.bond.current_value), places=6
+        )
+        self.assertEqual(schedule.value_at(date(2030, 1, 1)), schedule.maturity_value)
+
+    def test_interpolates_between_points(self) -> None:
+        """Test values between monthly points are interpolated"""
+        schedule = build_schedule(self.bond)
+        # Feb 29 to Mar 31 is 31 days; Mar 15 is 15 days in
+        expected = 1010.0 + (1000 * 1.01**2 - 1010.0) * 15 / 31
+        self.assertAlmostEqual(schedule.value_at(date(2024, 3, 15)), expected)
+
+    def test_incomplete_investment_stays_at_principal(self) -> None:
+        """Test an investment without a rate keeps its principal"""
+        self.bond.interest_rate = None
+        schedule = build_schedule(self.bond)
+
+        self.assertEqual(schedule.value_at(date(2026, 1, 1)), 1000.0)
+
+    def test_schedules_cached_until_updated(self) -> None:
+        """Test schedules are reused until the investment is saved again"""
+        with mock.patch.object(
+            accrual, "build_schedule", wraps=build_schedule
+        ) as build:
+            get_schedules([self.bond])
+            get_schedules([Investment.objects.get(pk=self.bond.pk)])
+            self.assertEqual(build.call_count, 1)
+
+            self.bond.interest_rate = Decimal("6.00")
+            self.bond.save()
+            schedule = get_schedules([self.bond])[self.bond.pk]
+
+        self.assertEqual(build.call_count, 2)
+        self.assertAlmostEqual(
+            schedule.maturity_value, float(self.bond.current_value), places=6
+        )
+
+    def test_accrued_endpoint(self) -> None:
+        """Test fixed-income values as of a date"""
+        response = self.client.get(
+            "/api/v1/investments/accrued/", {"date": "2024-02-29"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["date"], date(2024, 2, 29))
+        self.assertAlmostEqual(response.data["total"], 1010.0)
+        (row,) = response.data["investments"]
+        self.assertEqual(row["symbol"], "CDB")
+        self.assertAlmostEqual(
+            row["maturity_value"], float(self.bond.current_value), places=6
+        )
+
+    def test_accrued_endpoint_invalid_date(self) -> None:
+        """Test an invalid date is rejected"""
+        for value in ("soon", "2024-02-30"):
+            response = self.client.get("/api/v1/investments/accrued/", {"date": value})
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
@@ -0,0 +1,209 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth.allocation import allocation, portfolio_allocation, rebalancing_trades
+from wealth.models import AllocationTarget, Heritage, Investment, RetirementAccount
+
+
+class AllocationTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        # 60,000 in stocks, 10,000 in bonds, 20,000 in real estate and
+        # 10,000 in retirement accounts
+        self._investment("AAPL", Investment.STOCK, "100", "400")
+        self._investment("MSFT", Investment.STOCK, "50", "400")
+        self._investment("BND", Investment.BOND, "100", "100")
+        Heritage.objects.create(
+            user=self.user,
+            name="Plot",
+            heritage_type=Heritage.LAND,
+            address="Main St",
+            purchase_price=Decimal("20000"),
+            purchase_date=date(2020, 1, 1),
+        )
+        RetirementAccount.objects.create(
+            user=self.user,
+            name="401k",
+            account_type=RetirementAccount.TRADITIONAL_401K,
+            current_balance=Decimal("10000"),
+        )
+        other = User.objects.create_user(username="other", password="testpass123")
+        self._investment("NVDA", Investment.STOCK, "1", "1000", user=other)
+
+    def _investment(self, symbol, investment_type, quantity, price, user=None):
+        return Investment.objects.create(
+            user=user or self.user,
+            symbol=symbol,
+            name=symbol,
+            investment_type=investment_type,
+            quantity=Decimal(quantity),
+            purchase_price=Decimal("1"),
+            current_price=Decimal(price),
+            purchase_date=date(2025, 1, 1),
+        )
+
+    def _targets(self, **targets):
+        AllocationTarget.objects.bulk_create(
+            AllocationTarget(
+                user=self.user, asset_class=asset_class, target_percentage=percentage
+            )
+            for asset_class, percentage in targets.items()
+        )
+
+    def test_weights_across_models(self) -> None:
+        """Test each model is valued per asset class in a few queries"""
+        with self.assertNumQueries(4):
+            result = portfolio_allocation(self.user)
+
+        self.assertEqual(result["total_value"], 100000.0)
+        self.assertEqual(
+            [
+                (row["asset_class"], row["count"], row["weight"])
+                for row in result["allocation"]
+            ],
+            [
+                (Investment.STOCK, 2, 60.0),
+                (Investment.BOND, 1, 10.0),
+                (AllocationTarget.REAL_ESTATE, 1, 20.0),
+                (AllocationTarget.RETIREMENT, 1, 10.0),
+            ],
+        )
+        self.assertIsNone(result["allocation"][0]["target_weight"])
+        self.assertIsNone(result["trades"])
+
+    def test_trades_reach_targets(self) -> None:
+        """Test the trades move every class to its target"""
+        self._targets(stock=40, bond=30, etf=10, real_estate=20)
+
+        result = portfolio_allocation(self.user)
+
+        rows = {row["asset_class"]: row for row in result["allocation"]}
+        self.assertEqual(rows["etf"]["value"], 0.0)
+        self.assertEqual(rows["stock"]["drift"], 20.0)
+        self.assertEqual(rows["retirement"]["target_weight"], 0.0)
+        self.assertEqual(rows["bond"]["difference"], 20000.0)
+        self.assertEqual(
+            result["trades"],
+            [
+                {"sell": "stock", "buy": "bond", "amount": 20000.0},
+                {"sell": "retirement", "buy": "etf", "amount": 10000.0},
+            ],
+        )
+
+    def test_targets_must_add_up(self) -> None:
+        """Test no trades are proposed for targets not adding up to 100%"""
+        self._targets(stock=50, bond=30)
+
+        result = portfolio_allocation(self.user)
+
+        self.assertEqual(result["targets_total"], 80.0)
+        self.assertIsNone(result["trades"])
+        self.assertEqual(result["allocation"][0]["drift"], 10.0)
+
+    def test_fewest_trades(self) -> None:
+        """Test sales are paired with purchases, largest first"""
+        trades = rebalancing_trades(
+            {"a": -300.0, "b": -100.0, "c": 250.0, "d": 150.0, "e": 0.001}
+        )
+
+        self.assertEqual(
+            trades,
+            [
+                {"sell": "a", "buy": "c", "amount": 250.0},
+                {"sell": "a", "buy": "d", "amount": 50.0},
+                {"sell": "b", "buy": "d", "amount": 100.0},
+            ],
+        )
+        self.assertEqual(allocation({}, {"stock": 100})["trades"], [])
+
+    def test_rebalance_endpoint(self) -> None:
+        """Test targets are managed per user and drive the rebalance"""
+        response = self.client.post(
+            "/api/v1/allocation-targets/bulk/",
+            [
+                {"asset_class": "stock", "target_percentage": "50"},
+                {"asset_class": "bond", "target_percentage": "20"},
+                {"asset_class": "real_estate", "target_percentage": "20"},
+                {"asset_class": "retirement", "target_percentage": "10"},
+            ],
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        response = self.client.get("/api/v1/allocation-targets/rebalance/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["targets_total"], 100.0)
+        self.assertEqual(
+            response.data["trades"],
+            [{"sell": "stock", "buy": "bond", "amount": 10000.0}],
+        )
+
+        self.client.force_authenticate(user=User.objects.get(username="other"))
+        response = self.client.get("/api/v1/allocation-targets/rebalance/")
+        self.assertEqual(response.data["total_value"], 1000.0)
+        self.assertIsNone(response.data["trades"])
+
+    def test_target_validation(self) -> None:
+        """Test one target per asset class, within 0-100%"""
+        self._targets(stock=50)
+
+        response = self.client.post(
+            "/api/v1/allocation-targets/",
+            {"asset_class": "stock", "target_percentage": "10"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("asset_class", response.data)
+
+        response = self.client.post(
+            "/api/v1/allocation-targets/",
+            {"asset_class": "bond", "target_percentage": "120"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("target_percentage", response.data)
+
+        target = AllocationTarget.objects.get(asset_class="stock")
+        response = self.client.patch(
+            f"/api/v1/allocation-targets/{target.id}/",
+            {"asset_class": "stock", "target_percentage": "60"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_target_validation(self) -> None:
+        """Test a batch is checked against existing targets with one query"""
+        self._targets(stock=50)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                "/api/v1/allocation-targets/bulk/",
+                [
+                    {"asset_class": "bond", "target_percentage": "20"},
+                    {"asset_class": "stock", "target_percentage": "10"},
+                    {"asset_class": "bond", "target_percentage": "30"},
+                    {"asset_class": "etf", "target_percentage": "5"},
+                ],
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            [sorted(errors) for errors in response.data["errors"]],
+            [[], ["asset_class"], ["asset_class"], []],
+        )
+        self.assertEqual(
+            sum("allocationtarget" in query["sql"] for query in queries), 1
+        )
+        self.assertEqual(AllocationTarget.objects.count(), 1)
@@ -0,0 +1,220 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth import calculators
+from wealth.calculators import amortization, amortization_schedule, compound_growth
+
+
+class AmortizationTest(APITestCase):
+    def setUp(self) -> None:
+        calculators._amortize.cache_clear()
+        self.addCleanup(calculators._amortize.cache_clear)
+
+    def test_level_payment_schedule(self) -> None:
+        """Test a plain loan matches the loan calculator page's payment"""
+        schedule = amortization_schedule(300000, "6.5", 360)
+        rate = 6.5 / 1200
+        factor = (1 + rate) ** 360
+
+        self.assertEqual(
+            schedule.monthly_payment, round(300000 * rate * factor / (factor - 1), 2)
+        )
+        self.assertEqual(schedule.months, 360)
+        monthly = schedule.monthly.as_dict()
+        self.assertEqual(monthly["month"][:2], (1, 2))
+        self.assertEqual(monthly["interest"][0], 1625.0)
+        self.assertEqual(monthly["balance"][-1], 0.0)
+        self.assertAlmostEqual(sum(monthly["principal"]), 300000, places=1)
+        yearly = schedule.yearly.as_dict()
+        self.assertEqual(yearly["year"], tuple(range(1, 31)))
+        self.assertEqual(yearly["balance"][0], monthly["balance"][11])
+
+    def test_extra_payments_shorten_the_loan(self) -> None:
+        """Test extra payments go to principal and are compared with none"""
+        result = amortization(
+            principal=100000,
+            annual_rate=5,
+            term_months=120,
+            extra_monthly_payment=100,
+            extra_payments={12: 20000},
+        )
+
+        summary = result["summary"]
+        plain = amortization_schedule(100000, 5, 120)
+        self.assertEqual(summary["monthly_payment"], plain.monthly_payment)
+        self.assertEqual(summary["months"], 120 - summary["months_saved"])
+        self.assertGreater(summary["months_saved"], 24)
+        self.assertAlmostEqual(
+            summary["interest_saved"], plain.total_interest - summary["total_interest"]
+        )
+        self.assertEqual(
+            result["monthly"]["payment"][11],
+            round(plain.monthly_payment + 100 + 20000, 2),
+        )
+        self.assertEqual(result["monthly"]["balance"][-1], 0.0)
+
+    def test_rate_change_recomputes_payment(self) -> None:
+        """Test a new rate re-levels the payment over the remaining term"""
+        schedule = amortization_schedule(200000, 4, 360, rate_changes=[(61, 7)])
+        monthly = schedule.monthly.as_dict()
+        remaining = monthly["balance"][59]
+
+        self.assertEqual(monthly["payment"][59], schedule.monthly_payment)
+        self.assertAlmostEqual(
+            monthly["payment"][60],
+            calculators.level_payment(remaining, 7 / 1200, 300),
+            delta=0.01,
+        )
+        self.assertEqual(monthly["interest"][60], round(remaining * 7 / 1200, 2))
+        self.assertEqual(schedule.months, 360)
+
+    def test_rate_change_keeps_extra_payments_on_top(self) -> None:
+        """Test extra payments don't lower the re-leveled payment"""
+        result = amortization(
+            principal=200000,
+            annual_rate=4,
+            term_months=360,
+            extra_monthly_payment=100,
+            rate_changes={61: 8},
+        )
+        plain = amortization_schedule(200000, 4, 360, rate_changes={61: 8})
+        monthly = plain.monthly.as_dict()
+
+        for month in (59, 60, 200):
+            self.assertAlmostEqual(
+                result["monthly"]["payment"][month],
+                monthly["payment"][month] + 100,
+                delta=0.01,
+            )
+        self.assertLess(result["summary"]["months"], 360)
+        self.assertGreater(result["summary"]["interest_saved"], 0)
+
+    def test_without_numpy(self) -> None:
+        """Test the pure Python schedule matches the NumPy one"""
+        parameters = {
+            "principal": 250000,
+            "annual_rate": 6,
+            "term_months": 360,
+            "extra_payments": [(24, 5000)],
+            "rate_changes": {84: 8, 120: 0},
+        }
+        vectorized = amortization(**parameters)
+        calculators._amortize.cache_clear()
+        with mock.patch("wealth.calculators.np", None):
+            looped = amortization(**parameters)
+
+        self.assertEqual(looped["summary"], vectorized["summary"])
+        for column, values in vectorized["monthly"].items():
+            for a, b in zip(looped["monthly"][column], values, strict=True):
+                self.assertAlmostEqual(a, b, delta=0.01)
+
+    def test_schedules_are_memoized(self) -> None:
+        """Test equal parameters are computed once"""
+        first = amortization_schedule(100000, 5, 360, extra_payments={12: 1000})
+        second = amortization_schedule(
+            "100000.00", 5.0, 360, extra_payments=[(12, 1000)]
+        )
+
+        self.assertIs(first, second)
+        self.assertEqual(calculators._amortize.cache_info().hits, 1)
+
+
+class CompoundGrowthTest(APITestCase):
+    def test_matches_calculator_page(self) -> None:
+        """Test monthly compounding uses the calculator page's formula"""
+        table = compound_growth(10000, 500, 7, 30)
+        factor = (1 + 0.07 / 12) ** (12 * 30)
+        expected = 10000 * factor + 500 * 12 * (factor - 1) / 0.07
+
+        self.assertAlmostEqual(table.final_balance, expected, delta=0.01)
+        self.assertEqual(table.total_contributions, 190000.0)
+        yearly = table.yearly.as_dict()
+        self.assertEqual(list(yearly), ["year", "balance", "contributions", "interest"])
+        self.assertEqual(yearly["balance"][0], 10000.0)
+        self.assertEqual(yearly["interest"][0], 0.0)
+        self.assertEqual(len(yearly["year"]), 31)
+
+    def test_rate_variance_and_zero_rate(self) -> None:
+        """Test the variance columns and growth without interest"""
+        yearly = compound_growth(1000, 100, 1, 10, 4, rate_variance=2).yearly.as_dict()
+        self.assertEqual(yearly["balance_low"][-1], 1000 + 100 * 12 * 10)
+        self.assertGreater(yearly["balance_high"][-1], yearly["balance"][-1])
+
+        with mock.patch("wealth.calculators.np", None):
+            table = compound_growth(1000, 100, 0, 5, 365)
+        self.assertEqual(table.total_interest, 0.0)
+
+
+class CalculatorEndpointTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_amortization_endpoint(self) -> None:
+        """Test a schedule is returned as column arrays"""
+        response = self.client.post(
+            "/api/v1/calculators/amortization/",
+            {
+                "principal": "25000",
+                "annual_rate": "7.5",
+                "term_months": 60,
+                "extra_payments": [{"month": 12, "amount": "1000"}],
+                "rate_changes": [{"month": 25, "annual_rate": "6"}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            list(response.data["monthly"]),
+            ["month", "payment", "principal", "interest", "balance"],
+        )
+        months = response.data["summary"]["months"]
+        self.assertEqual(len(response.data["monthly"]["balance"]), months)
+        self.assertGreater(response.data["summary"]["interest_saved"], 0)
+
+    def test_amortization_endpoint_validation(self) -> None:
+        """Test invalid parameters are reported by field"""
+        response = self.client.post(
+            "/api/v1/calculators/amortization/",
+            {
+                "principal": "25000",
+                "annual_rate": "7.5",
+                "term_months": 60,
+                "extra_payments": [{"month": 61, "amount": "1000"}],
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("extra_payments", response.data["errors"])
+
+        response = self.client.post(
+            "/api/v1/calculators/amortization/",
+            {"principal": "-1", "annual_rate": "7.5", "term_months": 601},
+            format="json",
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data["errors"]), {"principal", "term_months"})
+
+    def test_compound_growth_endpoint(self) -> None:
+        """Test growth tables and the allowed compounding frequencies"""
+        url = "/api/v1/calculators/compound-growth/"
+        data = {"principal": "1000", "annual_rate": "5", "years": 20}
+
+        response = self.client.post(url, {**data, "periods_per_year": 1}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(
+            response.data["summary"]["final_balance"], 1000 * 1.05**20, places=2
+        )
+        self.assertEqual(len(response.data["yearly"]["year"]), 21)
+
+        response = self.client.post(url, {**data, "periods_per_year": 3}, format="json")
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("periods_per_year", response.data["errors"])
@@ -0,0 +1,110 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth.heritage import HERITAGE_FIELDS, annotate_heritage, heritage_summary
+from wealth.models import Heritage
+from wealth.serializers import HeritageSerializer
+
+
+class HeritageAggregatesTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self._heritage("Flat", Heritage.APARTMENT, "100000", "120000", "800")
+        self._heritage("Studio", Heritage.APARTMENT, "50000", "40000", "500")
+        self._heritage("House", Heritage.HOUSE, "200000", None, "1000")
+        self._heritage("Plot", Heritage.LAND, "0", "30000", "0")
+        other = User.objects.create_user(username="other", password="testpass123")
+        self._heritage("Other", Heritage.HOUSE, "1", "2", "3", user=other)
+
+    def _heritage(self, name, heritage_type, price, value, rent, user=None):
+        return Heritage.objects.create(
+            user=user or self.user,
+            name=name,
+            heritage_type=heritage_type,
+            address="Main St",
+            purchase_price=Decimal(price),
+            current_value=Decimal(value) if value else None,
+            monthly_rental_income=Decimal(rent),
+            purchase_date=date(2020, 1, 1),
+        )
+
+    def test_annotations_match_properties(self) -> None:
+        """Test SQL-computed values serialize like the model properties"""
+        for heritage in annotate_heritage(Heritage.objects.all()):
+            annotated = HeritageSerializer(heritage).data
+            plain = HeritageSerializer(Heritage.objects.get(pk=heritage.pk)).data
+            for field in HERITAGE_FIELDS:
+                self.assertEqual(annotated[field], plain[field], (heritage, field))
+
+    def test_summary_weights_yield_by_value(self) -> None:
+        """Test totals and value-weighted yields per heritage type"""
+        summary = heritage_summary(Heritage.objects.filter(user=self.user))
+
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["total_purchase_price"], 350000.0)
+        # The house has no current value and counts at its purchase price
+        self.assertEqual(summary["total_current_value"], 390000.0)
+        self.assertEqual(summary["gain_loss"], 40000.0)
+        self.assertEqual(summary["annual_rental_income"], 27600.0)
+        # The house's rent is left out: it has no value to yield on
+        self.assertAlmostEqual(summary["rental_yield_percentage"], 15600 * 100 / 190000)
+
+        land, house, apartments = summary["by_type"]
+        self.assertEqual(apartments["heritage_type"], Heritage.APARTMENT)
+        self.assertEqual(apartments["count"], 2)
+        self.assertAlmostEqual(apartments["rental_yield_percentage"], 9.75)
+        self.assertAlmostEqual(apartments["gain_loss_percentage"], 10000 * 100 / 150000)
+        self.assertEqual(house["rental_yield_percentage"], 0.0)
+        self.assertEqual(land["gain_loss_percentage"], 0.0)
+
+    def test_summary_endpoint(self) -> None:
+        """Test the summary only covers the user's properties"""
+        response = self.client.get("/api/v1/heritages/summary/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual(len(response.data["by_type"]), 3)
+
+        self.client.force_authenticate(
+            user=User.objects.create_user(username="new", password="testpass123")
+        )
+        response = self.client.get("/api/v1/heritages/summary/")
+        self.assertEqual(response.data["count"], 0)
+        self.assertEqual(response.data["by_type"], [])
+
+    def test_order_by_yield(self) -> None:
+        """Test listings can be sorted by the derived values"""
+        response = self.client.get(
+            "/api/v1/heritages/", {"ordering": "-rental_yield_percentage,name"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["name"] for row in response.data["results"]],
+            ["Studio", "Flat", "House", "Plot"],
+        )
+        self.assertEqual(
+            response.data["results"][0]["rental_yield_percentage"], "15.00"
+        )
+
+    def test_update_response_is_recomputed(self) -> None:
+        """Test an update responds with the values of the saved property"""
+        flat = Heritage.objects.get(name="Flat")
+        response = self.client.patch(
+            f"/api/v1/heritages/{flat.pk}/",
+            {"current_value": "150000", "monthly_rental_income": "1000"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["gain_loss"], "50000.00")
+        self.assertEqual(response.data["annual_rental_income"], "12000.00")
+        self.assertEqual(response.data["rental_yield_percentage"], "8.00")
@@ -0,0 +1,129 @@
+import io
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from budget.models import BankAccount, Category, Transaction
+from wealth.models import Heritage, Investment, NetWorthSnapshot, RetirementAccount
+from wealth.networth import take_snapshots
+
+
+class NetWorthSnapshotTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self._account(BankAccount.CHECKING, "1000.00", "-200.00")
+        self._account(BankAccount.CREDIT_CARD, "-300.00")
+        # A card in credit still counts as its own (absolute) balance
+        self._account(BankAccount.CREDIT_CARD, "50.00")
+        Investment.objects.create(
+            user=self.user,
+            symbol="AAPL",
+            name="Apple",
+            quantity=Decimal("10"),
+            purchase_price=Decimal("100.0000"),
+            current_price=Decimal("120.0000"),
+            purchase_date=date(2025, 1, 1),
+        )
+        Heritage.objects.create(
+            user=self.user,
+            name="House",
+            address="Main St",
+            purchase_price=Decimal("5000.00"),
+            purchase_date=date(2020, 1, 1),
+        )
+        RetirementAccount.objects.create(
+            user=self.user,
+            name="401k",
+            provider="Fidelity",
+            current_balance=Decimal("3000.00"),
+        )
+
+    def _account(self, account_type, *amounts, user=None):
+        user = user or self.user
+        account = BankAccount.objects.create(
+            user=user,
+            name=f"{account_type} {BankAccount.objects.count()}",
+            account_type=account_type,
+        )
+        category, _ = Category.objects.get_or_create(user=user, name="General")
+        for amount in amounts:
+            Transaction.objects.create(
+                user=user,
+                account=account,
+                category=category,
+                amount=Decimal(amount),
+                description="Row",
+                date=date(2025, 1, 1),
+            )
+
+    def test_snapshot_components(self) -> None:
+        """Test snapshots hold each net worth component"""
+        other = User.objects.create_user(username="other", password="testpass123")
+        self._account(BankAccount.SAVINGS, "10.00", user=other)
+
+        with self.assertNumQueries(5):
+            take_snapshots([self.user.pk, other.pk], date(2026, 1, 1))
+
+        snapshot = NetWorthSnapshot.objects.get(user=self.user)
+        self.assertEqual(snapshot.cash, Decimal("800.00"))
+        self.assertEqual(snapshot.liabilities, Decimal("350.00"))
+        self.assertEqual(snapshot.investments, Decimal("1200.00"))
+        self.assertEqual(snapshot.real_estate, Decimal("5000.00"))
+        self.assertEqual(snapshot.retirement, Decimal("3000.00"))
+        self.assertEqual(snapshot.net_worth, Decimal("9650.00"))
+        self.assertEqual(
+            NetWorthSnapshot.objects.get(user=other).net_worth, Decimal("10.00")
+        )
+
+    def test_command_updates_same_day(self) -> None:
+        """Test re-running the command overwrites the day's snapshot"""
+        call_command("snapshot_net_worth", stdout=io.StringIO())
+        RetirementAccount.objects.update(current_balance=Decimal("4000.00"))
+        call_command("snapshot_net_worth", "--user", "testuser", stdout=io.StringIO())
+
+        (snapshot,) = NetWorthSnapshot.objects.filter(user=self.user)
+        self.assertEqual(snapshot.date, timezone.localdate())
+        self.assertEqual(snapshot.retirement, Decimal("4000.00"))
+        self.assertEqual(snapshot.net_worth, Decimal("10650.00"))
+
+    def test_upsert_without_conflict_target(self) -> None:
+        """Test no conflict target is passed where the database rejects it"""
+        with mock.patch.object(
+            connection.features, "supports_update_conflicts_with_target", False
+        ):
+            take_snapshots([self.user.pk], date(2026, 1, 1))
+
+        snapshot = NetWorthSnapshot.objects.get(user=self.user)
+        self.assertEqual(snapshot.net_worth, Decimal("9650.00"))
+
+    def test_history_endpoint(self) -> None:
+        """Test the history lists the user's snapshots in date order"""
+        for day in (date(2026, 1, 3), date(2026, 1, 1), date(2026, 1, 2)):
+            take_snapshots([self.user.pk], day)
+        other = User.objects.create_user(username="other", password="testpass123")
+        take_snapshots([other.pk], date(2026, 1, 2))
+
+        response = self.client.get("/api/v1/net-worth-snapshots/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["date"] for row in response.data],
+            ["2026-01-01", "2026-01-02", "2026-01-03"],
+        )
+        self.assertEqual(response.data[0]["net_worth"], 9650.0)
+
+        response = self.client.get(
+            "/api/v1/net-worth-snapshots/", {"date__gte": "2026-01-02"}
+        )
+        self.assertEqual(len(response.data), 2)
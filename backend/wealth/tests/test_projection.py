@@ -0,0 +1,187 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth import projection
+from wealth.models import RetirementAccount
+from wealth.projection import project, projection_inputs, simulate
+
+
+class RetirementProjectionTest(APITestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.account = RetirementAccount.objects.create(
+            user=self.user,
+            name="401k",
+            provider="Fidelity",
+            current_balance=Decimal("10000.00"),
+            monthly_contribution=Decimal("500.00"),
+            employer_match_percentage=Decimal("0.50"),
+            employer_match_limit=Decimal("2000.00"),
+            risk_level=RetirementAccount.AGGRESSIVE,
+        )
+        RetirementAccount.objects.create(
+            user=self.user,
+            name="IRA",
+            provider="Vanguard",
+            current_balance=Decimal("5000.00"),
+            risk_level=RetirementAccount.CONSERVATIVE,
+        )
+
+    def test_without_volatility_matches_compound_growth(self) -> None:
+        """Test a zero-volatility path equals the yearly balance recursion"""
+        inputs = projection_inputs([self.account])
+        with mock.patch.dict(
+            projection.RISK_ASSUMPTIONS, {RetirementAccount.AGGRESSIVE: (0.08, 0.0)}
+        ):
+            totals = simulate(inputs, years=5, paths=3, seed=1)
+
+        self.assertEqual(totals.shape, (3, 6))
+        balance = 10000.0
+        for year in range(6):
+            self.assertAlmostEqual(totals[0, year], balance, places=6)
+            # 6000 contributed plus a 50% employer match, capped at 2000
+            balance = balance * 1.08 + 8000
+
+    def test_accounts_summed_per_risk_level(self) -> None:
+        """Test accounts at one risk level project as a single account"""
+        inputs = [
+            {
+                "id": 1,
+                "balance": 1000.0,
+                "contribution": 100.0,
+                "risk_level": "conservative",
+            },
+            {
+                "id": 2,
+                "balance": 2000.0,
+                "contribution": 0.0,
+                "risk_level": "aggressive",
+            },
+            {
+                "id": 3,
+                "balance": 3000.0,
+                "contribution": 50.0,
+                "risk_level": "conservative",
+            },
+            {"id": 4, "balance": 500.0, "contribution": 10.0, "risk_level": "unknown"},
+            {"id": 5, "balance": 10.0, "contribution": 5.0, "risk_level": "moderate"},
+        ]
+        merged = [
+            {
+                "id": 1,
+                "balance": 4000.0,
+                "contribution": 150.0,
+                "risk_level": "conservative",
+            },
+            {
+                "id": 2,
+                "balance": 2000.0,
+                "contribution": 0.0,
+                "risk_level": "aggressive",
+            },
+            {"id": 4, "balance": 510.0, "contribution": 15.0, "risk_level": "moderate"},
+        ]
+
+        totals = simulate(inputs, years=10, paths=50, seed=7)
+
+        self.assertEqual(totals.shape, (50, 11))
+        for row, expected in zip(
+            totals, simulate(merged, years=10, paths=50, seed=7), strict=True
+        ):
+            for value, merged_value in zip(row, expected, strict=True):
+                self.assertAlmostEqual(value, merged_value, places=6)
+
+    def test_bands_are_ordered_and_deterministic(self) -> None:
+        """Test percentile bands are sorted and repeatable"""
+        accounts = RetirementAccount.objects.filter(user=self.user)
+        result = project(accounts, years=10, paths=2000, start_year=2026)
+
+        self.assertEqual(len(result["bands"]), 11)
+        self.assertEqual(result["bands"][0]["year"], 2026)
+        self.assertEqual(result["bands"][0]["p50"], 15000.0)
+        last = result["bands"][-1]
+        self.assertLess(last["p10"], last["p25"])
+        self.assertLess(last["p25"], last["p50"])
+        self.assertLess(last["p50"], last["p75"])
+        self.assertLess(last["p75"], last["p90"])
+
+        cache.clear()
+        self.assertEqual(
+            project(accounts, years=10, paths=2000, start_year=2026), result
+        )
+
+    def test_results_cached_by_inputs(self) -> None:
+        """Test projections are reused until an input changes"""
+        with mock.patch.object(projection, "simulate", wraps=simulate) as run:
+            project([self.account], years=5, paths=500)
+            project([RetirementAccount.objects.get(pk=self.account.pk)], 5, 500)
+            self.assertEqual(run.call_count, 1)
+
+            self.account.current_balance = Decimal("20000.00")
+            project([self.account], years=5, paths=500)
+            project([self.account], years=6, paths=500)
+
+        self.assertEqual(run.call_count, 3)
+
+    def test_projection_endpoints(self) -> None:
+        """Test the per-account and combined projections"""
+        response = self.client.get(
+            f"/api/v1/retirement-accounts/{self.account.pk}/projection/",
+            {"years": 20, "paths": 1000},
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["bands"]), 21)
+        self.assertEqual(response.data["bands"][0]["p90"], 10000.0)
+
+        response = self.client.get("/api/v1/retirement-accounts/projection/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["paths"], 10000)
+        self.assertEqual(response.data["bands"][0]["p10"], 15000.0)
+
+    def test_projection_other_users_account(self) -> None:
+        """Test another user's account cannot be projected"""
+        other = User.objects.create_user(username="other", password="testpass123")
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get(
+            f"/api/v1/retirement-accounts/{self.account.pk}/projection/"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_projection_invalid_parameters(self) -> None:
+        """Test out-of-range or malformed parameters are rejected"""
+        for params in (
+            {"years": 0},
+            {"years": 61},
+            {"paths": 10},
+            {"paths": 20001},
+            {"paths": "many"},
+        ):
+            response = self.client.get(
+                "/api/v1/retirement-accounts/projection/", params
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertIn("error", response.data)
+
+    def test_projection_without_numpy(self) -> None:
+        """Test the endpoint reports that NumPy is required"""
+        with mock.patch("wealth.projection.np", None):
+            response = self.client.get("/api/v1/retirement-accounts/projection/")
+
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertIn("error", response.data)
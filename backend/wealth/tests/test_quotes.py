@@ -0,0 +1,222 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from core.throttles import BulkOperationThrottle
+from wealth.models import Investment, PriceQuote
+from wealth.quotes import latest_quotes, upsert_quotes
+
+
+class PriceQuoteTest(APITestCase):
+    def setUp(self) -> None:
+        # Bulk requests are throttled through the cache
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.staff = User.objects.create_user(
+            username="feed", password="testpass123", is_staff=True
+        )
+        self.client.force_authenticate(user=self.staff)
+        self.apple = self._investment(self.user, "aapl")
+        self.other_apple = self._investment(self.staff, "AAPL")
+        self.msft = self._investment(self.user, "MSFT")
+
+    def _investment(self, user, symbol, **fields):
+        return Investment.objects.create(
+            user=user,
+            symbol=symbol,
+            name=symbol,
+            quantity=Decimal("10"),
+            purchase_price=Decimal("100.0000"),
+            purchase_date=date(2025, 1, 1),
+            **fields,
+        )
+
+    def test_upsert_reprices_all_holders(self) -> None:
+        """Test one quote batch updates every user's holdings of a symbol"""
+        written, repriced = upsert_quotes(
+            [
+                ("AAPL", date(2026, 1, 2), Decimal("190.5")),
+                ("aapl", date(2026, 1, 1), Decimal("180")),
+                ("NVDA", date(2026, 1, 2), Decimal("500")),
+            ]
+        )
+
+        self.assertEqual((written, repriced), (3, 2))
+        self.apple.refresh_from_db()
+        self.other_apple.refresh_from_db()
+        self.msft.refresh_from_db()
+        self.assertEqual(self.apple.current_price, Decimal("190.5000"))
+        self.assertEqual(self.other_apple.current_price, Decimal("190.5000"))
+        self.assertIsNone(self.msft.current_price)
+
+    def test_upsert_overwrites_existing_quotes(self) -> None:
+        """Test re-sending a day overwrites it and older days don't win"""
+        upsert_quotes([("AAPL", date(2026, 1, 2), Decimal("190"))])
+        upsert_quotes(
+            [
+                ("AAPL", date(2026, 1, 2), Decimal("191")),
+                ("AAPL", date(2026, 1, 2), Decimal("192")),
+                ("AAPL", date(2025, 12, 31), Decimal("150")),
+            ]
+        )
+
+        self.assertEqual(PriceQuote.objects.count(), 2)
+        self.assertEqual(latest_quotes(["aapl"])["AAPL"].price, Decimal("192.0000"))
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.current_price, Decimal("192.0000"))
+
+    def test_upsert_without_conflict_target(self) -> None:
+        """Test no conflict target is passed where the database rejects it"""
+        with mock.patch.object(
+            connection.features, "supports_update_conflicts_with_target", False
+        ):
+            written, repriced = upsert_quotes([("AAPL", date(2026, 1, 2), "190")])
+
+        self.assertEqual((written, repriced), (1, 2))
+        self.apple.refresh_from_db()
+        self.assertEqual(self.apple.current_price, Decimal("190.0000"))
+
+    def test_fixed_income_not_repriced(self) -> None:
+        """Test fixed-income holdings keep their own valuation"""
+        bond = self._investment(
+            self.user, "CDB", investment_type=Investment.FIXED_INCOME
+        )
+        upsert_quotes([("CDB", date(2026, 1, 2), Decimal("5"))])
+
+        bond.refresh_from_db()
+        self.assertIsNone(bond.current_price)
+
+    def test_bulk_endpoint(self) -> None:
+        """Test quotes are published in one request"""
+        quotes = [
+            {"symbol": "msft", "date": f"2026-01-{day:02d}", "price": f"{400 + day}"}
+            for day in range(1, 29)
+        ]
+
+        response = self.client.post("/api/v1/price-quotes/bulk/", quotes, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {"quotes": 28, "investments_repriced": 1})
+        self.msft.refresh_from_db()
+        self.assertEqual(self.msft.current_price, Decimal("428.0000"))
+
+    def test_bulk_endpoint_reports_invalid_quotes(self) -> None:
+        """Test invalid quotes are reported by position and nothing is saved"""
+        quotes = [
+            {"symbol": "AAPL", "date": "2026-01-02", "price": "190"},
+            {"symbol": "AAPL", "date": "soon", "price": "190"},
+        ]
+
+        response = self.client.post("/api/v1/price-quotes/bulk/", quotes, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data["errors"][0], {})
+        self.assertIn("date", response.data["errors"][1])
+        self.assertFalse(PriceQuote.objects.exists())
+
+        response = self.client.post(
+            "/api/v1/price-quotes/bulk/", {"symbol": "AAPL"}, format="json"
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_bulk_endpoint_staff_only(self) -> None:
+        """Test only staff users can publish quotes"""
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.post(
+            "/api/v1/price-quotes/bulk/",
+            [{"symbol": "AAPL", "date": "2026-01-02", "price": "1"}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.assertFalse(PriceQuote.objects.exists())
+
+    def test_bulk_endpoint_throttled(self) -> None:
+        """Test quote batches count against the bulk operation rate"""
+        quotes = [{"symbol": "AAPL", "date": "2026-01-02", "price": "1"}]
+        with mock.patch.object(BulkOperationThrottle, "rate", "1/hour"):
+            first = self.client.post(
+                "/api/v1/price-quotes/bulk/", quotes, format="json"
+            )
+            second = self.client.post(
+                "/api/v1/price-quotes/bulk/", quotes, format="json"
+            )
+
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(second.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def test_new_investment_starts_at_latest_quote(self) -> None:
+        """Test an investment created without a price uses the latest quote"""
+        upsert_quotes([("NVDA", date(2026, 1, 2), Decimal("500"))])
+
+        response = self.client.post(
+            "/api/v1/investments/",
+            {
+                "symbol": "nvda",
+                "name": "Nvidia",
+                "quantity": "2",
+                "purchase_price": "400",
+                "purchase_date": "2025-06-01",
+            },
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Decimal(response.data["current_price"]), Decimal("500"))
+
+    def test_latest_endpoint(self) -> None:
+        """Test the latest quotes default to the user's symbols"""
+        upsert_quotes(
+            [
+                ("AAPL", date(2026, 1, 1), Decimal("180")),
+                ("AAPL", date(2026, 1, 2), Decimal("190")),
+                ("MSFT", date(2026, 1, 1), Decimal("400")),
+                ("NVDA", date(2026, 1, 2), Decimal("500")),
+            ]
+        )
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get("/api/v1/price-quotes/latest/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row["symbol"], row["date"]) for row in response.data],
+            [("AAPL", "2026-01-02"), ("MSFT", "2026-01-01")],
+        )
+
+        response = self.client.get(
+            "/api/v1/price-quotes/latest/", {"symbols": "nvda, TSLA"}
+        )
+        self.assertEqual([row["symbol"] for row in response.data], ["NVDA"])
+
+    def test_bulk_created_investments_start_at_latest_quote(self) -> None:
+        """Test bulk-created investments without a price use the latest quote"""
+        upsert_quotes([("NVDA", date(2026, 1, 2), Decimal("500"))])
+        item = {"quantity": "1", "purchase_price": "1", "purchase_date": "2025-06-01"}
+
+        response = self.client.post(
+            "/api/v1/investments/bulk/",
+            [
+                {"symbol": "NVDA", "name": "Nvidia", **item},
+                {"symbol": "TSLA", "name": "Tesla", **item},
+                {"symbol": "nvda2", "name": "Other", "current_price": "3", **item},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [row["current_price"] for row in response.data],
+            [500.0, None, 3.0],
+        )
@@ -0,0 +1,230 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth.models import User
+
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from wealth.models import Investment
+from wealth.valuation import (
+    ANNOTATION_PREFIX,
+    VALUATION_FIELDS,
+    annotate_valuation,
+    value_investments,
+)
+
+
+class PortfolioValuationTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        self.client.force_authenticate(user=self.user)
+        self.investments = [
+            self._create(
+                "AAPL",
+                quantity=Decimal("10"),
+                purchase_price=Decimal("150.0000"),
+                current_price=Decimal("180.5000"),
+            ),
+            # No current price: valued at cost
+            self._create("VTI", Investment.ETF, purchase_price=Decimal("200.0000")),
+            self._create(
+                "BTC",
+                Investment.CRYPTO,
+                quantity=Decimal("0.50000000"),
+                purchase_price=Decimal("30000.0000"),
+                current_price=Decimal("20000.0000"),
+            ),
+            self._create(
+                "CDB",
+                Investment.FIXED_INCOME,
+                principal_amount=Decimal("1000.00"),
+                interest_rate=Decimal("8.00"),
+                compounding_frequency="quarterly",
+                term_years=Decimal("2.50"),
+            ),
+            # Incomplete fixed income: valued at principal
+            self._create(
+                "LCI",
+                Investment.FIXED_INCOME,
+                principal_amount=Decimal("500.00"),
+            ),
+        ]
+
+    def _create(self, symbol, investment_type=Investment.STOCK, **fields):
+        fields = {
+            "quantity": Decimal("1"),
+            "purchase_price": Decimal("0"),
+            "purchase_date": date(2025, 1, 1),
+            **fields,
+        }
+        return Investment.objects.create(
+            user=self.user,
+            symbol=symbol,
+            name=symbol,
+            investment_type=investment_type,
+            **fields,
+        )
+
+    def _assert_matches_model(self, valuations):
+        for investment in self.investments:
+            for field in VALUATION_FIELDS:
+                self.assertAlmostEqual(
+                    valuations[investment.pk][field],
+                    float(getattr(investment, field)),
+                    places=6,
+                    msg=f"{investment.symbol}.{field}",
+                )
+
+    def test_batch_matches_model_properties(self) -> None:
+        """Test batch valuation matches the per-instance model properties"""
+        self._assert_matches_model(value_investments(self.investments).by_id())
+
+    def test_batch_without_numpy(self) -> None:
+        """Test the plain-Python fallback matches the model properties"""
+        with mock.patch("wealth.valuation.np", None):
+            self._assert_matches_model(value_investments(self.investments).by_id())
+
+    def test_sql_annotations_match_model_properties(self) -> None:
+        """Test SQL-computed values match the per-instance model properties"""
+        self.investments.append(
+            self._create(
+                "LEAP",
+                Investment.FIXED_INCOME,
+                principal_amount=Decimal("100.00"),
+                interest_rate=Decimal("5.00"),
+                term_years=Decimal("1.75"),
+                purchase_date=date(2024, 2, 29),
+            )
+        )
+        annotated = {
+            investment.pk: investment
+            for investment in annotate_valuation(Investment.objects.all())
+        }
+
+        self._assert_matches_model(
+            {
+                pk: {
+                    field: getattr(investment, ANNOTATION_PREFIX + field)
+                    for field in VALUATION_FIELDS
+                }
+                for pk, investment in annotated.items()
+            }
+        )
+        for investment in self.investments:
+            self.assertEqual(
+                getattr(annotated[investment.pk], ANNOTATION_PREFIX + "due_date"),
+                investment.due_date,
+            )
+        self.assertEqual(investment.due_date, date(2025, 2, 28))
+
+    def test_order_and_filter_by_annotations(self) -> None:
+        """Test investments can be ordered and filtered by derived values"""
+        response = self.client.get("/api/v1/investments/?ordering=-gain_loss,symbol")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [row["symbol"] for row in response.data["results"]],
+            ["AAPL", "CDB", "LCI", "VTI", "BTC"],
+        )
+        losers = annotate_valuation(Investment.objects.all()).filter(gain_loss__lt=0)
+        self.assertEqual([i.symbol for i in losers], ["BTC"])
+
+    def test_create_response_uses_batch_valuation(self) -> None:
+        """Test an unannotated instance is valued without model properties"""
+        payload = {
+            "symbol": "CDB2",
+            "name": "CDB 2",
+            "investment_type": "fixed_income",
+            "quantity": "1",
+            "purchase_price": "0",
+            "purchase_date": "2025-01-01",
+            "principal_amount": "1000.00",
+            "interest_rate": "10.00",
+            "compounding_frequency": "annual",
+            "term_years": "2",
+        }
+        with mock.patch.object(
+            Investment, "_calculate_compound_value"
+        ) as compound_value:
+            response = self.client.post("/api/v1/investments/", payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        compound_value.assert_not_called()
+        self.assertAlmostEqual(response.data["current_value"], 1210.0)
+        self.assertEqual(response.data["due_date"], date(2027, 1, 1))
+
+    def test_list_uses_sql_valuation(self) -> None:
+        """Test listed investments are valued in SQL, without model properties"""
+        with mock.patch.object(
+            Investment, "_calculate_compound_value"
+        ) as compound_value:
+            response = self.client.get("/api/v1/investments/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        compound_value.assert_not_called()
+        rows = {row["symbol"]: row for row in response.data["results"]}
+        self.assertAlmostEqual(rows["CDB"]["current_value"], 1000 * 1.02**10, places=6)
+        self.assertAlmostEqual(rows["AAPL"]["gain_loss"], 305.0)
+
+    def test_retrieve(self) -> None:
+        """Test a single investment is valued like the list"""
+        investment = self.investments[2]
+        response = self.client.get(f"/api/v1/investments/{investment.pk}/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(response.data["current_value"], 10000.0)
+        self.assertAlmostEqual(response.data["gain_loss_percentage"], -100 / 3)
+
+    def test_update_response_is_revalued(self) -> None:
+        """Test an update responds with the values of the saved investment"""
+        investment = self.investments[0]
+        response = self.client.patch(
+            f"/api/v1/investments/{investment.pk}/",
+            {"current_price": "200"},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertAlmostEqual(response.data["current_value"], 2000.0)
+        self.assertAlmostEqual(response.data["gain_loss"], 500.0)
+
+    def test_summary(self) -> None:
+        """Test portfolio totals per investment type"""
+        response = self.client.get("/api/v1/investments/summary/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        by_type = {row["investment_type"]: row for row in response.data["by_type"]}
+        self.assertEqual(
+            [*by_type],
+            [
+                Investment.STOCK,
+                Investment.ETF,
+                Investment.CRYPTO,
+                Investment.FIXED_INCOME,
+            ],
+        )
+        self.assertAlmostEqual(by_type[Investment.CRYPTO]["gain_loss"], -5000.0)
+        fixed_income = by_type[Investment.FIXED_INCOME]
+        self.assertEqual(fixed_income["count"], 2)
+        self.assertAlmostEqual(fixed_income["total_invested"], 1500.0)
+        self.assertAlmostEqual(
+            fixed_income["current_value"], 1000 * 1.02**10 + 500, places=6
+        )
+
+        models_total = sum(float(i.current_value) for i in self.investments)
+        self.assertEqual(response.data["count"], 5)
+        self.assertAlmostEqual(response.data["current_value"], models_total, places=6)
+
+    def test_summary_empty(self) -> None:
+        """Test an empty portfolio summarises to zeros"""
+        Investment.objects.all().delete()
+        response = self.client.get("/api/v1/investments/summary/")
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["by_type"], [])
+        self.assertEqual(response.data["current_value"], 0.0)
+        self.assertEqual(response.data["gain_loss_percentage"], 0.0)
@@ -131,3 +131,53 @@ class RetirementAccountViewSetTest(APITestCase):
         anon = APIClient()
         response = anon.get("/api/v1/retirement-accounts/")
         self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+
+class WealthRestoreTest(APITestCase):
+    def setUp(self) -> None:
+        self.user = User.objects.create_user(
+            username="testuser", password="testpass123"
+        )
+        Investment.objects.create(
+            user=self.user,
+            symbol="AAPL",
+            name="Apple",
+            quantity=Decimal("1"),
+            purchase_price=Decimal("100"),
+            purchase_date=date(2024, 1, 2),
+        )
+
+    def test_restore_bulk_inserts_and_skips_existing_symbols(self) -> None:
+        """Test wealth restore skips symbols the user already holds"""
+        from core.backup import restore_all
+
+        bought = {"purchase_price": "10", "purchase_date": "2024-01-02"}
+        summary = restore_all(
+            self.user,
+            {
+                "version": "1.0",
+                "investments": [
+                    {"symbol": "AAPL", "name": "Apple", "quantity": "2", **bought},
+                    {"symbol": "MSFT", "name": "Microsoft", "quantity": "3", **bought},
+                    {"symbol": "MSFT", "name": "Duplicate", "quantity": "4", **bought},
+                ],
+                "heritages": [
+                    {
+                        "name": "Flat",
+                        "purchase_date": "2020-05-01",
+                        "purchase_price": "1",
+                    }
+                ],
+                "retirement_accounts": [{"name": "401k", "provider": "Fund"}],
+            },
+        )
+        self.assertEqual(summary["investments"], 1)
+        self.assertEqual(summary["heritages"], 1)
+        self.assertEqual(summary["retirement_accounts"], 1)
+        self.assertEqual(
+            Investment.objects.get(user=self.user, symbol="MSFT").quantity,
+            Decimal("3"),
+        )
+        self.assertEqual(
+            Heritage.objects.get(user=self.user).purchase_date, date(2020, 5, 1)
+        )
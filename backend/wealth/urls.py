@@ -2,11 +2,23 @@ from django.urls import include, path
 
 from rest_framework.routers import DefaultRouter
 
-from .views import HeritageViewSet, InvestmentViewSet, RetirementAccountViewSet
+from .views import (
+    AllocationTargetViewSet,
+    CalculatorViewSet,
+    HeritageViewSet,
+    InvestmentViewSet,
+    NetWorthSnapshotViewSet,
+    PriceQuoteViewSet,
+    RetirementAccountViewSet,
+)
 
 router = DefaultRouter()
+router.register(r"allocation-targets", AllocationTargetViewSet)
+router.register(r"calculators", CalculatorViewSet, basename="calculator")
 router.register(r"heritages", HeritageViewSet)
 router.register(r"investments", InvestmentViewSet)
+router.register(r"net-worth-snapshots", NetWorthSnapshotViewSet)
+router.register(r"price-quotes", PriceQuoteViewSet)
 router.register(r"retirement-accounts", RetirementAccountViewSet)
 
 urlpatterns = [path("", include(router.urls))]
@@ -0,0 +1,373 @@
+"""
+Batch valuation of investment portfolios.
+
+``Investment`` derives total_invested, current_value, gain_loss and
+gain_loss_percentage per instance, in Decimal, and re-runs the
+compound-interest power for fixed income every time one of them is read.
+Here a portfolio is loaded column-wise and each derived value is computed
+once for all holdings: with NumPy when it is installed, otherwise in a single
+plain-Python pass. Values are floats, as the API renders them.
+
+The same values are also available as database expressions
+(``annotate_valuation``), so querysets can be ordered, filtered and summed by
+them without loading rows; compounding uses ``POWER()`` and maturity dates
+the backend's date arithmetic.
+"""
+
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from operator import attrgetter
+from typing import Any
+
+from django.db import NotSupportedError
+from django.db.models import (
+    Case,
+    Count,
+    DateField,
+    F,
+    FloatField,
+    Func,
+    Q,
+    QuerySet,
+    Sum,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce, Power
+from django.db.models.lookups import Exact
+
+from .models import Investment
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+VALUATION_FIELDS = (
+    "total_invested",
+    "current_value",
+    "gain_loss",
+    "gain_loss_percentage",
+)
+
+# Columns a valuation needs, in the order ``value_portfolio`` expects them
+VALUATION_COLUMNS = (
+    "id",
+    "investment_type",
+    "quantity",
+    "purchase_price",
+    "current_price",
+    "principal_amount",
+    "interest_rate",
+    "compounding_frequency",
+    "term_years",
+)
+
+COMPOUNDING_PERIODS = {"annual": 1, "semi_annual": 2, "quarterly": 4, "monthly": 12}
+
+# Prefix of the selected ``annotate_valuation`` columns
+ANNOTATION_PREFIX = "annotated_"
+_row_of = attrgetter(*VALUATION_COLUMNS)
+
+
+@dataclass(frozen=True)
+class PortfolioValuation:
+    """Derived values of a set of investments, one list entry per holding."""
+
+    ids: list[int]
+    investment_types: list[str]
+    columns: dict[str, list[float]]
+
+    def by_id(self) -> dict[int, dict[str, float]]:
+        """``{investment_id: {field: value}}`` for serializers."""
+        rows = zip(*(self.columns[field] for field in VALUATION_FIELDS), strict=True)
+        return {
+            pk: dict(zip(VALUATION_FIELDS, row, strict=True))
+            for pk, row in zip(self.ids, rows, strict=True)
+        }
+
+
+def value_investments(investments: Iterable[Investment]) -> PortfolioValuation:
+    """Value already-loaded Investment instances in one batch."""
+    return value_portfolio(_row_of(investment) for investment in investments)
+
+
+def value_portfolio(rows: Iterable[Sequence[Any]]) -> PortfolioValuation:
+    """Value rows of ``VALUATION_COLUMNS``, e.g. from ``values_list()``."""
+    rows = [*rows]
+    if not rows:
+        return PortfolioValuation([], [], {field: [] for field in VALUATION_FIELDS})
+
+    ids, types, *numbers, frequencies, term = zip(*rows, strict=True)
+    columns = (_value_arrays if np is not None else _value_rows)(
+        types, *numbers, frequencies, term
+    )
+    return PortfolioValuation([*ids], [*types], columns)
+
+
+def _value_arrays(
+    types, quantity, purchase_price, current_price, principal, rate, frequencies, term
+) -> dict[str, list[float]]:
+    # None becomes NaN in float arrays
+    quantity, purchase_price, current_price, principal, rate, term = (
+        np.array(column, dtype=float)
+        for column in (quantity, purchase_price, current_price, principal, rate, term)
+    )
+    fixed = np.fromiter(
+        (t == Investment.FIXED_INCOME for t in types), dtype=bool, count=len(types)
+    )
+    periods = np.fromiter(
+        (COMPOUNDING_PERIODS.get(f, 1) for f in frequencies),
+        dtype=float,
+        count=len(frequencies),
+    )
+    principal = np.nan_to_num(principal)
+
+    with np.errstate(all="ignore"):
+        invested = np.where(fixed, principal, quantity * purchase_price)
+        priced = ~np.isnan(current_price) & (current_price != 0)
+        value = np.where(priced & ~fixed, quantity * current_price, invested)
+
+        # A = P(1 + r/n)^(nt), only where principal, rate and term are all set
+        compounds = fixed & (principal != 0)
+        compounds &= (np.nan_to_num(rate) != 0) & (np.nan_to_num(term) != 0)
+        compound = principal * (1 + rate / 100 / periods) ** (periods * term)
+        value = np.where(compounds, compound, value)
+
+        gain_loss = value - invested
+        percentage = np.divide(
+            gain_loss * 100,
+            invested,
+            out=np.zeros_like(gain_loss),
+            where=invested != 0,
+        )
+
+    return {
+        "total_invested": invested.tolist(),
+        "current_value": value.tolist(),
+        "gain_loss": gain_loss.tolist(),
+        "gain_loss_percentage": percentage.tolist(),
+    }
+
+
+def _value_rows(
+    types, quantity, purchase_price, current_price, principal, rate, frequencies, term
+) -> dict[str, list[float]]:
+    columns: dict[str, list[float]] = {field: [] for field in VALUATION_FIELDS}
+    for row in zip(
+        types,
+        quantity,
+        purchase_price,
+        current_price,
+        principal,
+        rate,
+        frequencies,
+        term,
+        strict=True,
+    ):
+        invested, value = _value_row(*row)
+        gain_loss = value - invested
+        columns["total_invested"].append(invested)
+        columns["current_value"].append(value)
+        columns["gain_loss"].append(gain_loss)
+        columns["gain_loss_percentage"].append(
+            gain_loss * 100 / invested if invested else 0.0
+        )
+    return columns
+
+
+def _value_row(
+    investment_type,
+    quantity,
+    purchase_price,
+    current_price,
+    principal,
+    rate,
+    frequency,
+    term,
+) -> tuple[float, float]:
+    """``(total_invested, current_value)`` of one holding."""
+    if investment_type != Investment.FIXED_INCOME:
+        invested = float(quantity) * float(purchase_price)
+        if current_price:
+            return invested, float(quantity) * float(current_price)
+        return invested, invested
+
+    invested = float(principal or 0)
+    if not principal or not rate or not term:
+        return invested, invested
+    periods = COMPOUNDING_PERIODS.get(frequency, 1)
+    return invested, invested * (1 + float(rate) / 100 / periods) ** (
+        periods * float(term)
+    )
+
+
+class AddYears(Func):
+    """``date`` plus the whole years of ``years``, like ``relativedelta``.
+
+    Years are truncated towards zero and Feb 29 falls back to Feb 28, as
+    ``Investment.due_date`` does.
+    """
+
+    arity = 2
+    output_field = DateField()
+
+    def _compile_args(self, compiler, connection):
+        date_sql, date_params = compiler.compile(self.source_expressions[0])
+        years_sql, years_params = compiler.compile(self.source_expressions[1])
+        return date_sql, years_sql, (*date_params, *years_params)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f"AddYears is not supported on {connection.vendor}")
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        date_sql, years_sql, params = self._compile_args(compiler, connection)
+        sql = (
+            f"CAST({date_sql} + MAKE_INTERVAL(years => CAST(TRUNC({years_sql}) "
+            "AS integer)) AS date)"
+        )
+        return sql, params
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        date_sql, years_sql, params = self._compile_args(compiler, connection)
+        return f"DATE_ADD({date_sql}, INTERVAL TRUNCATE({years_sql}, 0) YEAR)", params
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        date_sql, years_sql, params = self._compile_args(compiler, connection)
+        years = f"'+' || CAST({years_sql} AS INTEGER) || ' years'"
+        # DATE() rolls Feb 29 over to Mar 1; cap at the end of the month
+        sql = (
+            f"MIN(DATE({date_sql}, {years}), "
+            f"DATE({date_sql}, 'start of month', {years}, '+1 month', '-1 day'))"
+        )
+        return sql, (*params, *params)
+
+
+def _as_float(expression: Any) -> Cast:
+    # Decimal columns are cast so SQLite never falls back to integer division
+    return Cast(expression, FloatField())
+
+
+def valuation_expressions() -> dict[str, Any]:
+    """Database expressions for the derived Investment values.
+
+    Same results as the model properties, as floats; ``due_date`` is a date.
+    """
+    fixed_income = Q(investment_type=Investment.FIXED_INCOME)
+    principal = Coalesce(_as_float("principal_amount"), 0.0)
+    invested = _as_float(F("quantity") * F("purchase_price"))
+    periods = Case(
+        *(
+            When(compounding_frequency=frequency, then=Value(float(n)))
+            for frequency, n in COMPOUNDING_PERIODS.items()
+        ),
+        default=Value(1.0),
+        output_field=FloatField(),
+    )
+    compounds = fixed_income & ~(
+        Q(principal_amount__isnull=True)
+        | Q(principal_amount=0)
+        | Q(interest_rate__isnull=True)
+        | Q(interest_rate=0)
+        | Q(term_years__isnull=True)
+        | Q(term_years=0)
+    )
+
+    total_invested = Case(
+        When(fixed_income, then=principal), default=invested, output_field=FloatField()
+    )
+    current_value = Case(
+        # A = P(1 + r/n)^(nt)
+        When(
+            compounds,
+            then=principal
+            * Power(
+                1 + _as_float("interest_rate") / 100 / periods,
+                periods * _as_float("term_years"),
+            ),
+        ),
+        When(fixed_income, then=principal),
+        When(Q(current_price__isnull=True) | Q(current_price=0), then=invested),
+        default=_as_float(F("quantity") * F("current_price")),
+        output_field=FloatField(),
+    )
+    gain_loss = current_value - total_invested
+    return {
+        "total_invested": total_invested,
+        "current_value": current_value,
+        "gain_loss": gain_loss,
+        "gain_loss_percentage": Case(
+            When(Exact(total_invested, 0.0), then=Value(0.0)),
+            default=gain_loss * 100 / total_invested,
+            output_field=FloatField(),
+        ),
+        "due_date": Case(
+            When(
+                fixed_income
+                & Q(purchase_date__isnull=False, term_years__isnull=False)
+                & ~Q(term_years=0),
+                then=AddYears("purchase_date", "term_years"),
+            ),
+            default=None,
+            output_field=DateField(),
+        ),
+    }
+
+
+def annotate_valuation(queryset: QuerySet) -> QuerySet:
+    """Compute the derived values in SQL.
+
+    They are aliased under their own names, so they can be used in
+    ``filter()``, ``order_by()`` and aggregates, and selected with the
+    ``ANNOTATION_PREFIX`` (model properties cannot be overwritten), which
+    serializers read instead of valuing in Python.
+    """
+    expressions = valuation_expressions()
+    return queryset.alias(**expressions).annotate(
+        **{ANNOTATION_PREFIX + name: F(name) for name in expressions}
+    )
+
+
+def is_annotated(instance: Investment) -> bool:
+    return hasattr(instance, ANNOTATION_PREFIX + "current_value")
+
+
+def sql_totals_by_type(queryset: QuerySet) -> dict[str, tuple[int, float, float]]:
+    """``{investment_type: (count, total_invested, current_value)}``."""
+    expressions = valuation_expressions()
+    rows = (
+        queryset.order_by()
+        .values("investment_type")
+        .annotate(
+            count=Count("id"),
+            invested=Sum(expressions["total_invested"]),
+            value=Sum(expressions["current_value"]),
+        )
+    )
+    return {
+        row["investment_type"]: (row["count"], row["invested"], row["value"])
+        for row in rows
+    }
+
+
+def portfolio_summary(queryset: QuerySet) -> dict[str, Any]:
+    """Totals of a portfolio per investment type and overall, summed in SQL."""
+    totals = sql_totals_by_type(queryset)
+    by_type = [
+        {"investment_type": investment_type, **_summary(*totals[investment_type])}
+        for investment_type, _ in Investment.INVESTMENT_TYPE_CHOICES
+        if investment_type in totals
+    ]
+    overall = [sum(column) for column in zip(*totals.values(), strict=True)]
+    return {**_summary(*(overall or (0, 0.0, 0.0))), "by_type": by_type}
+
+
+def _summary(count: int, invested: float, value: float) -> dict[str, Any]:
+    gain_loss = value - invested
+    return {
+        "count": count,
+        "total_invested": invested,
+        "current_value": value,
+        "gain_loss": gain_loss,
+        "gain_loss_percentage": gain_loss * 100 / invested if invested else 0.0,
+    }
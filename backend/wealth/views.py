@@ -1,49 +1,341 @@
-from drf_spectacular.utils import extend_schema
-from rest_framework import viewsets
+from django.utils import timezone
+from django.utils.dateparse import parse_date
 
-from .models import Heritage, Investment, RetirementAccount
+import django_filters
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
+
+from core.bulk import BulkModelMixin
+from core.throttles import BulkOperationThrottle
+
+from .accrual import fixed_income_schedules
+from .allocation import portfolio_allocation
+from .calculators import amortization, compound_growth
+from .heritage import HERITAGE_FIELDS, annotate_heritage, heritage_summary
+from .models import (
+    AllocationTarget,
+    Heritage,
+    Investment,
+    NetWorthSnapshot,
+    PriceQuote,
+    RetirementAccount,
+)
+from .projection import (
+    DEFAULT_PROJECTION_PATHS,
+    DEFAULT_PROJECTION_YEARS,
+    MAX_PROJECTION_PATHS,
+    MAX_PROJECTION_YEARS,
+    PROJECTION_PERCENTILES,
+    project,
+)
+from .quotes import (
+    MAX_QUOTES_PER_REQUEST,
+    latest_quotes,
+    normalize_symbol,
+    upsert_quotes,
+)
 from .serializers import (
+    AllocationTargetSerializer,
+    AmortizationSerializer,
+    CompoundGrowthSerializer,
     HeritageSerializer,
     InvestmentSerializer,
+    NetWorthSnapshotSerializer,
+    PriceQuoteSerializer,
     RetirementAccountSerializer,
 )
+from .valuation import annotate_valuation, portfolio_summary
+
+_SUMMARY_TOTALS = {
+    "count": {"type": "integer"},
+    "total_invested": {"type": "number"},
+    "current_value": {"type": "number"},
+    "gain_loss": {"type": "number"},
+    "gain_loss_percentage": {"type": "number"},
+}
+
+_HERITAGE_TOTALS = {
+    "count": {"type": "integer"},
+    "total_purchase_price": {"type": "number"},
+    "total_current_value": {"type": "number"},
+    "gain_loss": {"type": "number"},
+    "gain_loss_percentage": {"type": "number"},
+    "annual_rental_income": {"type": "number"},
+    "rental_yield_percentage": {"type": "number"},
+}
+
+_PROJECTION_SCHEMA = extend_schema(
+    parameters=[
+        OpenApiParameter(
+            name="years",
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description=(
+                f"Years to project, 1-{MAX_PROJECTION_YEARS} "
+                f"(defaults to {DEFAULT_PROJECTION_YEARS})"
+            ),
+            required=False,
+        ),
+        OpenApiParameter(
+            name="paths",
+            type=OpenApiTypes.INT,
+            location=OpenApiParameter.QUERY,
+            description=(
+                f"Simulated paths, 100-{MAX_PROJECTION_PATHS} "
+                f"(defaults to {DEFAULT_PROJECTION_PATHS})"
+            ),
+            required=False,
+        ),
+    ],
+    responses={
+        200: {
+            "type": "object",
+            "properties": {
+                "years": {"type": "integer"},
+                "paths": {"type": "integer"},
+                "percentiles": {"type": "array", "items": {"type": "integer"}},
+                "bands": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "year": {"type": "integer"},
+                            **{
+                                f"p{percentile}": {"type": "number"}
+                                for percentile in PROJECTION_PERCENTILES
+                            },
+                        },
+                    },
+                },
+                "assumptions": {"type": "object"},
+            },
+        }
+    },
+)
+
+
+def _price_from_quotes(investments):
+    """Start investments without a price from the shared quote feed.
+
+    Returns the investments that got a price.
+    """
+    unpriced = [
+        investment
+        for investment in investments
+        if investment.current_price is None
+        and investment.investment_type != Investment.FIXED_INCOME
+    ]
+    quotes = latest_quotes(investment.symbol for investment in unpriced)
+    priced = []
+    for investment in unpriced:
+        quote = quotes.get(normalize_symbol(investment.symbol))
+        if quote is not None:
+            investment.current_price = quote.price
+            priced.append(investment)
+    return priced
 
 
 @extend_schema(tags=["Investments"])
-class InvestmentViewSet(viewsets.ModelViewSet):
+class InvestmentViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = Investment.objects.all()
     serializer_class = InvestmentSerializer
+    filter_backends = [OrderingFilter]
+    ordering_fields = [
+        "symbol",
+        "name",
+        "purchase_date",
+        "total_invested",
+        "current_value",
+        "gain_loss",
+        "gain_loss_percentage",
+        "due_date",
+    ]
     ordering = ["-purchase_date"]
 
     def get_queryset(self):
-        return (
+        # Derived values are computed in SQL (see wealth.valuation)
+        return annotate_valuation(
             Investment.objects.filter(user=self.request.user)
             .select_related("user")
             .order_by("-purchase_date")
         )
 
+    @extend_schema(
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    **_SUMMARY_TOTALS,
+                    "by_type": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "investment_type": {"type": "string"},
+                                **_SUMMARY_TOTALS,
+                            },
+                        },
+                    },
+                },
+            }
+        }
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def summary(self, request):
+        """Portfolio totals overall and per investment type.
+
+        Values are summed in SQL, without loading the investments.
+        """
+        return Response(portfolio_summary(self.get_queryset()))
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="date",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                description="Valuation date (defaults to today)",
+                required=False,
+            )
+        ],
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "date": {"type": "string", "format": "date"},
+                    "total": {"type": "number"},
+                    "investments": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "id": {"type": "integer"},
+                                "symbol": {"type": "string"},
+                                "value": {"type": "number"},
+                                "maturity_value": {"type": "number"},
+                            },
+                        },
+                    },
+                },
+            }
+        },
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def accrued(self, request):
+        """Value of each fixed-income investment as of a date.
+
+        Interest accrues from the purchase date to maturity, read from
+        cached accrual schedules (see wealth.accrual).
+        """
+        value = request.query_params.get("date")
+        try:
+            day = parse_date(value) if value else timezone.localdate()
+        except ValueError:
+            day = None
+        if day is None:
+            return Response(
+                {"error": "date must be formatted as YYYY-MM-DD"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        investments, schedules = fixed_income_schedules(request.user)
+        rows = [
+            {
+                "id": investment.pk,
+                "symbol": investment.symbol,
+                "value": schedules[investment.pk].value_at(day),
+                "maturity_value": schedules[investment.pk].maturity_value,
+            }
+            for investment in investments
+        ]
+        return Response(
+            {
+                "date": day,
+                "total": sum(row["value"] for row in rows),
+                "investments": rows,
+            }
+        )
+
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        investment = serializer.save(user=self.request.user)
+        if _price_from_quotes([investment]):
+            investment.save(update_fields=["current_price", "updated_at"])
+
+    def perform_update(self, serializer):
+        investment = serializer.save()
+        # The instance carries the SQL values of its state before the update
+        serializer.instance = self.get_queryset().get(pk=investment.pk)
+
+    def perform_bulk_create(self, objs):
+        _price_from_quotes(objs)
+        return super().perform_bulk_create(objs)
 
 
 @extend_schema(tags=["Heritage"])
-class HeritageViewSet(viewsets.ModelViewSet):
+class HeritageViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = Heritage.objects.all()
     serializer_class = HeritageSerializer
+    filter_backends = [OrderingFilter]
+    ordering_fields = [
+        "name",
+        "purchase_date",
+        "purchase_price",
+        "current_value",
+        *HERITAGE_FIELDS,
+    ]
     ordering = ["-purchase_date"]
 
     def get_queryset(self):
-        return (
+        # Derived values are computed in SQL (see wealth.heritage)
+        return annotate_heritage(
             Heritage.objects.filter(user=self.request.user)
             .select_related("user")
             .order_by("-purchase_date")
         )
 
+    @extend_schema(
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    **_HERITAGE_TOTALS,
+                    "by_type": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "heritage_type": {"type": "string"},
+                                **_HERITAGE_TOTALS,
+                            },
+                        },
+                    },
+                },
+            }
+        }
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def summary(self, request):
+        """Totals and value-weighted rental yield overall and per heritage type.
+
+        Summed in SQL, without loading the properties.
+        """
+        return Response(heritage_summary(self.get_queryset()))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
+    def perform_update(self, serializer):
+        heritage = serializer.save()
+        # As for investments: respond with the SQL values of the saved state
+        serializer.instance = self.get_queryset().get(pk=heritage.pk)
 
-class RetirementAccountViewSet(viewsets.ModelViewSet):
+
+class RetirementAccountViewSet(BulkModelMixin, viewsets.ModelViewSet):
     queryset = RetirementAccount.objects.all()
     serializer_class = RetirementAccountSerializer
     ordering = ["name"]
@@ -55,5 +347,350 @@ class RetirementAccountViewSet(viewsets.ModelViewSet):
             .order_by("name")
         )
 
+    def _projection(self, request, accounts):
+        limits = {
+            "years": (DEFAULT_PROJECTION_YEARS, 1, MAX_PROJECTION_YEARS),
+            "paths": (DEFAULT_PROJECTION_PATHS, 100, MAX_PROJECTION_PATHS),
+        }
+        options = {}
+        for name, (default, low, high) in limits.items():
+            try:
+                options[name] = int(request.query_params.get(name, default))
+            except ValueError:
+                options[name] = None
+            if options[name] is None or not low <= options[name] <= high:
+                return Response(
+                    {"error": f"{name} must be an integer from {low} to {high}"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+        try:
+            result = project(accounts, start_year=timezone.localdate().year, **options)
+        except RuntimeError as e:
+            return Response(
+                {"error": str(e)}, status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        return Response(result)
+
+    @_PROJECTION_SCHEMA
+    @action(detail=True, methods=["get"])
+    def projection(self, request, pk=None):
+        """Monte Carlo projection of this account's balance by year.
+
+        Returns percentile bands of the simulated balances; see
+        wealth.projection for the return assumptions per risk level.
+        """
+        return self._projection(request, [self.get_object()])
+
+    @_PROJECTION_SCHEMA
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="projection",
+        url_name="portfolio-projection",
+        pagination_class=None,
+    )
+    def portfolio_projection(self, request):
+        """Monte Carlo projection of all the user's accounts together."""
+        return self._projection(request, self.get_queryset())
+
+    def perform_create(self, serializer):
+        serializer.save(user=self.request.user)
+
+
+class NetWorthSnapshotFilter(django_filters.FilterSet):
+    date__gte = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    date__lte = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+
+    class Meta:
+        model = NetWorthSnapshot
+        fields = ["date__gte", "date__lte"]
+
+
+@extend_schema(tags=["Net Worth"])
+class NetWorthSnapshotViewSet(viewsets.ReadOnlyModelViewSet):
+    """Daily net worth history, oldest first (see wealth.networth)."""
+
+    queryset = NetWorthSnapshot.objects.all()
+    serializer_class = NetWorthSnapshotSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = NetWorthSnapshotFilter
+    # One row per day: a few hundred rows chart several years
+    pagination_class = None
+
+    def get_queryset(self):
+        return NetWorthSnapshot.objects.filter(user=self.request.user).order_by("date")
+
+
+class PriceQuoteFilter(django_filters.FilterSet):
+    symbol = django_filters.CharFilter(field_name="symbol", lookup_expr="iexact")
+    date__gte = django_filters.DateFilter(field_name="date", lookup_expr="gte")
+    date__lte = django_filters.DateFilter(field_name="date", lookup_expr="lte")
+
+    class Meta:
+        model = PriceQuote
+        fields = ["symbol", "date__gte", "date__lte"]
+
+
+@extend_schema(tags=["Investments"])
+class PriceQuoteViewSet(viewsets.ReadOnlyModelViewSet):
+    """Price history shared by all users (see wealth.quotes)."""
+
+    queryset = PriceQuote.objects.all()
+    serializer_class = PriceQuoteSerializer
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = PriceQuoteFilter
+
+    def get_queryset(self):
+        return PriceQuote.objects.order_by("symbol", "-date")
+
+    @extend_schema(
+        request=PriceQuoteSerializer(many=True),
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "quotes": {"type": "integer"},
+                    "investments_repriced": {"type": "integer"},
+                },
+            },
+            400: {"type": "object", "properties": {"error": {"type": "string"}}},
+        },
+    )
+    @action(detail=False, methods=["post"], throttle_classes=[BulkOperationThrottle])
+    def bulk(self, request):
+        """Insert or overwrite a batch of quotes (staff only).
+
+        Holdings of every user whose symbol got a newer quote are repriced
+        in the same transaction.
+        """
+        if not request.user.is_staff:
+            return Response(
+                {"error": "Only staff users can publish price quotes"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        if not isinstance(request.data, list) or not request.data:
+            return Response(
+                {"error": "Expected a non-empty list of quotes"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(request.data) > MAX_QUOTES_PER_REQUEST:
+            return Response(
+                {"error": f"At most {MAX_QUOTES_PER_REQUEST} quotes per request."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        serializer = PriceQuoteSerializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid quotes", "errors": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        written, repriced = upsert_quotes(
+            (quote["symbol"], quote["date"], quote["price"])
+            for quote in serializer.validated_data
+        )
+        return Response({"quotes": written, "investments_repriced": repriced})
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="symbols",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    "Comma-separated symbols (defaults to the symbols "
+                    "of your investments)"
+                ),
+                required=False,
+            )
+        ],
+        responses=PriceQuoteSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"], pagination_class=None)
+    def latest(self, request):
+        """The latest quote of each symbol."""
+        symbols = request.query_params.get("symbols")
+        if symbols:
+            symbols = [symbol for symbol in symbols.split(",") if symbol.strip()]
+        else:
+            symbols = Investment.objects.filter(user=request.user).values_list(
+                "symbol", flat=True
+            )
+        quotes = sorted(latest_quotes(symbols).values(), key=lambda q: q.symbol)
+        return Response(PriceQuoteSerializer(quotes, many=True).data)
+
+
+_ALLOCATION_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "total_value": {"type": "number"},
+        "targets_total": {"type": "number"},
+        "allocation": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "asset_class": {"type": "string"},
+                    "count": {"type": "integer"},
+                    "value": {"type": "number"},
+                    "weight": {"type": "number"},
+                    "target_weight": {"type": "number", "nullable": True},
+                    "drift": {"type": "number", "nullable": True},
+                    "difference": {"type": "number", "nullable": True},
+                },
+            },
+        },
+        "trades": {
+            "type": "array",
+            "nullable": True,
+            "items": {
+                "type": "object",
+                "properties": {
+                    "sell": {"type": "string"},
+                    "buy": {"type": "string"},
+                    "amount": {"type": "number"},
+                },
+            },
+        },
+    },
+}
+
+
+@extend_schema(tags=["Allocation"])
+class AllocationTargetViewSet(BulkModelMixin, viewsets.ModelViewSet):
+    """Target share of total wealth per asset class (see wealth.allocation)."""
+
+    queryset = AllocationTarget.objects.all()
+    serializer_class = AllocationTargetSerializer
+    pagination_class = None
+
+    def get_queryset(self):
+        return AllocationTarget.objects.filter(user=self.request.user).order_by(
+            "asset_class"
+        )
+
+    @extend_schema(responses={200: _ALLOCATION_SCHEMA})
+    @action(detail=False, methods=["get"])
+    def rebalance(self, request):
+        """Current weight of each asset class against its target.
+
+        When the targets add up to 100% ``trades`` lists the sales and
+        purchases that reach them; otherwise it is null.
+        """
+        return Response(portfolio_allocation(request.user))
+
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
+
+
+def _columns(*names):
+    return {
+        "type": "object",
+        "properties": {
+            name: {"type": "array", "items": {"type": "number"}} for name in names
+        },
+    }
+
+
+_CALCULATOR_ERROR = {
+    "type": "object",
+    "properties": {"error": {"type": "string"}, "errors": {"type": "object"}},
+}
+
+
+class CalculatorViewSet(viewsets.ViewSet):
+    """Loan and compound growth calculators (see wealth.calculators).
+
+    Tables come back as column arrays: one list per column.
+    """
+
+    def _calculate(self, request, serializer_class, calculate):
+        serializer = serializer_class(data=request.data)
+        if not serializer.is_valid():
+            return Response(
+                {"error": "Invalid parameters", "errors": serializer.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response(calculate(serializer.validated_data))
+
+    @extend_schema(
+        request=AmortizationSerializer,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "summary": {
+                        "type": "object",
+                        "properties": {
+                            "monthly_payment": {"type": "number"},
+                            "months": {"type": "integer"},
+                            "total_paid": {"type": "number"},
+                            "total_interest": {"type": "number"},
+                            "months_saved": {"type": "integer"},
+                            "interest_saved": {"type": "number"},
+                        },
+                    },
+                    "monthly": _columns(
+                        "month", "payment", "principal", "interest", "balance"
+                    ),
+                    "yearly": _columns(
+                        "year", "payment", "principal", "interest", "balance"
+                    ),
+                },
+            },
+            400: _CALCULATOR_ERROR,
+        },
+    )
+    @action(detail=False, methods=["post"])
+    def amortization(self, request):
+        """Monthly amortization schedule of a loan with optional extra
+        payments and rate changes.
+
+        With extra payments the summary also tells the months and interest
+        saved compared with the same loan without them.
+        """
+        return self._calculate(
+            request, AmortizationSerializer, lambda data: amortization(**data)
+        )
+
+    @extend_schema(
+        request=CompoundGrowthSerializer,
+        responses={
+            200: {
+                "type": "object",
+                "properties": {
+                    "summary": {
+                        "type": "object",
+                        "properties": {
+                            "final_balance": {"type": "number"},
+                            "total_contributions": {"type": "number"},
+                            "total_interest": {"type": "number"},
+                            "years": {"type": "integer"},
+                        },
+                    },
+                    "yearly": _columns(
+                        "year",
+                        "balance",
+                        "contributions",
+                        "interest",
+                        "balance_low",
+                        "balance_high",
+                    ),
+                },
+            },
+            400: _CALCULATOR_ERROR,
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="compound-growth")
+    def compound_growth(self, request):
+        """Year-by-year growth of a principal plus monthly contributions.
+
+        ``balance_low`` and ``balance_high`` are only present with a
+        ``rate_variance``.
+        """
+        return self._calculate(
+            request,
+            CompoundGrowthSerializer,
+            lambda data: compound_growth(**data).as_dict(),
+        )
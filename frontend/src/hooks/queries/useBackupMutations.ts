@@ -61,12 +61,13 @@ export function useRestoreBackup() {
     return useMutation<
         RestoreResult,
         Error,
-        { file: File; replaceExisting: boolean }
+        { files: File[]; replaceExisting: boolean }
     >({
-        mutationFn: async ({ file, replaceExisting }) => {
+        mutationFn: async ({ files, replaceExisting }) => {
             try {
                 const formData = new FormData();
-                formData.append('file', file);
+                // A full backup and its incrementals are merged server-side
+                files.forEach((file) => formData.append('file', file));
                 formData.append(
                     'replace_existing',
                     replaceExisting ? 'true' : 'false'
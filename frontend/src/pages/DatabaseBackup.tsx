@@ -52,7 +52,7 @@ function DatabaseBackup() {
     );
     const fileInputRef = useRef<HTMLInputElement>(null);
     const [replaceExisting, setReplaceExisting] = useState(false);
-    const [selectedFile, setSelectedFile] = useState<File | null>(null);
+    const [selectedFiles, setSelectedFiles] = useState<File[]>([]);
     const [confirmReplace, setConfirmReplace] = useState(false);
     const [confirmError, setConfirmError] = useState<string | null>(null);
     // Lazy init � Set is non-primitive (rerender-lazy-state-init)
@@ -110,8 +110,7 @@ function DatabaseBackup() {
 
     const handleFileSelect = useCallback(
         (e: ChangeEvent<HTMLInputElement>) => {
-            const file = e.target.files?.[0] ?? null;
-            setSelectedFile(file);
+            setSelectedFiles(Array.from(e.target.files ?? []));
             restoreMutation.reset();
         },
         [restoreMutation]
@@ -135,7 +134,7 @@ function DatabaseBackup() {
     );
 
     const handleRestore = useCallback(async () => {
-        if (!selectedFile) return;
+        if (selectedFiles.length === 0) return;
         if (replaceExisting && !confirmReplace) {
             setConfirmError(
                 'Check the confirmation checkbox to confirm you want to replace all existing data.'
@@ -145,10 +144,10 @@ function DatabaseBackup() {
         setConfirmError(null);
         try {
             await restoreMutation.mutateAsync({
-                file: selectedFile,
+                files: selectedFiles,
                 replaceExisting,
             });
-            setSelectedFile(null);
+            setSelectedFiles([]);
             setConfirmReplace(false);
             if (fileInputRef.current) fileInputRef.current.value = '';
         } catch (err: unknown) {
@@ -158,7 +157,7 @@ function DatabaseBackup() {
             }
             setConfirmError('Failed to restore backup');
         }
-    }, [confirmReplace, replaceExisting, restoreMutation, selectedFile]);
+    }, [confirmReplace, replaceExisting, restoreMutation, selectedFiles]);
 
     return (
         <div className='max-w-2xl mx-auto space-y-8'>
@@ -297,9 +296,12 @@ function DatabaseBackup() {
             <div className='card bg-base-100 shadow-sm p-6 space-y-4'>
                 <h2 className='text-lg font-medium'>Restore from Backup</h2>
                 <p className='text-sm text-base-content/60'>
-                    Upload a <code>.json</code> backup file exported from this
-                    application. Duplicate transactions (same reference ID) will
-                    be skipped automatically.
+                    Upload a <code>.json</code>, <code>.ndjson</code> or{' '}
+                    <code>.columnar</code> backup file (optionally gzip or zstd
+                    compressed) exported from this application. Duplicate transactions (same reference ID) will
+                    be skipped automatically. To restore incremental backups,
+                    select the full backup and every incremental taken after
+                    it together.
                 </p>
 
                 <div>
@@ -307,13 +309,14 @@ function DatabaseBackup() {
                         htmlFor='backup-file'
                         className='block text-sm font-medium mb-1'
                     >
-                        Backup file
+                        Backup file(s)
                     </label>
                     <input
                         id='backup-file'
                         ref={fileInputRef}
                         type='file'
-                        accept='.json'
+                        multiple
+                        accept='.json,.ndjson,.columnar,.gz,.zst'
                         onChange={handleFileSelect}
                         className='block table table-zebra w-full text-base-content/60 file:mr-4 file:py-2 file:px-4 file:rounded-md file:border-0 file:text-sm file:font-medium file:bg-indigo-50 file:text-indigo-700 hover:file:bg-indigo-100'
                     />
@@ -355,7 +358,9 @@ function DatabaseBackup() {
 
                 <button
                     onClick={handleRestore}
-                    disabled={restoreMutation.isPending || !selectedFile}
+                    disabled={
+                        restoreMutation.isPending || selectedFiles.length === 0
+                    }
                     className='btn btn-primary'
                 >
                     {restoreMutation.isPending ? (